@@ -0,0 +1,114 @@
+"""
+Tabelas de frames pré-resolvidas para desenhar herói e inimigos.
+
+Na carga, cada animação vira uma tupla de superfícies já carregadas (as
+variantes espelhadas são feitas uma única vez com `pygame.transform.flip`) e
+cada sprite fica acessível pelo nome, sem passar pelo loader do pgzero. O
+relógio de animação é o da simulação (`Simulation.tick` +
+`simulation.animation_frame`), compartilhado por todas as entidades de um
+tipo; os inimigos são desenhados com o frame que a simulação escolheu
+(`EnemyState.image`, que também define a hitbox), então desenho e colisão
+nunca divergem.
+"""
+try:
+    import pygame
+except Exception:  # só é necessário para espelhar os frames
+    pygame = None  # type: ignore[assignment]
+
+from enemy_swarm import IMAGE_NAMES as SWARM_IMAGE_NAMES
+from simulation import (
+    ENEMY_IDLE_FRAMES,
+    ENEMY_MOVE_FRAMES,
+    HERO_ANIM_DELAY,
+    HERO_JUMP_IMAGE,
+    HERO_RUN_FRAMES,
+    HERO_STAND_FRAMES,
+    MIRROR_SUFFIX,
+    animation_frame,
+)
+
+# animação -> nomes dos sprites
+ANIMATIONS = {
+    "hero_idle": HERO_STAND_FRAMES,
+    "hero_run": HERO_RUN_FRAMES,
+    "hero_jump": (HERO_JUMP_IMAGE,),
+    "enemy_idle": ENEMY_IDLE_FRAMES,
+    "enemy_move": ENEMY_MOVE_FRAMES,
+}
+# os sprites do herói olham para a direita: para a esquerda usa o espelho
+MIRRORED = ("hero_run", "hero_jump")
+LEFT_SUFFIX = MIRROR_SUFFIX
+
+
+class FrameTable:
+    """
+    {animação: tupla de frames}; cada frame é (superfície, meia largura,
+    meia altura), para desenhar centrado sem consultar o tamanho de novo.
+    """
+
+    def __init__(self):
+        self.animations = {}
+        self.by_name = {}  # nome do sprite -> frame
+
+    def add(self, name, surfaces):
+        self.animations[name] = tuple((s, s.get_width() / 2, s.get_height() / 2) for s in surfaces)
+
+    def add_mirrored(self, name, source):
+        self.add(name, [pygame.transform.flip(s, True, False) for s, _hw, _hh in self.animations[source]])
+
+    def __getitem__(self, name):
+        return self.animations[name]
+
+
+def build_frame_table(load):
+    """`load(nome)` devolve a superfície do sprite (ex.: `images.load`)."""
+    table = FrameTable()
+    for name, frames in ANIMATIONS.items():
+        table.add(name, [load(frame) for frame in frames])
+        table.by_name.update(zip(frames, table[name]))
+    if pygame is not None:
+        for name in MIRRORED:
+            table.add_mirrored(name + LEFT_SUFFIX, name)
+            # nomes da simulação para os espelhos (ex.: HERO_RUN_LEFT_FRAMES)
+            table.by_name.update(zip((frame + LEFT_SUFFIX for frame in ANIMATIONS[name]), table[name + LEFT_SUFFIX]))
+    return table
+
+
+def mirrored_surfaces(load):
+    """
+    {nome espelhado: superfície} dos frames de MIRRORED (ex.: "hero_run1_left"),
+    para instalar no loader do pgzero quando as views usam Actors.
+    """
+    return {
+        frame + LEFT_SUFFIX: pygame.transform.flip(load(frame), True, False)
+        for name in MIRRORED
+        for frame in ANIMATIONS[name]
+    }
+
+
+class Animator:
+    """Tabela de frames com as tuplas do herói já resolvidas (as views só indexam)."""
+
+    def __init__(self, table):
+        self.table = table
+        self.hero_idle = self.frames("hero_idle")
+        self.hero_run = self.frames("hero_run")
+        self.hero_run_left = self.frames("hero_run", left=True)
+        self.hero_jump = self.frames("hero_jump")
+        self.hero_jump_left = self.frames("hero_jump", left=True)
+        self.by_name = table.by_name
+        # frames do EnemySwarm, indexados pelo índice de imagem dos arrays
+        self.swarm_frames = tuple(self.by_name[name] for name in SWARM_IMAGE_NAMES)
+
+    def frames(self, name, left=False):
+        """Tupla de frames de `name` (a variante espelhada, se pedida e existir)."""
+        if left:
+            mirrored = self.table.animations.get(name + LEFT_SUFFIX)
+            if mirrored is not None:
+                return mirrored
+        return self.table[name]
+
+    @staticmethod
+    def hero_frame(frames, tick):
+        """Frame do herói no relógio da simulação."""
+        return frames[animation_frame(tick, HERO_ANIM_DELAY, len(frames))]
@@ -0,0 +1,208 @@
+"""
+Atlas de texturas: empacota os sprites de game/sprites em uma ou poucas imagens.
+
+Build (junto com o sync_assets.py):
+    py atlas.py
+
+Gera `game/atlas/atlas0.png` (atlas1.png, ... se não couber) e `atlas.json`
+com a posição de cada frame. Em tempo de execução, `AtlasLoader` abre só as
+páginas do atlas e devolve cada frame como subsurface, em vez de abrir e
+decodificar um PNG por sprite.
+
+Sprites muito grandes (ex.: o fundo 800x600) ficam de fora e continuam sendo
+carregados como arquivos normais.
+"""
+import json
+from pathlib import Path
+
+try:
+    from PIL import Image
+except Exception:  # Pillow só é necessário para o build
+    Image = None  # type: ignore[assignment]
+
+BASE_DIR = Path(__file__).resolve().parent
+GAME_SPRITES = BASE_DIR / "game" / "sprites"
+ATLAS_DIR = BASE_DIR / "game" / "atlas"
+INDEX_NAME = "atlas.json"
+INDEX_VERSION = 1
+
+PAGE_SIZE = 1024        # lado máximo de cada página do atlas
+PADDING = 1             # pixels vazios entre frames (evita "sangrar" no filtro)
+MAX_SPRITE_SIDE = 512   # sprites maiores que isso não entram no atlas
+
+
+def pack(sizes, page_w=PAGE_SIZE, page_h=PAGE_SIZE, padding=PADDING):
+    """
+    Empacotamento em prateleiras (shelf packing), do mais alto para o mais baixo.
+
+    `sizes`: {nome: (w, h)}. Retorna {nome: (página, x, y)}. Frames maiores que
+    a página levantam ValueError.
+    """
+    placements = {}
+    page = 0
+    x = y = shelf_h = 0
+    order = sorted(sizes, key=lambda n: (-sizes[n][1], -sizes[n][0], n))
+    for name in order:
+        w, h = sizes[name]
+        if w + padding > page_w or h + padding > page_h:
+            raise ValueError(f"{name} ({w}x{h}) não cabe numa página {page_w}x{page_h}")
+        if x + w + padding > page_w:
+            # nova prateleira
+            x = 0
+            y += shelf_h
+            shelf_h = 0
+        if y + h + padding > page_h:
+            # nova página
+            page += 1
+            x = y = shelf_h = 0
+        placements[name] = (page, x, y)
+        x += w + padding
+        shelf_h = max(shelf_h, h + padding)
+    return placements
+
+
+def _source_stamp(path: Path):
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def build_atlas(sprites_dir: Path = GAME_SPRITES, out_dir: Path = ATLAS_DIR, *, verbose=True):
+    """Gera as páginas do atlas e o índice. Retorna o índice (dict) ou None sem Pillow."""
+    log = print if verbose else (lambda *args, **kwargs: None)
+    if Image is None:
+        log("Pillow não instalado: atlas não gerado.")
+        return None
+
+    images = {}
+    for p in sorted(sprites_dir.glob("*.png")):
+        try:
+            if p.stat().st_size == 0:
+                continue
+            img = Image.open(p)
+            img.load()
+        except Exception:
+            log(f"Atlas: ignorando sprite ilegível {p.name}")
+            continue
+        if max(img.size) > MAX_SPRITE_SIDE:
+            continue
+        images[p.stem] = (p, img.convert("RGBA"))
+
+    placements = pack({name: img.size for name, (_p, img) in images.items()})
+    page_count = (max(page for page, _x, _y in placements.values()) + 1) if placements else 0
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pages = [Image.new("RGBA", (PAGE_SIZE, PAGE_SIZE), (0, 0, 0, 0)) for _ in range(page_count)]
+    frames = {}
+    sources = {}
+    for name, (page, x, y) in placements.items():
+        path, img = images[name]
+        pages[page].paste(img, (x, y))
+        frames[name] = {"page": page, "x": x, "y": y, "w": img.width, "h": img.height}
+        sources[name] = _source_stamp(path)
+
+    # extensão ocupada por página (frames com borda transparente contam inteiros)
+    extents = [(0, 0)] * page_count
+    for frame in frames.values():
+        w, h = extents[frame["page"]]
+        extents[frame["page"]] = (max(w, frame["x"] + frame["w"]), max(h, frame["y"] + frame["h"]))
+
+    page_files = []
+    for i, page_img in enumerate(pages):
+        # corta a sobra da página para não gastar memória com pixels vazios
+        page_img = page_img.crop((0, 0) + extents[i])
+        name = f"atlas{i}.png"
+        page_img.save(out_dir / name, format="PNG", optimize=True)
+        page_files.append(name)
+
+    # remove páginas antigas que sobraram de um build maior
+    for old in out_dir.glob("atlas*.png"):
+        if old.name not in page_files:
+            try:
+                old.unlink()
+            except Exception:
+                pass
+
+    index = {"version": INDEX_VERSION, "pages": page_files, "frames": frames, "sources": sources}
+    (out_dir / INDEX_NAME).write_text(json.dumps(index, indent=1, sort_keys=True), encoding="utf-8")
+    log(f"Atlas: {len(frames)} sprite(s) em {len(page_files)} página(s) -> {out_dir}")
+    return index
+
+
+class AtlasLoader:
+    """Carrega as páginas do atlas e serve frames por nome como subsurfaces."""
+
+    def __init__(self, atlas_dir: Path = ATLAS_DIR, sprites_dir: Path = GAME_SPRITES):
+        self.atlas_dir = atlas_dir
+        self.sprites_dir = sprites_dir
+        self.index = None
+        self._pages = []
+        self._frames = {}
+        try:
+            index = json.loads((atlas_dir / INDEX_NAME).read_text(encoding="utf-8"))
+            if index.get("version") == INDEX_VERSION:
+                self.index = index
+        except Exception:
+            self.index = None
+
+    @property
+    def names(self):
+        return set(self.index["frames"]) if self.index else set()
+
+    def is_fresh(self):
+        """True se o atlas existe e nenhum sprite de origem mudou desde o build."""
+        if not self.index:
+            return False
+        try:
+            for name, stamp in self.index["sources"].items():
+                if _source_stamp(self.sprites_dir / f"{name}.png") != stamp:
+                    return False
+            return all((self.atlas_dir / page).is_file() for page in self.index["pages"])
+        except Exception:
+            return False
+
+    def load(self):
+        """Decodifica as páginas (precisa de display ativo para o convert_alpha)."""
+        import pygame
+
+        self._pages = []
+        for page in self.index["pages"]:
+            surface = pygame.image.load(str(self.atlas_dir / page))
+            try:
+                surface = surface.convert_alpha()
+            except pygame.error:
+                pass
+            self._pages.append(surface)
+        self._frames = {}
+
+    def get(self, name):
+        """Frame `name` como subsurface da página (cacheado)."""
+        surface = self._frames.get(name)
+        if surface is None:
+            frame = self.index["frames"][name]
+            surface = self._pages[frame["page"]].subsurface(
+                (frame["x"], frame["y"], frame["w"], frame["h"])
+            )
+            self._frames[name] = surface
+        return surface
+
+    def install(self, images_loader):
+        """
+        Coloca todos os frames no cache do loader de imagens do pgzero
+        (`ResourceLoader.cache`), então `images.load(nome)` devolve a subsurface.
+        """
+        # vars(): o __getattr__ do loader tentaria carregar uma imagem "cache"
+        cache = vars(images_loader).get("cache")
+        if not isinstance(cache, dict):
+            raise TypeError(f"{type(images_loader).__name__} não tem o cache de recursos do pgzero (.cache)")
+        if not self._pages:
+            raise RuntimeError("atlas: chame load() antes de install()")
+        key_fn = images_loader.cache_key
+        for name in self.index["frames"]:
+            cache[key_fn(name, (), {})] = self.get(name)
+        for name in self.index["frames"]:
+            if images_loader.load(name) is not self.get(name):
+                raise RuntimeError(f"atlas: o loader de imagens não devolveu o frame {name!r} do atlas")
+        return len(self.index["frames"])
+
+if __name__ == "__main__":
+    build_atlas()
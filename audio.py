@@ -0,0 +1,538 @@
+"""
+Gerenciador de áudio orientado a eventos.
+
+O loop de frames nunca faz I/O de áudio nem consulta o mixer: todo o trabalho
+pesado (inicializar o mixer, decodificar SFX, gerar/carregar a música) roda
+numa thread de fundo que consome comandos de uma fila. As transições de
+estado da música vêm só dos toggles do menu e do evento de fim de faixa:
+
+    UNINITIALIZED -> LOADING -> PLAYING -> STOPPED
+                          \\-> ERROR
+
+O jogo só lê atributos já calculados (`state`, `status`, `last_error`).
+"""
+import hashlib
+import io
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+import wave
+from array import array
+from pathlib import Path
+from typing import Optional
+
+import pygame
+
+try:
+    import numpy as np
+except Exception:  # NumPy é opcional (a síntese cai para array('h'))
+    np = None  # type: ignore[assignment]
+
+UNINITIALIZED = "uninitialized"
+LOADING = "loading"
+PLAYING = "playing"
+STOPPED = "stopped"
+ERROR = "error"
+
+SFX_NAMES = ("jump", "hit")
+# Canais reservados para SFX (o mixer não os escolhe sozinho para outros sons,
+# então um SFX nunca rouba o canal do tom de fundo e vice-versa).
+SFX_CHANNELS = 4
+
+
+# Parâmetros do tom gerado quando não existe música válida em game/music.
+BGM_PARAMS = {
+    "freqs": (110.0, 165.0),  # frequências mais graves (menos "estridentes")
+    "amp": 6000,              # mais audível, ainda longe de clipping
+    "duration_s": 20.0,       # longo o suficiente para perceber, sem loop
+    "sample_rate": 22050,
+    "fade_in_s": 0.15,        # fade in/out mais longo para evitar estalos
+    "fade_out_s": 0.25,
+}
+
+
+def find_bgm_path(music_dir: Path, track: str, exts=("ogg", "oga", "mp3", "wav")):
+    """Retorna o caminho da música `track` em `music_dir`, ou None."""
+    # Preferir formatos comuns (mp3/ogg/oga) e tocar via pygame com caminho completo.
+    for ext in exts:
+        p = music_dir / f"{track}.{ext}"
+        try:
+            if p.is_file() and p.stat().st_size > 0:
+                return p
+        except Exception:
+            pass
+    return None
+
+
+def tone_params_hash(params) -> str:
+    """Hash estável dos parâmetros do tom (chave do cache do WAV gerado)."""
+    payload = json.dumps(params, sort_keys=True, default=list).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+def synthesize_tone(params=BGM_PARAMS) -> bytes:
+    """
+    Gera o tom como PCM 16-bit mono little-endian.
+
+    Com NumPy é um pipeline vetorizado (senoides + envelope de fade em arrays);
+    sem NumPy, usa `array('h')` com a mesma fórmula. Mesmo resultado da versão
+    antiga amostra a amostra (int() trunca em direção a zero nos dois casos).
+    """
+    sample_rate = int(params["sample_rate"])
+    freqs = tuple(params["freqs"])
+    amp = params["amp"]
+    nframes = int(params["duration_s"] * sample_rate)
+    fade_in = sample_rate * params["fade_in_s"]
+    fade_out = sample_rate * params["fade_out_s"]
+    voices = max(1, len(freqs))
+
+    if np is not None:
+        n = np.arange(nframes, dtype=np.float64)
+        t = n / sample_rate
+        s = np.zeros(nframes, dtype=np.float64)
+        for f in freqs:
+            s += np.sin(2 * np.pi * f * t)
+        s /= voices
+        fade = np.ones(nframes, dtype=np.float64)
+        head = n < fade_in
+        fade[head] = n[head] / fade_in
+        tail = n > nframes - fade_out
+        fade[tail] = np.minimum(fade[tail], np.maximum(0.0, (nframes - n[tail]) / fade_out))
+        samples = (amp * fade * s).astype("<i2")
+        return samples.tobytes()
+
+    two_pi = 2 * math.pi
+    sin = math.sin
+    samples = array("h", bytes(2 * nframes))
+    for i in range(nframes):
+        t = i / sample_rate
+        fade = 1.0
+        if i < fade_in:
+            fade = i / fade_in
+        if i > nframes - fade_out:
+            fade = min(fade, max(0.0, (nframes - i) / fade_out))
+        s = 0.0
+        for f in freqs:
+            s += sin(two_pi * f * t)
+        samples[i] = int(amp * fade * (s / voices))
+    if sys.byteorder != "little":
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def ensure_bgm_wav(music_dir: Path, track: str, params=BGM_PARAMS):
+    """
+    Garante o WAV gerado (tom) para `track` e retorna o caminho, ou None.
+
+    O hash dos parâmetros fica em `<track>.wav.sha1`: se o WAV existir e o hash
+    bater, é reaproveitado sem gerar nada. Um WAV sem esse arquivo foi colocado
+    pelo usuário e nunca é sobrescrito.
+    """
+    p = music_dir / f"{track}.wav"
+    stamp = music_dir / f"{track}.wav.sha1"
+    digest = tone_params_hash(params)
+    try:
+        if p.is_file() and p.stat().st_size > 44:
+            if not stamp.exists():
+                return p
+            if stamp.read_text(encoding="ascii").strip() == digest:
+                return p
+    except Exception:
+        pass
+
+    try:
+        music_dir.mkdir(parents=True, exist_ok=True)
+        frames = synthesize_tone(params)
+        tmp = p.with_name(p.name + ".tmp")
+        with wave.open(str(tmp), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)  # 16-bit
+            wf.setframerate(int(params["sample_rate"]))
+            wf.writeframes(frames)
+        os.replace(tmp, p)
+        stamp.write_text(digest, encoding="ascii")
+        return p
+    except Exception:
+        # Se não der pra criar, simplesmente não terá música.
+        return None
+
+
+def make_tone_sound(params=BGM_PARAMS):
+    """
+    Cria um `pygame.mixer.Sound` do tom direto da memória (sem WAV em disco).
+
+    O tom é sintetizado já na taxa/canais do mixer atual.
+    """
+    mixer_init = pygame.mixer.get_init()
+    if mixer_init is None:
+        return None
+    frequency, size, channels = mixer_init
+    if abs(size) != 16:
+        return None
+    pcm = synthesize_tone(dict(params, sample_rate=frequency))
+    if np is not None:
+        mono = np.frombuffer(pcm, dtype="<i2")
+        if channels > 1:
+            mono = np.repeat(mono[:, None], channels, axis=1)
+        return pygame.sndarray.make_sound(np.ascontiguousarray(mono))
+    if channels > 1:
+        mono = array("h")
+        mono.frombytes(pcm)
+        interleaved = array("h", (v for v in mono for _ in range(channels)))
+        pcm = interleaved.tobytes()
+    return pygame.mixer.Sound(buffer=pcm)
+
+
+class SoundCache:
+    """
+    Cache de SFX decodificados em PCM cru, no formato do mixer.
+
+    Cada fonte (ex.: MP3) é decodificada uma única vez: os bytes de
+    `Sound.get_raw()` vão para `cache_dir/<nome>.<sha1 da fonte>.<freq>_<bits>_<canais>.pcm`
+    e, nos próximos inícios, viram um `Sound(buffer=...)` sem decodificar nada.
+    Em memória, os Sounds ficam por (caminho, tamanho, mtime, mixer), então
+    recarregar os SFX (toggles) nem lê o arquivo. Seguro entre threads (o
+    preloader carrega em paralelo).
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = cache_dir
+        self._memory = {}
+        self._lock = threading.Lock()
+        self.decoded = 0    # fontes decodificadas (cache frio)
+        self.disk_hits = 0  # carregadas do PCM em disco
+
+    def cache_path(self, path: Path, digest: str, mixer_init):
+        frequency, size, channels = mixer_init
+        return self.cache_dir / f"{path.stem}.{digest}.{frequency}_{size}_{channels}.pcm"
+
+    def load(self, path: Path):
+        """Sound de `path` no formato do mixer atual (decodifica só se não houver cache)."""
+        path = Path(path)
+        mixer_init = pygame.mixer.get_init()
+        if mixer_init is None:
+            raise pygame.error("mixer não inicializado")
+        st = path.stat()
+        key = (str(path), st.st_size, st.st_mtime_ns, mixer_init)
+        with self._lock:
+            sound = self._memory.get(key)
+        if sound is not None:
+            return sound
+
+        sound = None
+        target = None
+        if self.cache_dir is not None:
+            target = self.cache_path(path, hashlib.sha1(path.read_bytes()).hexdigest(), mixer_init)
+            try:
+                sound = pygame.mixer.Sound(buffer=target.read_bytes())
+                with self._lock:
+                    self.disk_hits += 1
+            except (OSError, pygame.error):
+                sound = None
+        if sound is None:
+            sound = pygame.mixer.Sound(str(path))
+            with self._lock:
+                self.decoded += 1
+            if target is not None:
+                self._store(path, target, sound.get_raw())
+        with self._lock:
+            self._memory[key] = sound
+        return sound
+
+    def _store(self, path: Path, target: Path, raw: bytes):
+        """Grava o PCM e remove entradas antigas da mesma fonte (hash/mixer diferentes)."""
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f".{target.name}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(raw)
+            os.replace(tmp, target)
+            prefix = path.stem + "."
+            for old in target.parent.glob("*.pcm"):
+                # <nome>.<sha1>.<mixer>.pcm da mesma fonte (não de "<nome>.x", por exemplo)
+                if old != target and old.name.startswith(prefix) and old.name[len(prefix):].count(".") == 2:
+                    old.unlink()
+        except OSError:
+            pass  # sem cache em disco: só decodifica de novo no próximo início
+
+
+class AudioManager:
+    def __init__(self, sounds_dir: Path, music_dir: Path, track: str, *,
+                 volume=1.0, end_event=None, fallback_sounds=None, bgm_in_memory=False,
+                 sound_cache=None):
+        """
+        `end_event`: tipo de evento pygame postado no fim da música (o jogo o
+        repassa para `on_music_end`). `fallback_sounds`: loader de sons do
+        pgzero, usado se o MP3 do SFX não existir. `bgm_in_memory`: se não
+        houver música em disco, toca o tom gerado direto da memória (Sound num
+        canal) em vez de gravar/cachear o WAV. `sound_cache`: `SoundCache`
+        dos SFX decodificados (o padrão só guarda em memória).
+        """
+        self.sound_cache = sound_cache if sound_cache is not None else SoundCache()
+        self.bgm_in_memory = bgm_in_memory
+        self._bgm_channel = None
+        self.sounds_dir = sounds_dir
+        self.music_dir = music_dir
+        self.track = track
+        self.volume = volume
+        self.end_event = end_event
+        self.fallback_sounds = fallback_sounds
+
+        self.music_enabled = True
+        self.sfx_enabled = True
+        self.state = UNINITIALIZED
+        self.status = "Áudio: (inicializando)"
+        self.last_error = None
+        self.mixer_ok = False
+        self.init_seconds = None  # duração do "init" na thread (relatório de início)
+
+        self._sounds = {}
+        self._channels = []      # canais reservados para SFX (round-robin)
+        self._next_channel = 0
+        self._preloaded_sounds = {}  # nome -> Sound já decodificado (preloader)
+        self._preloaded_music = {}   # nome do arquivo -> bytes
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # --- API usada pelo jogo (thread principal, sem I/O) ---
+
+    def start(self):
+        """Inicia a thread de áudio (idempotente; barato de chamar todo frame)."""
+        if self._thread is not None:
+            return
+        self._set_state(LOADING if self.music_enabled else STOPPED, "Áudio: carregando...")
+        self._thread = threading.Thread(target=self._run, name="audio", daemon=True)
+        self._thread.start()
+        self._post("init")
+
+    def shutdown(self):
+        if self._thread is not None:
+            self._post(None)
+
+    def toggle_music(self):
+        self.music_enabled = not self.music_enabled
+        if self._thread is None:
+            # o "init" da thread já aplica os flags atuais
+            self.start()
+            return
+        if self.music_enabled:
+            self._set_state(LOADING, "Música: carregando...")
+            self._post("play_music")
+        else:
+            self._set_state(STOPPED, "Música: desligada")
+            self._post("stop_music")
+
+    def toggle_sfx(self):
+        # Desligar só silencia (`play` checa o flag): os Sounds ficam em
+        # memória e religar não decodifica nada.
+        self.sfx_enabled = not self.sfx_enabled
+        if not self.sfx_enabled:
+            return
+        if self._thread is None:
+            self.start()
+        elif not self._sounds:
+            self._post("load_sfx")
+
+    def adopt(self, sounds=None, music=None):
+        """Recebe SFX já decodificados e bytes de música do preloader (chamar antes de `start`)."""
+        self._preloaded_sounds = dict(sounds or {})
+        self._preloaded_music = dict(music or {})
+
+    def on_music_end(self):
+        """Chamado no evento de fim de faixa (a música toca uma vez, sem loop)."""
+        if self.state == PLAYING:
+            self._set_state(STOPPED, "Música: terminou")
+
+    def play(self, name):
+        """Toca um SFX já carregado ("jump", "hit"); não faz nada se não estiver pronto."""
+        if not self.sfx_enabled:
+            return
+        sound = self._sounds.get(name)
+        if sound is None:
+            return
+        try:
+            channels = self._channels
+            if channels:
+                # round-robin: se todos estiverem ocupados, corta o SFX mais antigo
+                i = self._next_channel
+                self._next_channel = (i + 1) % len(channels)
+                channels[i].play(sound)
+            else:
+                sound.play()
+        except Exception:
+            pass
+
+    # --- thread de áudio ---
+
+    def _post(self, command):
+        self._queue.put(command)
+
+    def _set_state(self, state, status):
+        with self._lock:
+            self.state = state
+            self.status = status
+
+    def _set_error(self, message):
+        with self._lock:
+            self.last_error = message
+            self.state = ERROR
+            self.status = "Música: erro"
+
+    def _run(self):
+        handlers = {
+            "init": self._do_init,
+            "load_sfx": self._do_load_sfx,
+            "play_music": self._do_play_music,
+            "stop_music": self._do_stop_music,
+        }
+        while True:
+            command = self._queue.get()
+            if command is None:
+                return
+            try:
+                handlers[command]()
+            except Exception as e:
+                self._set_error(f"{command} falhou: {e}")
+                print("[audio] erro:", e)
+
+    def _do_init(self):
+        started = time.perf_counter()
+        try:
+            # garante mixer inicializado
+            try:
+                if pygame.mixer.get_init() is None:
+                    pygame.mixer.init()
+                self.mixer_ok = pygame.mixer.get_init() is not None
+            except Exception as e:
+                self.mixer_ok = False
+                self.last_error = f"mixer.init falhou: {e}"
+            if self.mixer_ok:
+                self._reserve_channels()
+            if self.sfx_enabled:
+                self._do_load_sfx()
+            if self.music_enabled:
+                self._do_play_music()
+            else:
+                self._set_state(STOPPED, "Música: desligada")
+        finally:
+            self.init_seconds = time.perf_counter() - started
+
+    def _reserve_channels(self):
+        try:
+            if pygame.mixer.get_num_channels() < SFX_CHANNELS:
+                pygame.mixer.set_num_channels(SFX_CHANNELS)
+            pygame.mixer.set_reserved(SFX_CHANNELS)
+            self._channels = [pygame.mixer.Channel(i) for i in range(SFX_CHANNELS)]
+        except Exception as e:
+            self._channels = []
+            self.last_error = f"canais de SFX: {e}"
+
+    def _load_sound(self, name):
+        preloaded = self._preloaded_sounds.get(name)
+        if preloaded is not None:
+            return preloaded
+        # Preferir MP3 do game/sounds (via cache de PCM); fallback para loader do pgzero.
+        path = self.sounds_dir / f"{name}.mp3"
+        try:
+            if path.is_file() and path.stat().st_size > 0:
+                return self.sound_cache.load(path)
+        except Exception as e:
+            self.last_error = f"{name}.mp3 falhou: {e}"
+        if self.fallback_sounds is not None:
+            try:
+                return getattr(self.fallback_sounds, name)
+            except Exception:
+                pass
+        return None
+
+    def _do_load_sfx(self):
+        if not self.sfx_enabled:
+            return
+        loaded = {}
+        for name in SFX_NAMES:
+            sound = self._load_sound(name)
+            if sound is not None:
+                loaded[name] = sound
+        # o toggle pode ter desligado os sons enquanto carregava
+        if self.sfx_enabled:
+            self._sounds = loaded
+
+    def _do_play_music(self):
+        if not self.music_enabled:
+            return
+        self._set_state(LOADING, "Música: carregando...")
+        self._stop_bgm_channel()
+        path = find_bgm_path(self.music_dir, self.track, exts=("ogg", "oga", "mp3"))
+        if path is None and self.bgm_in_memory:
+            if self._play_tone_from_memory():
+                return
+        if path is None:
+            # Sem mp3/ogg válido → usa o WAV gerado (cacheado pelo hash dos parâmetros)
+            path = ensure_bgm_wav(self.music_dir, self.track)
+        if path is None:
+            self._set_state(STOPPED, "Música: ligada (sem arquivo válido)")
+            return
+
+        # Sem endevent durante a troca: o stop implícito do load não pode
+        # chegar ao jogo como "fim de faixa".
+        pygame.mixer.music.set_endevent()
+        data = self._preloaded_music.get(path.name)
+        if data is not None:
+            # já lido pelo preloader: toca da memória, sem I/O de disco
+            pygame.mixer.music.load(io.BytesIO(data), path.suffix.lstrip("."))
+        else:
+            pygame.mixer.music.load(str(path))
+        pygame.mixer.music.set_volume(self.volume)
+        if self.end_event is not None:
+            pygame.mixer.music.set_endevent(self.end_event)
+        # sem loop
+        pygame.mixer.music.play(0)
+        # Checa uma única vez aqui (na thread de áudio), nunca no loop de frames.
+        if not pygame.mixer.music.get_busy():
+            self._set_error("pygame não iniciou reprodução")
+            return
+        if self.music_enabled:
+            self._set_state(PLAYING, "Música: ligada (tocando)")
+        else:
+            pygame.mixer.music.stop()
+
+    def _play_tone_from_memory(self):
+        sound = make_tone_sound()
+        if sound is None:
+            return False
+        sound.set_volume(self.volume)
+        channel = sound.play()
+        if channel is None:
+            return False
+        if self.end_event is not None:
+            channel.set_endevent(self.end_event)
+        self._bgm_channel = channel
+        if self.music_enabled:
+            self._set_state(PLAYING, "Música: ligada (tom gerado)")
+        else:
+            self._stop_bgm_channel()
+        return True
+
+    def _stop_bgm_channel(self):
+        channel = self._bgm_channel
+        self._bgm_channel = None
+        if channel is not None:
+            try:
+                channel.set_endevent()
+                channel.stop()
+            except Exception:
+                pass
+
+    def _do_stop_music(self):
+        self._stop_bgm_channel()
+        try:
+            pygame.mixer.music.set_endevent()
+            pygame.mixer.music.stop()
+        except Exception:
+            pass
+        if not self.music_enabled:
+            self._set_state(STOPPED, "Música: desligada")
@@ -0,0 +1,292 @@
+"""
+Partidas headless em lote, espalhadas num pool de processos.
+
+Cada sessão roda a mesma simulação do jogo (`simulation.Simulation`, a lógica
+de herói, inimigos e troféu que o `main.py` desenha) com uma política de
+entradas, até a vitória, o game over ou o limite de ticks (timeout). A seed
+de cada sessão é derivada de (seed base, índice da sessão), então o resultado
+de uma sessão não depende de qual processo a rodou nem de quantos processos
+existem: o mesmo lote com 1 ou 16 workers dá os mesmos desfechos e hashes.
+
+As sessões vão para os workers em blocos (pouca comunicação entre
+processos) e cada worker devolve só tuplas pequenas, então o lote escala
+quase linearmente com o número de núcleos.
+
+Políticas (`--policy`):
+    idle              nenhuma tecla
+    right             segura a direita
+    right_jump        direita + pulo o tempo todo
+    random            teclas aleatórias, mantidas por alguns ticks (RNG da sessão)
+    script:R*30,RU*10,N*20
+                      sequência de (teclas * ticks) em loop; L/R/U = esquerda,
+                      direita, pulo e N = nenhuma
+
+Uso:
+    py batch.py --sessions 10000 --policy random
+    py batch.py --sessions 2000 --workers 1,2,4,8 --out batch_summary.json
+    py batch.py --level game/levels/default.klvl --policy script:R*40,RU*20
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from replay import make_simulation, state_hash
+from simulation import GAME_OVER, NO_INPUT, PLAYING, SPRITE_SIZES, WIN, InputState
+
+TIMEOUT = "timeout"
+OUTCOMES = (WIN, GAME_OVER, TIMEOUT)
+DEFAULT_MAX_TICKS = 60 * 60  # 1 minuto de jogo a 60 ticks/s
+DEFAULT_LEVEL = {"kind": "default", "brick": [64, 64], "trophy_size": list(SPRITE_SIZES["trophy"])}
+
+# os 8 InputState possíveis, pela máscara (esquerda=1, direita=2, pulo=4)
+_INPUTS = tuple(InputState(m & 1, m & 2, m & 4) for m in range(8))
+_KEY_BITS = {"L": 1, "R": 2, "U": 4, "N": 0}
+
+
+def session_seed(base_seed, index):
+    """Seed da sessão `index` (estável entre processos e execuções)."""
+    digest = hashlib.sha256(f"{base_seed}:{index}".encode("ascii")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+# --- Políticas ---
+class ConstantPolicy:
+    def __init__(self, inputs):
+        self.inputs = inputs
+
+    def __call__(self, sim):
+        return self.inputs
+
+
+class RandomPolicy:
+    """Teclas aleatórias mantidas por 1..`max_hold` ticks (como um jogador apertando e soltando)."""
+
+    def __init__(self, rng, max_hold=20):
+        self.rng = rng
+        self.max_hold = max_hold
+        self.inputs = NO_INPUT
+        self.hold = 0
+
+    def __call__(self, sim):
+        if self.hold <= 0:
+            self.inputs = _INPUTS[self.rng.randrange(8)]
+            self.hold = self.rng.randint(1, self.max_hold)
+        self.hold -= 1
+        return self.inputs
+
+
+class ScriptPolicy:
+    """Sequência "R*30,RU*10,N*20" (teclas * ticks), repetida em loop."""
+
+    def __init__(self, script):
+        self.inputs = []
+        for token in script.split(","):
+            keys, _, count = token.strip().upper().partition("*")
+            mask = 0
+            for key in keys:
+                if key not in _KEY_BITS:
+                    raise ValueError(f"tecla inválida {key!r} no script (use L, R, U ou N)")
+                mask |= _KEY_BITS[key]
+            self.inputs.extend([_INPUTS[mask]] * int(count or 1))
+        if not self.inputs:
+            raise ValueError("script vazio")
+        self.position = 0
+
+    def __call__(self, sim):
+        inputs = self.inputs[self.position % len(self.inputs)]
+        self.position += 1
+        return inputs
+
+
+def make_policy(name, seed):
+    """Política `name` para uma sessão; `seed` alimenta as políticas aleatórias."""
+    if name == "idle":
+        return ConstantPolicy(NO_INPUT)
+    if name == "right":
+        return ConstantPolicy(InputState(right=True))
+    if name == "right_jump":
+        return ConstantPolicy(InputState(right=True, up=True))
+    if name == "random":
+        # RNG próprio da política: não consome o RNG da simulação
+        return RandomPolicy(random.Random(seed ^ 0x5EED))
+    if name.startswith("script:"):
+        return ScriptPolicy(name[len("script:"):])
+    raise ValueError(f"política desconhecida: {name}")
+
+
+# --- Sessões (rodam nos workers) ---
+def run_session(level_spec, policy_name, base_seed, index, max_ticks, enemy_backend="auto"):
+    """Uma partida. Retorna (índice, seed, desfecho, ticks, segundos, hash do estado final)."""
+    seed = session_seed(base_seed, index)
+    start = time.perf_counter()
+    sim = make_simulation(level_spec, seed, enemy_backend=enemy_backend)
+    state = sim.run(make_policy(policy_name, seed), max_ticks)
+    elapsed = time.perf_counter() - start
+    outcome = state if state != PLAYING else TIMEOUT
+    return index, seed, outcome, sim.tick, elapsed, state_hash(sim)
+
+
+def run_chunk(level_spec, policy_name, base_seed, indices, max_ticks, enemy_backend="auto"):
+    return [run_session(level_spec, policy_name, base_seed, i, max_ticks, enemy_backend) for i in indices]
+
+
+def _chunks(n, count):
+    """Divide range(n) em `count` blocos contíguos de tamanho parecido."""
+    count = max(1, min(n, count))
+    size, extra = divmod(n, count)
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        yield range(start, end)
+        start = end
+
+
+def run_batch(sessions, *, policy="random", seed=0, level_spec=None, max_ticks=DEFAULT_MAX_TICKS,
+              workers=None, enemy_backend="auto", chunks_per_worker=4):
+    """
+    Roda `sessions` partidas em `workers` processos (padrão: um por núcleo;
+    1 roda no próprio processo). Retorna (resultados ordenados por índice, segundos).
+    """
+    level_spec = level_spec or DEFAULT_LEVEL
+    workers = workers or os.cpu_count() or 1
+    make_policy(policy, 0)  # valida o nome/script antes de abrir o pool
+    start = time.perf_counter()
+    if workers == 1:
+        results = run_chunk(level_spec, policy, seed, range(sessions), max_ticks, enemy_backend)
+    else:
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(run_chunk, level_spec, policy, seed, indices, max_ticks, enemy_backend)
+                for indices in _chunks(sessions, workers * chunks_per_worker)
+            ]
+            for future in futures:
+                results.extend(future.result())
+    return sorted(results), time.perf_counter() - start
+
+
+def _percentiles(values):
+    if not values:
+        return None
+    values = sorted(values)
+
+    def pct(p):
+        return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+    return {"mean": statistics.fmean(values), "p50": pct(50), "p95": pct(95), "max": values[-1]}
+
+
+def summarize(results, wall_seconds, workers):
+    """Resumo do lote: desfechos, ticks até o desfecho e tempo por sessão."""
+    total_ticks = sum(r[3] for r in results)
+    outcomes = {}
+    for outcome in OUTCOMES:
+        ticks = [r[3] for r in results if r[2] == outcome]
+        outcomes[outcome] = {
+            "count": len(ticks),
+            "rate": len(ticks) / max(1, len(results)),
+            "ticks": _percentiles(ticks),
+        }
+    session_ms = [r[4] * 1000 for r in results]
+    digest = hashlib.sha1("".join(r[5] for r in results).encode("ascii")).hexdigest()
+    return {
+        "sessions": len(results),
+        "workers": workers,
+        "wall_seconds": wall_seconds,
+        "sessions_per_second": len(results) / wall_seconds if wall_seconds > 0 else None,
+        "ticks_per_second": total_ticks / wall_seconds if wall_seconds > 0 else None,
+        "total_ticks": total_ticks,
+        "outcomes": outcomes,
+        "session_ms": _percentiles(session_ms),
+        # muda se qualquer sessão terminar diferente (regressões de gameplay)
+        "batch_hash": digest,
+    }
+
+
+def _print_summary(summary):
+    print(f"{summary['sessions']} sessões, {summary['workers']} worker(s): {summary['wall_seconds']:.2f} s "
+          f"({summary['sessions_per_second']:,.0f} sessões/s, {summary['ticks_per_second']:,.0f} ticks/s)")
+    for outcome, data in summary["outcomes"].items():
+        line = f"  {outcome:<10} {data['count']:>7} ({data['rate']:6.1%})"
+        if data["ticks"] is not None:
+            t = data["ticks"]
+            line += f"  ticks p50 {t['p50']:>5}  p95 {t['p95']:>5}  máx {t['max']:>5}"
+        print(line)
+    ms = summary["session_ms"]
+    if ms is not None:
+        print(f"  tempo por sessão: média {ms['mean']:.2f} ms  p50 {ms['p50']:.2f} ms  p95 {ms['p95']:.2f} ms")
+    print(f"  hash do lote: {summary['batch_hash']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--policy", default="random")
+    parser.add_argument("--seed", type=int, default=0, help="seed base (cada sessão deriva a sua)")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS)
+    parser.add_argument("--level", type=Path, default=None, help="nível .klvl (padrão: nível do jogo)")
+    parser.add_argument("--workers", default=None,
+                        help="processos (padrão: um por núcleo); lista como 2,4,8 mede a escala "
+                             "(roda também 1 worker, se faltar, como base)")
+    parser.add_argument("--enemy-backend", default="auto", choices=("auto", "objects", "numpy"))
+    parser.add_argument("--out", type=Path, default=None, help="grava o(s) resumo(s) em JSON")
+    parser.add_argument("--per-session", action="store_true", help="inclui cada sessão no JSON")
+    args = parser.parse_args(argv)
+
+    level_spec = {"kind": "file", "path": str(args.level.resolve())} if args.level else DEFAULT_LEVEL
+    worker_counts = [int(w) for w in args.workers.split(",")] if args.workers else [os.cpu_count() or 1]
+    if len(worker_counts) > 1 and 1 not in worker_counts:
+        # a escala é medida contra um lote real com 1 worker
+        worker_counts.insert(0, 1)
+
+    summaries = []
+    for workers in worker_counts:
+        results, wall = run_batch(args.sessions, policy=args.policy, seed=args.seed, level_spec=level_spec,
+                                  max_ticks=args.max_ticks, workers=workers,
+                                  enemy_backend=args.enemy_backend)
+        summary = summarize(results, wall, workers)
+        if args.per_session:
+            summary["per_session"] = [
+                {"index": i, "seed": s, "outcome": o, "ticks": t, "ms": sec * 1000, "hash": h}
+                for i, s, o, t, sec, h in results
+            ]
+        _print_summary(summary)
+        summaries.append(summary)
+
+    if len(summaries) > 1:
+        base = next(s for s in summaries if s["workers"] == 1)
+        print("escala (contra 1 worker):")
+        for summary in summaries:
+            speedup = base["wall_seconds"] / summary["wall_seconds"]
+            print(f"  {summary['workers']:>3} worker(s): {speedup:5.2f}x "
+                  f"(eficiência {speedup / summary['workers']:.0%})")
+        if len({s["batch_hash"] for s in summaries}) > 1:
+            print("AVISO: o hash do lote mudou com o número de workers (não determinístico)")
+
+    if args.out is not None:
+        data = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": sys.version.split()[0],
+                "cpu_count": os.cpu_count(),
+                "policy": args.policy,
+                "seed": args.seed,
+                "max_ticks": args.max_ticks,
+                "level": level_spec,
+            },
+            "runs": summaries,
+        }
+        args.out.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        print(f"Resumo salvo em {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""
+Benchmark de tempo por frame para a simulação (update) e a renderização (draw).
+
+Gera níveis sintéticos com N plataformas / M inimigos e mede cada fase
+separadamente, reportando p50/p95/p99 por tick. Roda com os drivers "dummy"
+do SDL (sem janela nem áudio) e grava o resultado em JSON para comparar versões.
+
+Uso:
+    py benchmarks/frame_bench.py
+    py benchmarks/frame_bench.py --platforms 10,1000,100000 --enemies 2,1000 --ticks 600
+    py benchmarks/frame_bench.py --no-render --out bench_output.json
+"""
+import argparse
+import json
+import os
+import platform as _platform
+import random
+import sys
+import time
+from pathlib import Path
+
+# Precisa ser definido ANTES de importar/inicializar o pygame.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from simulation import (  # noqa: E402
+    BRICK_H,
+    BRICK_W,
+    HEIGHT,
+    PLAYING,
+    SPRITE_SIZES,
+    WIDTH,
+    InputState,
+    Level,
+    Simulation,
+)
+
+try:
+    import pygame
+except Exception:  # pygame pode não estar instalado (só a simulação é medida)
+    pygame = None  # type: ignore[assignment]
+
+if pygame is not None:
+    from animation import Animator, build_frame_table  # noqa: E402
+    from camera import Camera  # noqa: E402
+    from render import (  # noqa: E402
+        background_positions,
+        blit_frame,
+        blit_frames,
+        blit_platforms,
+        build_static_layer,
+        static_layer_fits,
+        world_size,
+    )
+
+SPRITES_DIR = ROOT / "game" / "sprites"
+DEFAULT_OUT = ROOT / "bench_output.json"
+
+
+def generate_level(n_platforms, n_enemies, *, trophy="far", seed=0):
+    """
+    Nível sintético: chão + plataformas espalhadas numa área que cresce com N.
+
+    A área mantém densidade parecida com a do nível padrão (~1 plataforma por
+    tela de 800x600 a cada 4), então níveis grandes ficam maiores que a tela.
+    """
+    rng = random.Random(seed)
+    screens = max(1, n_platforms // 4)
+    cols = max(1, int(screens ** 0.5))
+    width = WIDTH * cols
+    height = HEIGHT * max(1, -(-screens // cols))
+
+    rects = [(0, height - BRICK_H, width, BRICK_H)]  # chão
+    for _ in range(max(0, n_platforms - 1)):
+        w = BRICK_W * rng.randint(1, 4)
+        x = rng.randrange(0, max(1, width - w), BRICK_W)
+        y = rng.randrange(BRICK_H * 2, max(BRICK_H * 3, height - BRICK_H * 2), BRICK_H)
+        rects.append((x, y, w, BRICK_H))
+
+    hero_spawn = (100, height - 150)
+    enemy_spawns = []
+    for _ in range(n_enemies):
+        # longe do spawn do herói, para a partida não acabar logo no início
+        ex = rng.uniform(min(width - 1, 400), width)
+        ey = rng.uniform(0, height - BRICK_H)
+        enemy_spawns.append((ex, ey))
+
+    tw, th = SPRITE_SIZES["trophy"]
+    if trophy == "near":
+        trophy_rect = (hero_spawn[0] + 300, hero_spawn[1] - th, tw, th)
+    elif trophy == "far":
+        trophy_rect = (width - tw - 24, height / 2 - th / 2, tw, th)
+    else:
+        trophy_rect = None
+
+    return Level(rects, width=width, height=height, hero_spawn=hero_spawn,
+                 enemy_spawns=enemy_spawns, trophy=trophy_rect)
+
+
+def percentiles(samples):
+    """p50/p95/p99/média/máximo (em ms) de uma lista de durações em segundos."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    n = len(ordered)
+
+    def pick(p):
+        # nearest-rank
+        return ordered[min(n - 1, max(0, int(round(p / 100.0 * n + 0.5)) - 1))] * 1000.0
+
+    return {
+        "p50_ms": pick(50),
+        "p95_ms": pick(95),
+        "p99_ms": pick(99),
+        "mean_ms": sum(ordered) / n * 1000.0,
+        "max_ms": ordered[-1] * 1000.0,
+        "samples": n,
+    }
+
+
+def bench_simulation(level, ticks, seed, enemy_backend="auto"):
+    """Mede `Simulation.step` por tick com entradas aleatórias determinísticas."""
+    sim = Simulation(level, rng=random.Random(seed), enemy_backend=enemy_backend)
+    inputs_rng = random.Random(seed + 1)
+    inputs = [
+        InputState(inputs_rng.random() < 0.2, inputs_rng.random() < 0.6, inputs_rng.random() < 0.1)
+        for _ in range(ticks)
+    ]
+    samples = []
+    clock = time.perf_counter
+    for inp in inputs:
+        if sim.state != PLAYING:
+            # ignora game over/vitória: o benchmark mede ticks contínuos
+            sim.state = PLAYING
+        t0 = clock()
+        sim.step(inp)
+        samples.append(clock() - t0)
+    return sim, samples
+
+
+def _load_sprites():
+    sprites = {}
+    for p in SPRITES_DIR.glob("*.png"):
+        try:
+            sprites[p.stem] = pygame.image.load(str(p)).convert_alpha()
+        except Exception:
+            pass
+    return sprites
+
+
+def bench_render(sim, sprites, frames, mode, seed=0):
+    """
+    Mede o custo de desenhar um frame da fase pelo mesmo caminho do `draw()` do
+    main.py: a simulação avança um tick por frame (fora da medição), a câmera
+    segue o herói e só o que cruza a área visível é desenhado (TileGrid para
+    plataformas, broadphase para inimigos e troféu), com os frames
+    pré-resolvidos do animation.py e os helpers do render.py.
+
+    - "static": camada estática do nível inteiro + entidades (padrão do jogo);
+      níveis maiores que STATIC_LAYER_MAX_SCREENS telas são desenhados tile a
+      tile, como no jogo;
+    - "tiles": fundo + tiles visíveis + entidades (GAME_STATIC_LAYER=0).
+
+    Retorna (amostras, ms para montar a camada estática ou None, se a camada foi usada).
+    """
+    screen = pygame.display.get_surface()
+    blit = screen.blit
+    background = sprites.get("treasure_cave")
+    brick = sprites.get("brick")
+    trophy_surf = sprites.get("trophy")
+    animator = Animator(build_frame_table(sprites.__getitem__))
+    level = sim.level
+    size = world_size(level, WIDTH, HEIGHT)
+    camera = Camera(WIDTH, HEIGHT, *size)
+
+    build_ms = None
+    static_layer = None
+    if mode == "static" and static_layer_fits(size, WIDTH, HEIGHT):
+        t0 = time.perf_counter()
+        static_layer = build_static_layer(size, background, brick, level.platforms.rects(), BRICK_W)
+        build_ms = (time.perf_counter() - t0) * 1000.0
+
+    inputs_rng = random.Random(seed + 2)
+    samples = []
+    clock = time.perf_counter
+    for _ in range(frames):
+        if sim.state != PLAYING:
+            sim.state = PLAYING
+        sim.step(InputState(inputs_rng.random() < 0.2, inputs_rng.random() < 0.6, inputs_rng.random() < 0.1))
+        camera.follow(sim.hero.x, sim.hero.y)
+
+        t0 = clock()
+        ox, oy = camera.offset
+        if static_layer is not None:
+            blit(static_layer, (0, 0), (ox, oy, WIDTH, HEIGHT))
+        else:
+            screen.fill((0, 0, 0))
+            if background is not None:
+                for pos in background_positions(background.get_size(), ox, oy, WIDTH, HEIGHT):
+                    blit(background, pos)
+        view = camera.viewport()
+        indices, trophy_visible = sim.visible_entities(*view)
+        if static_layer is None and brick is not None:
+            rects = [level.platforms.bounds(i) for i in level.grid.overlapping(*view)]
+            blit_platforms(blit, brick, BRICK_W, rects, ox, oy, view[0], view[2])
+        by_name = animator.by_name
+        blit_frame(blit, by_name[sim.hero.image], sim.hero.x, sim.hero.y, ox, oy)
+        for i in indices:
+            enemy = sim.enemies[i]
+            blit_frame(blit, by_name[enemy.image], enemy.x, enemy.y, ox, oy)
+        if sim.swarm is not None:
+            swarm = sim.swarm
+            visible = swarm.overlapping(*view)
+            blit_frames(blit, animator.swarm_frames, swarm.x[visible].tolist(), swarm.y[visible].tolist(),
+                        swarm.image[visible].tolist(), ox, oy)
+        if level.trophy is not None and trophy_visible and trophy_surf is not None:
+            blit(trophy_surf, (level.trophy[0] - ox, level.trophy[1] - oy))
+        samples.append(clock() - t0)
+    return samples, build_ms, static_layer is not None
+
+
+def _csv_ints(text):
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--platforms", type=_csv_ints, default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--enemies", type=_csv_ints, default=[2, 100, 1000])
+    parser.add_argument("--trophy", choices=("far", "near", "none"), default="far")
+    parser.add_argument("--ticks", type=int, default=300, help="ticks de simulação por caso")
+    parser.add_argument("--frames", type=int, default=120, help="frames renderizados por caso")
+    parser.add_argument("--render-modes", default="static,tiles")
+    parser.add_argument("--no-render", action="store_true", help="mede só a simulação")
+    parser.add_argument("--enemy-backend", choices=("auto", "objects", "numpy"), default="auto")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    args = parser.parse_args(argv)
+
+    render_modes = [] if args.no_render else [m for m in args.render_modes.split(",") if m]
+    sprites = {}
+    render_note = None
+    if render_modes:
+        if pygame is None:
+            render_note = "pygame indisponível: renderização não medida"
+            render_modes = []
+        else:
+            pygame.display.init()
+            pygame.display.set_mode((WIDTH, HEIGHT))
+            sprites = _load_sprites()
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": _platform.platform(),
+            "pygame": pygame.version.ver if pygame is not None else None,
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+            "ticks": args.ticks,
+            "frames": args.frames,
+            "seed": args.seed,
+            "trophy": args.trophy,
+            "enemy_backend": args.enemy_backend,
+            "note": render_note,
+        },
+        "cases": [],
+    }
+
+    for n_platforms in args.platforms:
+        for n_enemies in args.enemies:
+            level = generate_level(n_platforms, n_enemies, trophy=args.trophy, seed=args.seed)
+            sim, sim_samples = bench_simulation(level, args.ticks, args.seed, args.enemy_backend)
+            case = {
+                "platforms": n_platforms,
+                "enemies": n_enemies,
+                "world": [level.width, level.height],
+                "enemy_backend": "numpy" if sim.swarm is not None else "objects",
+                "simulation": percentiles(sim_samples),
+                "render": {},
+            }
+            start = sim.snapshot()
+            for mode in render_modes:
+                sim.restore(start)  # os dois modos desenham a mesma sequência de ticks
+                samples, build_ms, used_layer = bench_render(sim, sprites, args.frames, mode, args.seed)
+                case["render"][mode] = percentiles(samples)
+                case["render"][mode]["static_layer"] = used_layer
+                if build_ms is not None:
+                    case["render"][mode]["static_layer_build_ms"] = build_ms
+            results["cases"].append(case)
+
+            line = f"platforms={n_platforms:>6} enemies={n_enemies:>5}  sim p50/p95/p99 = " \
+                   f"{case['simulation']['p50_ms']:.3f}/{case['simulation']['p95_ms']:.3f}/" \
+                   f"{case['simulation']['p99_ms']:.3f} ms"
+            for mode, stats in case["render"].items():
+                line += f"  | {mode} p50/p99 = {stats['p50_ms']:.3f}/{stats['p99_ms']:.3f} ms"
+            print(line)
+
+    if render_note:
+        print(f"Aviso: {render_note}")
+    args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Resultados salvos em {args.out}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
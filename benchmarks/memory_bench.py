@@ -0,0 +1,182 @@
+"""
+Benchmark de memória por entidade (plataformas e inimigos).
+
+Mede com tracemalloc o que o jogo mantém na memória para N plataformas e M
+inimigos, comparado com a representação do main.py original:
+
+- plataformas, antes: a lista `platforms`, um objeto com `__dict__` + um `Rect`
+  por plataforma;
+- plataformas, agora: o `Level` inteiro, como o jogo o mantém (o
+  `PlatformArray` com a geometria, o índice da `TileGrid` e as views do
+  main.py sobre o mesmo array), com a divisão entre geometria e índice;
+- inimigos: `EnemyState` + view com `__slots__` contra a classe antiga com
+  `__dict__` e listas de frames próprias.
+
+O nível é gerado como no frame_bench (densidade parecida com a do nível
+padrão), porque o índice da grade cresce com a área do nível. Os Actors do
+pgzero ficam de fora: são iguais nos dois casos.
+
+Uso:
+    py benchmarks/memory_bench.py
+    py benchmarks/memory_bench.py --platforms 100000 --enemies 10000 --out memory_bench.json
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from platforms import PlatformArray, PlatformView  # noqa: E402
+from simulation import BRICK_H, BRICK_W, HEIGHT, WIDTH, EnemyState, Level  # noqa: E402
+
+try:
+    from pygame import Rect
+except Exception:  # sem pygame, o "antes" usa uma tupla no lugar do Rect
+    Rect = None  # type: ignore[assignment]
+
+
+# --- Representação antiga (como era no main.py original) ---
+class _OldPlatform:
+    def __init__(self, x, y, w, h):
+        self.rect = Rect((x, y), (w, h)) if Rect is not None else (x, y, w, h)
+
+
+class _OldEnemy:
+    def __init__(self, x, y, direction):
+        self.x = x
+        self.y = y
+        self.idle_frames = ["enemy_idle1", "enemy_idle2"]
+        self.move_frames = ["enemy_move1", "enemy_move2"]
+        self.current_frame = 0
+        self.frame_timer = 0
+        self.actor = None
+        self.direction = direction
+        self.speed = 2
+        self.pause_frames = 0
+
+
+# --- Representação atual (views do main.py, sem o Actor) ---
+class _EnemyView:
+    """Mesmos campos de `main._EntityView` (o main.py não roda sem o pgzrun)."""
+
+    __slots__ = ("state", "actor", "prev_x", "prev_y", "pos", "frame")
+
+    def __init__(self, state):
+        self.state = state
+        self.actor = None
+        self.prev_x = state.x
+        self.prev_y = state.y
+        self.pos = (state.x, state.y)
+        self.frame = None
+
+
+def measure(build, inspect=None):
+    """
+    Bytes alocados (e ainda vivos) por `build()`; `inspect(obj)` devolve
+    campos extras do resultado (ex.: divisão por estrutura).
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    extra = inspect(obj) if inspect is not None else {}
+    del obj
+    gc.collect()
+    return after - before, extra
+
+
+def level_rects(n, seed):
+    """Plataformas de um nível como o do frame_bench: chão + N-1 plataformas numa área que cresce com N."""
+    rng = random.Random(seed)
+    screens = max(1, n // 4)
+    cols = max(1, int(screens ** 0.5))
+    width = WIDTH * cols
+    height = HEIGHT * max(1, -(-screens // cols))
+    rects = [(0, height - BRICK_H, width, BRICK_H)]
+    for _ in range(max(0, n - 1)):
+        w = BRICK_W * rng.randint(1, 4)
+        x = rng.randrange(0, max(1, width - w), BRICK_W)
+        y = rng.randrange(BRICK_H * 2, max(BRICK_H * 3, height - BRICK_H * 2), BRICK_H)
+        rects.append((x, y, w, BRICK_H))
+    return rects, width, height
+
+
+def random_spawns(n, seed):
+    rng = random.Random(seed)
+    return [(rng.uniform(0, 6_400_000), rng.uniform(0, 64_000), rng.choice((-1, 1))) for _ in range(n)]
+
+
+def _game_level(rects, width, height):
+    """O que o jogo mantém: o Level e as views do main.py sobre a mesma geometria."""
+    level = Level(rects, width=width, height=height)
+    return level, level.platforms.view_as(PlatformView)
+
+
+def _level_breakdown(obj):
+    level, _views = obj
+    return {"geometry_bytes": level.platforms.nbytes, "grid_index_bytes": level.grid.nbytes}
+
+
+def bench(n_platforms, n_enemies, seed=0):
+    rects, width, height = level_rects(n_platforms, seed)
+    spawns = random_spawns(n_enemies, seed)
+    cases = {
+        "platforms_before": (n_platforms, lambda: [_OldPlatform(*r) for r in rects], None),
+        "platforms_after": (n_platforms, lambda: _game_level(rects, width, height), _level_breakdown),
+        "enemies_before": (n_enemies, lambda: [_OldEnemy(x, y, d) for x, y, d in spawns], None),
+        "enemies_after": (n_enemies, lambda: [_EnemyView(EnemyState(x, y, d)) for x, y, d in spawns], None),
+    }
+    results = {}
+    for name, (count, build, inspect) in cases.items():
+        total, extra = measure(build, inspect)
+        results[name] = {"count": count, "bytes": total, "bytes_per_entity": total / max(1, count)}
+        for key, value in extra.items():
+            results[name][key] = value
+            results[name][key.replace("_bytes", "_bytes_per_entity")] = value / max(1, count)
+    return results, (width, height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--platforms", type=int, default=100_000)
+    parser.add_argument("--enemies", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    results, world = bench(args.platforms, args.enemies, args.seed)
+    print(f"nível de {world[0]}x{world[1]} px")
+    for name, r in results.items():
+        line = (f"{name:<18} {r['count']:>8} entidades  {r['bytes'] / 1024 / 1024:8.2f} MiB  "
+                f"{r['bytes_per_entity']:7.1f} B/entidade")
+        if "geometry_bytes" in r:
+            line += (f"  (geometria {r['geometry_bytes_per_entity']:.1f} B, "
+                     f"índice da grade {r['grid_index_bytes_per_entity']:.1f} B)")
+        print(line)
+    if args.out is not None:
+        data = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": sys.version.split()[0],
+                "rect": "pygame.Rect" if Rect is not None else "tuple (pygame indisponível)",
+                "world": list(world),
+                "view_size": sys.getsizeof(PlatformView(None, 0)),
+            },
+            "cases": results,
+        }
+        args.out.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        print(f"Resultado salvo em {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
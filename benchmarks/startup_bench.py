@@ -0,0 +1,107 @@
+"""
+Benchmark do tempo de inicialização (início frio x quente).
+
+Roda o jogo N vezes em subprocessos com os drivers "dummy" do SDL e
+`GAME_STARTUP_REPORT=exit` (o jogo sai assim que o menu aparece e o áudio
+termina de inicializar). Nos inícios frios o manifesto de início rápido é
+apagado antes de cada execução (preparação completa dos assets); nos quentes
+ele é mantido. Reporta a mediana de cada fase.
+
+Uso:
+    py benchmarks/startup_bench.py
+    py benchmarks/startup_bench.py --runs 10 --out startup_bench.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from startup import MANIFEST_NAME, StartupTimer  # noqa: E402
+
+
+def run_once(report_path, timeout):
+    """Um início do jogo; retorna o relatório (phases_ms) ou None se falhar."""
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["GAME_STARTUP_REPORT"] = "exit"
+    env["GAME_STARTUP_REPORT_PATH"] = str(report_path)
+    try:
+        report_path.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        subprocess.run([sys.executable, str(ROOT / "main.py")], cwd=ROOT, env=env, timeout=timeout,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    except subprocess.TimeoutExpired:
+        return None
+    try:
+        data = json.loads(report_path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return next(iter(data.values()), None)
+
+
+def bench(runs, timeout=60.0):
+    manifest = ROOT / "game" / MANIFEST_NAME
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = Path(tmp) / "startup_report.json"
+        for kind in ("cold", "warm"):
+            reports = []
+            for _ in range(runs):
+                if kind == "cold":
+                    try:
+                        manifest.unlink()
+                    except FileNotFoundError:
+                        pass
+                report = run_once(report_path, timeout)
+                if report is not None and report.get("kind") == kind:
+                    reports.append(report["phases_ms"])
+            results[kind] = {
+                "runs": len(reports),
+                "median_ms": {
+                    name: statistics.median(r[name] for r in reports)
+                    for name in StartupTimer.PHASES
+                    if reports and all(name in r for r in reports)
+                },
+            }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    results = bench(args.runs, args.timeout)
+    for kind, r in results.items():
+        print(f"{kind} ({r['runs']}/{args.runs} execuções)")
+        for name, ms in r["median_ms"].items():
+            print(f"  {name:<15} {ms:9.1f} ms")
+    if args.out is not None:
+        data = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": sys.version.split()[0],
+            },
+            "results": results,
+        }
+        args.out.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        print(f"Resultado salvo em {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
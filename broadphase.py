@@ -0,0 +1,116 @@
+"""
+Fase ampla (broadphase) de colisão para entidades dinâmicas.
+
+`SpatialHash` divide o mundo em células quadradas e guarda em quais células
+cada entidade (herói, inimigos, troféu) está. Uma consulta só compara o
+retângulo com as entidades das células que ele cobre, e `pairs()` devolve os
+pares candidatos entre entidades sem o O(n²) de testar todos contra todos.
+O teste exato de retângulo só roda nesses candidatos.
+
+A grade é reconstruída a cada tick (`clear` + `insert`): com poucas centenas
+de entidades isso é mais barato que manter atualizações incrementais.
+"""
+
+
+class SpatialHash:
+    def __init__(self, cell_size=128):
+        self.cell_size = max(1, int(cell_size))
+        self._cells = {}   # (cx, cy) -> [key, ...]
+        self._bounds = {}  # key -> (left, top, right, bottom)
+
+    def __len__(self):
+        return len(self._bounds)
+
+    def __contains__(self, key):
+        return key in self._bounds
+
+    def clear(self):
+        self._cells.clear()
+        self._bounds.clear()
+
+    def _span(self, left, top, right, bottom):
+        cs = self.cell_size
+        return int(left // cs), int(top // cs), int(right // cs), int(bottom // cs)
+
+    def insert(self, key, left, top, right, bottom):
+        """Registra uma entidade (chave hashable) com seu retângulo atual."""
+        if key in self._bounds:
+            self.remove(key)
+        self._bounds[key] = (left, top, right, bottom)
+        c0, r0, c1, r1 = self._span(left, top, right, bottom)
+        cells = self._cells
+        for cy in range(r0, r1 + 1):
+            for cx in range(c0, c1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [key]
+                else:
+                    bucket.append(key)
+
+    def remove(self, key):
+        bounds = self._bounds.pop(key, None)
+        if bounds is None:
+            return
+        c0, r0, c1, r1 = self._span(*bounds)
+        for cy in range(r0, r1 + 1):
+            for cx in range(c0, c1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is not None:
+                    try:
+                        bucket.remove(key)
+                    except ValueError:
+                        pass
+                    if not bucket:
+                        del self._cells[(cx, cy)]
+
+    def bounds(self, key):
+        return self._bounds[key]
+
+    def candidates(self, left, top, right, bottom):
+        """Chaves nas células cobertas pelo retângulo (sem teste exato)."""
+        c0, r0, c1, r1 = self._span(left, top, right, bottom)
+        cells = self._cells
+        found = []
+        seen = set()
+        for cy in range(r0, r1 + 1):
+            for cx in range(c0, c1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for key in bucket:
+                    if key not in seen:
+                        seen.add(key)
+                        found.append(key)
+        return found
+
+    def query(self, left, top, right, bottom, *, exclude=None):
+        """Chaves cujo retângulo se sobrepõe (estritamente) ao retângulo dado."""
+        result = []
+        all_bounds = self._bounds
+        for key in self.candidates(left, top, right, bottom):
+            if key == exclude:
+                continue
+            l, t, r, b = all_bounds[key]
+            if l < right and r > left and t < bottom and b > top:
+                result.append(key)
+        return result
+
+    def pairs(self):
+        """Pares (a, b) de entidades que se sobrepõem, cada par uma única vez."""
+        all_bounds = self._bounds
+        seen = set()
+        result = []
+        for bucket in self._cells.values():
+            n = len(bucket)
+            for i in range(n):
+                a = bucket[i]
+                al, at, ar, ab = all_bounds[a]
+                for j in range(i + 1, n):
+                    b = bucket[j]
+                    if (a, b) in seen or (b, a) in seen:
+                        continue
+                    seen.add((a, b))
+                    bl, bt, br, bb = all_bounds[b]
+                    if al < br and ar > bl and at < bb and ab > bt:
+                        result.append((a, b))
+        return result
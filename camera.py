@@ -0,0 +1,49 @@
+"""
+Câmera 2D que segue o herói.
+
+Converte coordenadas do mundo para a tela e expõe o retângulo visível
+(`viewport`), usado pelo `draw()` para só desenhar o que está na tela.
+Quando o nível cabe na janela, o deslocamento fica em (0, 0) e o jogo
+desenha exatamente como antes.
+"""
+
+
+class Camera:
+    def __init__(self, view_w, view_h, world_w=None, world_h=None):
+        self.view_w = view_w
+        self.view_h = view_h
+        self.world_w = view_w if world_w is None else world_w
+        self.world_h = view_h if world_h is None else world_h
+        self.x = 0  # canto superior esquerdo da área visível, em coordenadas do mundo
+        self.y = 0
+
+    def set_world(self, world_w, world_h):
+        self.world_w = world_w
+        self.world_h = world_h
+        self._clamp()
+
+    @property
+    def scrolls(self):
+        """True se o mundo é maior que a janela (a câmera se move)."""
+        return self.world_w > self.view_w or self.world_h > self.view_h
+
+    def _clamp(self):
+        self.x = max(0, min(self.x, self.world_w - self.view_w))
+        self.y = max(0, min(self.y, self.world_h - self.view_h))
+
+    def follow(self, x, y):
+        """Centraliza em (x, y), sem mostrar nada fora dos limites do mundo."""
+        self.x = int(x - self.view_w / 2)
+        self.y = int(y - self.view_h / 2)
+        self._clamp()
+
+    @property
+    def offset(self):
+        return self.x, self.y
+
+    def viewport(self):
+        """(left, top, right, bottom) da área visível, em coordenadas do mundo."""
+        return self.x, self.y, self.x + self.view_w, self.y + self.view_h
+
+    def to_screen(self, x, y):
+        return x - self.x, y - self.y
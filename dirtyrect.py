@@ -0,0 +1,76 @@
+"""
+Renderização por retângulos sujos para telas quase estáticas (MENU, GAME_OVER, WIN).
+
+Cada frame, a tela é descrita como uma lista de itens
+`(id, rect, assinatura, desenhar)`. O `DirtyRenderer` compara com o frame
+anterior: só as áreas de itens novos, removidos, movidos ou com assinatura
+diferente (ex.: label de botão que mudou) são redesenhadas, com clip na
+área suja. Se nada mudou, o frame não desenha nada; a superfície da tela
+mantém o conteúdo anterior.
+"""
+import pygame
+
+# Se a área suja passar dessa fração da tela, redesenha tudo de uma vez.
+FULL_REDRAW_FRACTION = 0.5
+
+
+class DirtyRenderer:
+    def __init__(self, size):
+        self.size = size
+        self._scene = None
+        self._items = {}  # id -> (Rect, assinatura)
+        self.last_dirty = []
+
+    def invalidate(self):
+        """Força um redesenho completo no próximo `render` (ex.: a tela mudou)."""
+        self._scene = None
+        self._items = {}
+
+    def _dirty_rects(self, scene, items):
+        full = pygame.Rect((0, 0), self.size)
+        if scene != self._scene:
+            return [full]
+        dirty = []
+        seen = set()
+        for item_id, rect, signature, _draw in items:
+            seen.add(item_id)
+            previous = self._items.get(item_id)
+            if previous is None:
+                dirty.append(rect)
+            elif previous[0] != rect or previous[1] != signature:
+                dirty.append(previous[0])
+                if previous[0] != rect:
+                    dirty.append(rect)
+        for item_id, (rect, _signature) in self._items.items():
+            if item_id not in seen:
+                dirty.append(rect)
+        dirty = [full.clip(rect) for rect in dirty]
+        dirty = [rect for rect in dirty if rect.width > 0 and rect.height > 0]
+        if sum(rect.width * rect.height for rect in dirty) > FULL_REDRAW_FRACTION * full.width * full.height:
+            return [full]
+        return dirty
+
+    def render(self, surface, scene, items, draw_background):
+        """
+        Redesenha só o que mudou desde o último frame da mesma `scene`.
+
+        `items`: sequência de (id, pygame.Rect, assinatura, desenhar()), na ordem
+        de desenho; `draw_background(rect)` repinta o fundo de uma área.
+        Retorna os retângulos redesenhados (vazio se nada mudou).
+        """
+        items = [(item_id, pygame.Rect(rect), signature, draw) for item_id, rect, signature, draw in items]
+        dirty = self._dirty_rects(scene, items)
+        previous_clip = surface.get_clip()
+        try:
+            for area in dirty:
+                surface.set_clip(area)
+                draw_background(area)
+                for _id, rect, _signature, draw in items:
+                    if rect.colliderect(area):
+                        draw()
+        finally:
+            surface.set_clip(previous_clip)
+        self._scene = scene
+        self._items = {item_id: (rect, signature) for item_id, rect, signature, _draw in items}
+        self.last_dirty = dirty
+        return dirty
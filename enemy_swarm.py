@@ -0,0 +1,121 @@
+"""
+Sistema de inimigos em "struct of arrays" (NumPy).
+
+Em vez de um objeto `EnemyState` por inimigo (uma chamada Python por inimigo
+por tick), posições, direções, pausas e frames ficam em arrays e todos os
+inimigos avançam num único passo vetorizado. Mesmas regras de
+`simulation.step_enemy`: anda, inverte a direção com 1% de chance, pausa com
+0,5% de chance por 30-90 ticks e troca de frame no relógio compartilhado
+(`simulation.animation_frame`).
+
+A sequência de números aleatórios é a do gerador do NumPy (não a do módulo
+`random`), então o comportamento é o mesmo em distribuição, não bit a bit.
+"""
+from copy import deepcopy as copy_state
+
+try:
+    import numpy as np
+except Exception:  # NumPy é opcional: sem ele, a simulação usa EnemyState
+    np = None  # type: ignore[assignment]
+
+from simulation import (
+    ENEMY_ANIM_DELAY,
+    ENEMY_FLIP_CHANCE,
+    ENEMY_IDLE_FRAMES,
+    ENEMY_MOVE_FRAMES,
+    ENEMY_PAUSE_CHANCE,
+    ENEMY_PAUSE_RANGE,
+    ENEMY_SPEED,
+    SPRITE_SIZES,
+    animation_frame,
+)
+
+# Índices de imagem: idle = 0..len(idle)-1, move = len(idle)..
+IMAGE_NAMES = ENEMY_IDLE_FRAMES + ENEMY_MOVE_FRAMES
+_MOVE_BASE = len(ENEMY_IDLE_FRAMES)
+
+
+def available():
+    """True se o NumPy estiver instalado."""
+    return np is not None
+
+
+class EnemySwarm:
+    # arrays com o estado por inimigo (o que snapshot/restore copiam)
+    _ARRAYS = ("x", "y", "direction", "speed", "pause_frames", "image")
+
+    def __init__(self, spawns, directions, *, seed=None, sprite_sizes=SPRITE_SIZES):
+        if np is None:
+            raise RuntimeError("EnemySwarm requer NumPy (pip install numpy).")
+        n = len(spawns)
+        xy = np.asarray(spawns, dtype=np.float64).reshape(n, 2)
+        self.x = xy[:, 0].copy()
+        self.y = xy[:, 1].copy()
+        self.direction = np.asarray(directions, dtype=np.int8).reshape(n)
+        self.speed = np.full(n, ENEMY_SPEED, dtype=np.float64)
+        self.pause_frames = np.zeros(n, dtype=np.int32)
+        self.image = np.zeros(n, dtype=np.int8)  # índice em IMAGE_NAMES
+        self.rng = np.random.default_rng(seed)
+
+        # meia largura/altura por índice de imagem (hitbox = sprite atual)
+        sizes = np.array([sprite_sizes.get(name, (64, 64)) for name in IMAGE_NAMES], dtype=np.float64)
+        self._half_w = sizes[:, 0] / 2
+        self._half_h = sizes[:, 1] / 2
+
+    def __len__(self):
+        return len(self.x)
+
+    def step(self, tick=0):
+        """Avança todos os inimigos um tick (`tick`: relógio de animação)."""
+        n = len(self.x)
+        if n == 0:
+            return
+
+        # Às vezes o inimigo "para" e fica em idle (com animação)
+        moving = self.pause_frames <= 0
+        self.pause_frames[~moving] -= 1
+        self.x[moving] += self.direction[moving] * self.speed[moving]
+
+        # change direction randomly / chance de parar por um tempo
+        rolls = self.rng.random((2, n))
+        flip = moving & (rolls[0] < ENEMY_FLIP_CHANCE)
+        self.direction[flip] *= -1
+        pause = moving & (rolls[1] < ENEMY_PAUSE_CHANCE)
+        count = int(pause.sum())
+        if count:
+            low, high = ENEMY_PAUSE_RANGE
+            self.pause_frames[pause] = self.rng.integers(low, high + 1, size=count)
+
+        # animação: mesmo frame para todos no relógio compartilhado (move ou idle)
+        move_frame = _MOVE_BASE + animation_frame(tick, ENEMY_ANIM_DELAY, len(ENEMY_MOVE_FRAMES))
+        idle_frame = animation_frame(tick, ENEMY_ANIM_DELAY, len(ENEMY_IDLE_FRAMES))
+        self.image[:] = np.where(moving, move_frame, idle_frame)
+
+    def snapshot(self):
+        """Cópias somente-leitura dos arrays + estado do gerador aleatório."""
+        arrays = []
+        for name in self._ARRAYS:
+            copy = getattr(self, name).copy()
+            copy.setflags(write=False)
+            arrays.append(copy)
+        return tuple(arrays), copy_state(self.rng.bit_generator.state)
+
+    def restore(self, snap):
+        """Copia o snapshot de volta nos arrays existentes (sem realocar)."""
+        arrays, rng_state = snap
+        for name, saved in zip(self._ARRAYS, arrays):
+            np.copyto(getattr(self, name), saved)
+        self.rng.bit_generator.state = copy_state(rng_state)
+
+    def overlapping(self, left, top, right, bottom):
+        """Índices dos inimigos cujo sprite se sobrepõe (estritamente) ao retângulo."""
+        hw = self._half_w[self.image]
+        hh = self._half_h[self.image]
+        hit = (
+            (self.x - hw < right) & (self.x + hw > left)
+            & (self.y - hh < bottom) & (self.y + hh > top)
+        )
+        return np.flatnonzero(hit)
+
+    def image_name(self, i):
+        return IMAGE_NAMES[int(self.image[i])]
@@ -0,0 +1,351 @@
+"""
+Formato binário de nível (.klvl) com leitura em chunks via mmap.
+
+Layout (little-endian):
+
+    header       struct HEADER (magic, versão, tamanhos, spawn do herói, troféu)
+    chunk index  para cada chunk (linha a linha): u32 início, u32 quantidade
+                 de spawns na tabela de spawns; u32 início, u32 quantidade de
+                 referências na tabela de referências de retângulos
+    tiles        um bloco de chunk_size x chunk_size bytes por chunk (0 = vazio,
+                 1 = brick), na mesma ordem do índice; chunks da borda são
+                 completados com 0
+    rects        struct RECT (x, y, w, h) em pixels: plataformas com posição e
+                 tamanho exatos, fora da grade de tiles
+    rect refs    u32 índices em `rects` de cada plataforma que toca o chunk,
+                 agrupados por chunk
+    spawns       struct SPAWN (tipo, x, y) agrupados por chunk
+
+Níveis feitos na grade usam só os tiles (1 byte por tile); a tabela de
+retângulos guarda a geometria que não cai na grade, como a do nível padrão,
+sem arredondar. A largura e a altura do mundo também vão em pixels no header.
+
+Como cada chunk tem tamanho fixo, o offset de qualquer chunk é calculado sem
+ler o resto do arquivo: `StreamingLevel` materializa só os chunks perto do
+herói (plataformas + inimigos) e descarta os que ficaram longe, então um nível
+muito maior que a tela não precisa caber inteiro na memória.
+
+Uso:
+    py levelfile.py export game/levels/default.klvl   # exporta o nível padrão
+"""
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+from platforms import PlatformArray
+from simulation import BRICK_H, BRICK_W, Level, build_default_level
+from tilegrid import TileGrid
+
+MAGIC = b"KLVL"
+VERSION = 2  # v2: tabela de retângulos exatos e tamanho do mundo em pixels
+# magic, version, tile_w, tile_h, width_tiles, height_tiles, chunk_size,
+# width, height, hero_x, hero_y, has_trophy, trophy (x, y, w, h), spawn_count,
+# rect_count, rect_ref_count
+HEADER = struct.Struct("<4sHHHIIHIIff?xxxffffIII")
+CHUNK_ENTRY = struct.Struct("<IIII")
+RECT = struct.Struct("<dddd")
+RECT_REF = struct.Struct("<I")
+SPAWN = struct.Struct("<Bxxxff")
+
+TILE_EMPTY = 0
+TILE_BRICK = 1
+SPAWN_ENEMY = 1
+
+DEFAULT_CHUNK_SIZE = 32  # tiles por lado
+
+
+def write_level(path, tiles, width_tiles, height_tiles, *, tile_w=BRICK_W, tile_h=BRICK_H,
+                rects=(), width=None, height=None, hero_spawn=(100, 450), trophy=None,
+                enemy_spawns=(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Grava um nível. `tiles` tem width_tiles * height_tiles bytes (linha a linha);
+    `rects` são plataformas exatas (x, y, w, h) em pixels, fora da grade;
+    `width`/`height` são o tamanho do mundo em pixels (padrão: o da grade);
+    `enemy_spawns` são posições (x, y) em pixels; `trophy` é (x, y, w, h) ou None.
+    """
+    if len(tiles) != width_tiles * height_tiles:
+        raise ValueError("tiles deve ter width_tiles * height_tiles bytes")
+    width = width_tiles * tile_w if width is None else width
+    height = height_tiles * tile_h if height is None else height
+    rects = list(rects)
+    cols = -(-width_tiles // chunk_size)
+    rows = -(-height_tiles // chunk_size)
+    chunk_px_w = chunk_size * tile_w
+    chunk_px_h = chunk_size * tile_h
+
+    by_chunk = [[] for _ in range(cols * rows)]
+    for x, y in enemy_spawns:
+        cx = min(cols - 1, max(0, int(x // chunk_px_w)))
+        cy = min(rows - 1, max(0, int(y // chunk_px_h)))
+        by_chunk[cy * cols + cx].append((SPAWN_ENEMY, x, y))
+
+    # Cada retângulo é referenciado por todos os chunks que ele toca, para que
+    # uma plataforma longa exista em qualquer trecho ativo; o StreamingLevel
+    # junta as referências sem repetir.
+    refs_by_chunk = [[] for _ in range(cols * rows)]
+    for i, (x, y, w, h) in enumerate(rects):
+        c0 = min(cols - 1, max(0, int(x // chunk_px_w)))
+        r0 = min(rows - 1, max(0, int(y // chunk_px_h)))
+        c1 = min(cols - 1, max(c0, int(-(-(x + w) // chunk_px_w)) - 1))
+        r1 = min(rows - 1, max(r0, int(-(-(y + h) // chunk_px_h)) - 1))
+        for cy in range(r0, r1 + 1):
+            for cx in range(c0, c1 + 1):
+                refs_by_chunk[cy * cols + cx].append(i)
+
+    tx, ty, tw, th = trophy if trophy is not None else (0, 0, 0, 0)
+    header = HEADER.pack(
+        MAGIC, VERSION, tile_w, tile_h, width_tiles, height_tiles, chunk_size, int(width), int(height),
+        hero_spawn[0], hero_spawn[1], trophy is not None, tx, ty, tw, th, len(enemy_spawns),
+        len(rects), sum(map(len, refs_by_chunk)),
+    )
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        f.write(header)
+        start = 0
+        ref_start = 0
+        for spawns, refs in zip(by_chunk, refs_by_chunk):
+            f.write(CHUNK_ENTRY.pack(start, len(spawns), ref_start, len(refs)))
+            start += len(spawns)
+            ref_start += len(refs)
+        block = bytearray(chunk_size * chunk_size)
+        for cy in range(rows):
+            for cx in range(cols):
+                block[:] = bytes(len(block))
+                for row in range(chunk_size):
+                    ty_ = cy * chunk_size + row
+                    if ty_ >= height_tiles:
+                        break
+                    x0 = cx * chunk_size
+                    x1 = min(width_tiles, x0 + chunk_size)
+                    src = ty_ * width_tiles
+                    block[row * chunk_size:row * chunk_size + (x1 - x0)] = tiles[src + x0:src + x1]
+                f.write(block)
+        for rect in rects:
+            f.write(RECT.pack(*rect))
+        for refs in refs_by_chunk:
+            for i in refs:
+                f.write(RECT_REF.pack(i))
+        for spawns in by_chunk:
+            for kind, x, y in spawns:
+                f.write(SPAWN.pack(kind, x, y))
+
+
+class LevelFile:
+    """Acesso somente-leitura a um .klvl via mmap (só as páginas lidas vão para a RAM)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.tile_w, self.tile_h, self.width_tiles, self.height_tiles,
+         self.chunk_size, self.width, self.height, hx, hy, has_trophy, tx, ty, tw, th,
+         self.spawn_count, self.rect_count, self.rect_ref_count) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: não é um nível .klvl v{VERSION}")
+        self.hero_spawn = (hx, hy)
+        self.trophy = (tx, ty, tw, th) if has_trophy else None
+        self.chunk_cols = -(-self.width_tiles // self.chunk_size)
+        self.chunk_rows = -(-self.height_tiles // self.chunk_size)
+        self._index_offset = HEADER.size
+        self._tiles_offset = self._index_offset + CHUNK_ENTRY.size * self.chunk_cols * self.chunk_rows
+        self._chunk_bytes = self.chunk_size * self.chunk_size
+        self._rects_offset = self._tiles_offset + self._chunk_bytes * self.chunk_cols * self.chunk_rows
+        self._refs_offset = self._rects_offset + RECT.size * self.rect_count
+        self._spawns_offset = self._refs_offset + RECT_REF.size * self.rect_ref_count
+
+    def close(self):
+        try:
+            self._mm.close()
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def chunk_of(self, x, y):
+        """Chunk (cx, cy) que contém o ponto (x, y) em pixels (limitado ao nível)."""
+        cx = int(x // (self.chunk_size * self.tile_w))
+        cy = int(y // (self.chunk_size * self.tile_h))
+        return min(self.chunk_cols - 1, max(0, cx)), min(self.chunk_rows - 1, max(0, cy))
+
+    def chunk_tiles(self, cx, cy):
+        """Bytes de tiles do chunk (memoryview sobre o mmap, sem cópia)."""
+        start = self._tiles_offset + (cy * self.chunk_cols + cx) * self._chunk_bytes
+        return memoryview(self._mm)[start:start + self._chunk_bytes]
+
+    def chunk_rects(self, cx, cy):
+        """Plataformas do chunk: tiles sólidos vizinhos na mesma linha viram um retângulo."""
+        tiles = self.chunk_tiles(cx, cy)
+        size = self.chunk_size
+        tw, th = self.tile_w, self.tile_h
+        base_col = cx * size
+        base_row = cy * size
+        rects = []
+        for row in range(size):
+            line = tiles[row * size:(row + 1) * size]
+            col = 0
+            while col < size:
+                if line[col] == TILE_EMPTY:
+                    col += 1
+                    continue
+                start = col
+                while col < size and line[col] != TILE_EMPTY:
+                    col += 1
+                rects.append(((base_col + start) * tw, (base_row + row) * th, (col - start) * tw, th))
+        return rects
+
+    def _chunk_entry(self, cx, cy):
+        return CHUNK_ENTRY.unpack_from(self._mm, self._index_offset + (cy * self.chunk_cols + cx) * CHUNK_ENTRY.size)
+
+    def rect(self, index):
+        """Plataforma exata `index` da tabela de retângulos: (x, y, w, h)."""
+        return RECT.unpack_from(self._mm, self._rects_offset + index * RECT.size)
+
+    def chunk_rect_ids(self, cx, cy):
+        """Índices (na tabela de retângulos) das plataformas exatas que tocam o chunk."""
+        _, _, start, count = self._chunk_entry(cx, cy)
+        offset = self._refs_offset + start * RECT_REF.size
+        return [RECT_REF.unpack_from(self._mm, offset + i * RECT_REF.size)[0] for i in range(count)]
+
+    def chunk_spawns(self, cx, cy):
+        """Spawns (tipo, x, y) do chunk."""
+        start, count, _, _ = self._chunk_entry(cx, cy)
+        offset = self._spawns_offset + start * SPAWN.size
+        return [SPAWN.unpack_from(self._mm, offset + i * SPAWN.size) for i in range(count)]
+
+
+class StreamingLevel(Level):
+    """
+    `Level` cujas plataformas e inimigos vêm só dos chunks perto do herói.
+
+    A `Simulation` chama `stream(x, y)` a cada tick; quando o conjunto de chunks
+    ativos muda, `platforms`/`grid` são reconstruídos (só com os chunks ativos) e
+    os chunks carregados/descarregados são devolvidos para a simulação criar
+    ou remover os inimigos correspondentes.
+    """
+
+    streaming = True
+
+    def __init__(self, level_file, *, radius=1):
+        self.file = level_file if isinstance(level_file, LevelFile) else LevelFile(level_file)
+        self.radius = radius
+        self.active = {}  # (cx, cy) -> (PlatformArray dos tiles do chunk, índices dos retângulos exatos)
+        super().__init__(
+            [],
+            width=self.file.width,
+            height=self.file.height,
+            hero_spawn=self.file.hero_spawn,
+            trophy=self.file.trophy,
+            cell_w=self.file.tile_w,
+            cell_h=self.file.tile_h,
+        )
+        self.rewind()
+
+    def rewind(self):
+        """Volta aos chunks em volta do spawn do herói (início da fase)."""
+        self.active = {}
+        self.stream(*self.hero_spawn)
+        self.enemy_spawns = [
+            (x, y) for key in self.active for kind, x, y in self.file.chunk_spawns(*key) if kind == SPAWN_ENEMY
+        ]
+
+    def chunk_of(self, x, y):
+        return self.file.chunk_of(x, y)
+
+    def wanted_chunks(self, x, y):
+        hx, hy = self.file.chunk_of(x, y)
+        r = self.radius
+        return {
+            (cx, cy)
+            for cy in range(max(0, hy - r), min(self.file.chunk_rows, hy + r + 1))
+            for cx in range(max(0, hx - r), min(self.file.chunk_cols, hx + r + 1))
+        }
+
+    def stream(self, x, y):
+        """
+        Ajusta os chunks ativos à posição (x, y). Retorna (carregados, descarregados);
+        os dois vazios se nada mudou (caso comum: custo de um cálculo de chunk).
+        """
+        wanted = self.wanted_chunks(x, y)
+        loaded = [key for key in sorted(wanted) if key not in self.active]
+        unloaded = [key for key in self.active if key not in wanted]
+        if not loaded and not unloaded:
+            return [], []
+        for key in unloaded:
+            del self.active[key]
+        for key in loaded:
+            self.active[key] = (PlatformArray(self.file.chunk_rects(*key)), self.file.chunk_rect_ids(*key))
+        platforms = PlatformArray()
+        rect_ids = set()
+        for key in sorted(self.active):
+            tiles, ids = self.active[key]
+            platforms.extend(tiles)
+            rect_ids.update(ids)
+        # retângulos que tocam vários chunks entram uma vez só, na ordem do arquivo
+        platforms.extend(PlatformArray(self.file.rect(i) for i in sorted(rect_ids)))
+        self.platforms = platforms
+        self.grid = TileGrid(platforms, self.file.tile_w, self.file.tile_h)
+        return loaded, unloaded
+
+    def enemy_spawns_in(self, key):
+        return [(x, y) for kind, x, y in self.file.chunk_spawns(*key) if kind == SPAWN_ENEMY]
+
+
+def read_level(path):
+    """Lê o nível inteiro (todos os chunks, na ordem do StreamingLevel) como um `Level` comum."""
+    with LevelFile(path) as f:
+        keys = sorted((cx, cy) for cy in range(f.chunk_rows) for cx in range(f.chunk_cols))
+        platforms = PlatformArray(rect for key in keys for rect in f.chunk_rects(*key))
+        platforms.extend(PlatformArray(f.rect(i) for i in range(f.rect_count)))
+        return Level(
+            platforms,
+            width=f.width,
+            height=f.height,
+            hero_spawn=f.hero_spawn,
+            enemy_spawns=[(x, y) for key in keys for kind, x, y in f.chunk_spawns(*key) if kind == SPAWN_ENEMY],
+            trophy=f.trophy,
+            cell_w=f.tile_w,
+            cell_h=f.tile_h,
+        )
+
+
+def level_signature(level):
+    """Tudo o que a simulação lê de um `Level`; dois níveis iguais têm a mesma assinatura."""
+    return (
+        list(level.platforms.rects()),
+        (level.width, level.height),
+        tuple(level.hero_spawn),
+        [tuple(spawn) for spawn in level.enemy_spawns],
+        None if level.trophy is None else tuple(level.trophy),
+        (level.grid.cell_w, level.grid.cell_h),
+    )
+
+
+def export_default_level(path):
+    """
+    Grava o nível padrão: a geometria vai sem arredondar na tabela de
+    retângulos, e o arquivo é lido de volta e comparado com o `Level` original.
+    """
+    level = build_default_level()
+    wt = -(-int(level.width) // BRICK_W)
+    ht = -(-int(level.height) // BRICK_H)
+    write_level(path, bytes(wt * ht), wt, ht, rects=level.platforms.rects(), width=level.width,
+                height=level.height, hero_spawn=level.hero_spawn, trophy=level.trophy,
+                enemy_spawns=level.enemy_spawns)
+    if level_signature(read_level(path)) != level_signature(level):
+        raise ValueError(f"{path}: o nível exportado difere do nível padrão")
+    return path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "export":
+        print(f"Nível padrão exportado para {export_default_level(sys.argv[2])}")
+    else:
+        print("uso: py levelfile.py export <arquivo.klvl>")
@@ -1,7 +1,10 @@
 from pathlib import Path
 import os
 import shutil
-import wave
+import time
+
+# Início do processo (relatório de tempo de inicialização, ver startup.py).
+_STARTUP_T0 = time.perf_counter()
 
 # IMPORTANTE:
 # `import pgzrun` chama `prepare_mod(__main__)`, que injeta `pgzero.builtins`
@@ -18,8 +21,46 @@ os.environ.setdefault("SDL_VIDEO_WINDOW_POS", "centered")
 import pgzrun
 from pgzero.rect import Rect
 import random
-import math
-import pygame
+
+from animation import Animator, build_frame_table, mirrored_surfaces
+from atlas import AtlasLoader
+from audio import UNINITIALIZED, AudioManager, SoundCache
+from camera import Camera
+from platforms import PlatformArray, PlatformView
+from dirtyrect import DirtyRenderer
+from preloader import AssetPreloader, install_surfaces
+from profiler import FrameProfiler
+from replay import Recorder, new_seed
+from render import (
+    background_positions,
+    blit_frame,
+    blit_frames,
+    blit_platforms,
+    static_layer_fits,
+    world_size,
+)
+from textcache import TextCache
+from simulation import (
+    DT,
+    MIRROR_SUFFIX,
+    NO_INPUT,
+    SPRITE_SIZES,
+    InputState,
+    Simulation,
+    build_default_level,
+)
+from startup import CURRENT, StartupTimer, manifest_status, write_manifest
+
+# --- Início rápido ---
+# Com o manifesto de assets em dia (gravado pelo sync_assets.py ou pelo último
+# início completo), a preparação dos assets pula as varreduras de arquivos.
+# GAME_FAST_START=0 sempre faz a preparação completa. GAME_STARTUP_REPORT=1
+# mostra e grava o tempo de cada fase do início (=exit: sai em seguida, para
+# benchmarks); GAME_STARTUP_REPORT_PATH muda o arquivo do relatório.
+FAST_START = os.environ.get("GAME_FAST_START", "1") != "0"
+STARTUP_REPORT = os.environ.get("GAME_STARTUP_REPORT", "0")
+STARTUP_REPORT_PATH = Path(os.environ.get("GAME_STARTUP_REPORT_PATH", "") or _ROOT / "startup_report.json")
+startup_timer = StartupTimer(_STARTUP_T0)
 
 _assets_prepared = False
 
@@ -46,25 +87,34 @@ def _ensure_images_point_to_game_sprites():
     except Exception:
         pass
 
-    # 2) fallback: copia os PNGs para game/images
+    # 2) fallback: sincroniza os PNGs para game/images (incremental, via manifesto:
+    # arquivos inalterados não são copiados de novo a cada início do jogo)
     try:
-        images_dir.mkdir(parents=True, exist_ok=True)
+        from sync_assets import sync_folder
+
+        sync_folder(sprites_dir, images_dir, verbose=False)
     except Exception:
-        return
+        pass
 
-    for p in sprites_dir.glob("*.png"):
-        if not p.is_file():
-            continue
+def _set_pgzero_root():
+    """Aponta os loaders do pgzero para `game/`. Retorna True se o root ficou lá."""
+    try:
+        import pgzero.loaders as _runtime_loaders
+        # set_root aceita arquivo ou pasta.
+        # Para usar assets em D:\...\game\*, setamos root para a pasta `game`.
+        _runtime_loaders.set_root(str((_ROOT / "game").resolve()))
+        # força revalidação do root
         try:
-            if p.stat().st_size == 0:
-                continue
+            _runtime_loaders.images.have_root = False
         except Exception:
-            continue
-
+            pass
         try:
-            shutil.copy2(p, images_dir / p.name)
+            _runtime_loaders.sounds.have_root = False
         except Exception:
             pass
+        return Path(_runtime_loaders.root).resolve() == (_ROOT / "game").resolve()
+    except Exception:
+        return False
 
 def _prepare_assets_once():
     """Tenta evitar crash por assets vazios/corrompidos (ex.: PNG/MP3 de 0 bytes)."""
@@ -72,26 +122,23 @@ def _prepare_assets_once():
     if _assets_prepared:
         return
     _assets_prepared = True
+    started = time.perf_counter()
+    game_dir = _ROOT / "game"
+
+    # Início rápido: nenhuma pasta de assets mudou desde a última preparação
+    # completa, então link/cópias/validação já estão feitos.
+    status = manifest_status(game_dir) if FAST_START else "disabled"
+    startup_timer.manifest = status
+    if status == CURRENT and _set_pgzero_root():
+        startup_timer.kind = "warm"
+        startup_timer.record("assets.prepare", time.perf_counter() - started)
+        return
+    startup_timer.kind = "cold"
 
     # Garante o caminho de imagens em `game/sprites` (via game/images link/cópia).
     _ensure_images_point_to_game_sprites()
 
-    try:
-        import pgzero.loaders as _runtime_loaders
-        # set_root aceita arquivo ou pasta.
-        # Para usar assets em D:\...\game\*, setamos root para a pasta `game`.
-        _runtime_loaders.set_root(str((_ROOT / "game").resolve()))
-        # força revalidação do root
-        try:
-            _runtime_loaders.images.have_root = False
-        except Exception:
-            pass
-        try:
-            _runtime_loaders.sounds.have_root = False
-        except Exception:
-            pass
-    except Exception:
-        pass
+    _set_pgzero_root()
 
     # Fallback: se por algum motivo o PGZero estiver usando outro root (ex.: a pasta
     # de onde o usuário executou), garante que exista um `images/` lá também.
@@ -112,22 +159,20 @@ def _prepare_assets_once():
     except Exception:
         pass
 
-    # Se as imagens estiverem vazias, tenta recriar placeholders e sincronizar.
-    images_dir = _ROOT / "game" / "sprites"
+    # Se as imagens estiverem vazias/corrompidas, recria placeholders. A validação
+    # fica em cache por (caminho, tamanho, mtime): sprites já checados só custam um stat.
     try:
-        bad_images = [p for p in images_dir.glob("*.png") if p.is_file() and p.stat().st_size == 0]
-    except Exception:
-        bad_images = []
+        # Import seguro (sync_assets não executa mais no import)
+        from sync_assets import ensure_sprites_valid
 
-    if bad_images:
-        try:
-            # Import seguro (sync_assets não executa mais no import)
-            from sync_assets import ensure_sprites_valid
+        ensure_sprites_valid(processes=False, verbose=False)
+    except Exception:
+        # Se não der (ambiente sem pillow, permissões etc.), deixa seguir.
+        pass
 
-            ensure_sprites_valid()
-        except Exception:
-            # Se não der (ambiente sem pillow, permissões etc.), deixa seguir.
-            pass
+    # Próximo início pode pular tudo isso (se nada mudar nas pastas).
+    write_manifest(game_dir)
+    startup_timer.record("assets.prepare", time.perf_counter() - started)
 
 # pgzero globals (injected at runtime by pgzrun)
 # These will be available after pgzrun.go() is called
@@ -138,41 +183,98 @@ HEIGHT = 600
 BG_IMAGE = "treasure_cave"
 
 # --- Level / Platforms ---
-platforms = []
 BRICK_W = 64
 BRICK_H = 64
 
-class Platform:
-    def __init__(self, x, y, w, h):
-        # Rect usa (left, top), (width, height)
-        self.rect = Rect((x, y), (w, h))
+class Platform(PlatformView):
+    """
+    View de uma plataforma do `PlatformArray` (a geometria fica no array
+    compartilhado, não num Rect por plataforma).
+    """
+    __slots__ = ()
 
-    def draw(self):
-        screen_obj = globals().get('screen')
-        if not screen_obj:
-            return
+    @property
+    def rect(self):
+        # Rect usa (left, top), (width, height)
+        left, top, w, h = self.bounds
+        return Rect((left, top), (w, h))
+
+platforms = PlatformArray(view=Platform)
+
+# --- Camada estática (fundo + plataformas pré-renderizados) ---
+# GAME_STATIC_LAYER=0 volta ao caminho antigo (blit por tile a cada frame),
+# útil para comparar o custo dos dois modos.
+USE_STATIC_LAYER = os.environ.get("GAME_STATIC_LAYER", "1") != "0"
+# A camada cobre o nível inteiro; níveis maiores que render.STATIC_LAYER_MAX_SCREENS
+# telas são desenhados tile a tile, só com o que está na tela.
+_static_layer = None
+_static_layer_key = None  # (id da lista de plataformas, quantidade, tamanho)
+
+def invalidate_static_layer():
+    """Força reconstruir a camada estática no próximo frame (ex.: plataformas mudaram)."""
+    global _static_layer, _static_layer_key
+    _static_layer = None
+    _static_layer_key = None
+
+def _get_static_layer():
+    """Retorna a superfície com fundo + plataformas, reconstruindo só quando necessário."""
+    global _static_layer, _static_layer_key
+    size = _world_size()
+    key = (id(platforms), len(platforms), size)
+    if _static_layer is not None and _static_layer_key == key:
+        return _static_layer
+    if not static_layer_fits(size, WIDTH, HEIGHT):
+        return None
+
+    images_obj = globals().get('images')
+    if images_obj is None:
+        return None
 
-        # Desenha tiles de brick ao longo do retângulo
-        x0 = int(self.rect.left)
-        y0 = int(self.rect.top)
-        x1 = int(self.rect.right)
+    try:
+        background = images_obj.load(BG_IMAGE)
+    except Exception:
+        background = None
+    try:
+        brick = images_obj.load("brick")
+    except Exception:
+        brick = None
 
-        # evita loop infinito se tamanho estiver zerado
-        if BRICK_W <= 0 or BRICK_H <= 0:
-            return
+    rects = platforms.rects()
+    try:
+        from render import build_static_layer
 
-        x = x0
-        while x < x1:
-            screen_obj.blit("brick", (x, y0))
-            x += BRICK_W
+        _static_layer = build_static_layer(size, background, brick, rects, BRICK_W)
+    except Exception:
+        _static_layer = None
+        return None
+    _static_layer_key = key
+    return _static_layer
+
+def _world_size():
+    """Tamanho do nível atual em pixels (a tela, se ainda não houver nível)."""
+    if world is None:
+        return (WIDTH, HEIGHT)
+    return world_size(world.level, WIDTH, HEIGHT)
+
+# --- Câmera ---
+# Segue o herói; em níveis do tamanho da tela fica parada em (0, 0).
+camera = Camera(WIDTH, HEIGHT)
+
+def _update_camera():
+    if world is not None:
+        camera.set_world(*_world_size())
+        # segue a posição interpolada (a mesma em que o herói é desenhado)
+        x, y = hero.pos if hero is not None else (world.hero.x, world.hero.y)
+        camera.follow(x, y)
 
 # --- Game States ---
+LOADING = "loading"
 MENU = "menu"
 PLAYING = "playing"
 GAME_OVER = "game_over"
 WIN = "win"
 
-game_state = MENU
+game_state = LOADING
 game_over_frames = 0
 GAME_OVER_DELAY_FRAMES = 90  # ~1.5s em ~60 FPS
 GAME_OVER_MESSAGE = "Game Over! Reiniciando..."
@@ -180,227 +282,124 @@ win_frames = 0
 WIN_DELAY_FRAMES = 90  # ~1.5s em ~60 FPS
 WIN_MESSAGE = "Você venceu! Reiniciando..."
 
-# --- Audio Variables ---
-jump_sound = None
-hit_sound = None
-audio_initialized = False
-music_enabled = True
-sfx_enabled = True
-_music_backend = None  # "pgzero" | "pygame" | None
-_music_loaded = None   # "bgm" ou caminho do arquivo
-music_generation = 1            # incrementa quando ligar música (toca 1x por geração)
-_music_generation_started = 0   # última geração já iniciada
-audio_status = "Áudio: (inicializando)"
-audio_last_error = None
-MUSIC_TRACK = "game_music"  # nome do arquivo (sem extensão) em music/
-
-def _find_bgm_path():
-    """Retorna (backend, ref) onde backend é 'pgzero' ou 'pygame', e ref é nome/arquivo."""
-    # Pedido: usar sempre a pasta game/music
-    music_dir = _ROOT / "game" / "music"
-
-    # Preferir formatos comuns (mp3/ogg/oga) e tocar via pygame com caminho completo.
-    for ext in ("ogg", "oga", "mp3", "wav"):
-        p = music_dir / f"{MUSIC_TRACK}.{ext}"
-        try:
-            if p.is_file() and p.stat().st_size > 0:
-                return "pygame", str(p)
-        except Exception:
-            pass
-
-    return None, None
+# --- Audio ---
+MUSIC_TRACK = "game_music"  # nome do arquivo (sem extensão) em game/music/
 
-def _ensure_bgm_wav():
-    """Cria um WAV simples (tom) caso não exista música válida."""
-    music_dir = _ROOT / "game" / "music"
-    p = music_dir / f"{MUSIC_TRACK}.wav"
+def _music_end_event():
+    """Tipo de evento de fim de música que o pgzero repassa para `on_music_end`."""
     try:
-        # Regera sempre (para evitar ficar com arquivo silencioso/corrompido)
-        if p.exists():
-            p.unlink()
+        from pgzero.constants import MUSIC_END
+        return MUSIC_END
     except Exception:
         pass
-
     try:
-        music_dir.mkdir(parents=True, exist_ok=True)
-        sample_rate = 22050
-        duration_s = 20.0  # longo o suficiente para perceber, sem loop
-        # Frequências mais graves (menos "estridentes")
-        freqs = (110.0, 165.0)
-        amp = 6000  # mais audível, ainda longe de clipping
-        nframes = int(duration_s * sample_rate)
-
-        frames = bytearray()
-        for n in range(nframes):
-            t = n / sample_rate
-            # fade in/out mais longo para evitar estalos
-            fade = 1.0
-            fade_in = sample_rate * 0.15
-            fade_out = sample_rate * 0.25
-            if n < fade_in:
-                fade = n / fade_in
-            if n > nframes - fade_out:
-                fade = min(fade, max(0.0, (nframes - n) / fade_out))
-
-            # mistura suave de senoides
-            s = 0.0
-            for f in freqs:
-                s += math.sin(2 * math.pi * f * t)
-            s /= max(1, len(freqs))
-            val = int(amp * fade * s)
-            frames += int(val).to_bytes(2, "little", signed=True)
-
-        with wave.open(str(p), "wb") as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)  # 16-bit
-            wf.setframerate(sample_rate)
-            wf.writeframes(frames)
+        from pgzero.music import MUSIC_END
+        return MUSIC_END
     except Exception:
-        # Se não der pra criar, simplesmente não terá música.
+        return None
+
+# Todo I/O de áudio (mixer, SFX, música) roda na thread do AudioManager;
+# o loop de frames só lê `audio.state`/`audio.status`.
+# SFX decodificados uma vez para PCM no formato do mixer (game/.sound_cache),
+# compartilhados entre o preloader e o AudioManager.
+sound_cache = SoundCache(_ROOT / "game" / ".sound_cache")
+audio = AudioManager(
+    _ROOT / "game" / "sounds",
+    _ROOT / "game" / "music",
+    MUSIC_TRACK,
+    end_event=_music_end_event(),
+    sound_cache=sound_cache,
+)
+
+# --- Preload (estado LOADING) ---
+preloader = AssetPreloader(
+    _ROOT / "game" / "sprites",
+    _ROOT / "game" / "sounds",
+    _ROOT / "game" / "music",
+    sound_cache=sound_cache,
+)
+
+_atlas = None  # AtlasLoader, se game/atlas estiver atualizado
+_preload_started = 0.0
+
+def _update_loading():
+    """Acompanha o preloader; ao terminar, entrega os assets e vai para o MENU."""
+    global game_state
+    global _atlas, _preload_started, animator
+    if not preloader.started:
+        _prepare_assets_once()
+        # Atlas atualizado (gerado pelo `py atlas.py`): os sprites dele não
+        # precisam ser decodificados um a um.
+        atlas = AtlasLoader(_ROOT / "game" / "atlas", _ROOT / "game" / "sprites")
+        if atlas.is_fresh():
+            _atlas = atlas
+            preloader.skip_images = atlas.names
+        _preload_started = time.perf_counter()
+        preloader.start()
         return
-
-# --- Initialize Audio ---
-def init_audio():
-    global jump_sound, hit_sound, audio_initialized, _music_backend, _music_loaded
-    global music_generation, _music_generation_started
-    global audio_status, audio_last_error
-
-    _prepare_assets_once()
-    
-    # Acessa music e sounds do namespace global (injetados pelo pgzrun)
-    music_obj = globals().get('music')
-    sounds_obj = globals().get('sounds')
-    
-    if music_obj is None or sounds_obj is None:
+    if not preloader.done:
         return
-    
-    try:
-        audio_last_error = None
-        # garante mixer inicializado
-        try:
-            if pygame.mixer.get_init() is None:
-                pygame.mixer.init()
-        except Exception as e:
-            audio_last_error = f"mixer.init falhou: {e}"
-
-        # SFX
-        if sfx_enabled:
-            # Preferir MP3 do game/sounds (pedido do usuário); fallback para loader do pgzero.
-            jump_sound = None
-            try:
-                jump_mp3 = (_ROOT / "game" / "sounds" / "jump.mp3")
-                if jump_mp3.is_file() and jump_mp3.stat().st_size > 0:
-                    jump_sound = pygame.mixer.Sound(str(jump_mp3))
-            except Exception as e:
-                audio_last_error = f"jump.mp3 falhou: {e}"
-                jump_sound = None
-
-            if jump_sound is None:
-                try:
-                    jump_sound = sounds_obj.jump
-                except Exception:
-                    jump_sound = None
+    startup_timer.record("assets.preload", time.perf_counter() - _preload_started)
 
-            # hit: preferir MP3 do game/sounds; fallback para loader do pgzero.
-            hit_sound = None
+    images_obj = globals().get('images')
+    if images_obj is not None:
+        if _atlas is not None:
             try:
-                hit_mp3 = (_ROOT / "game" / "sounds" / "hit.mp3")
-                if hit_mp3.is_file() and hit_mp3.stat().st_size > 0:
-                    hit_sound = pygame.mixer.Sound(str(hit_mp3))
+                _atlas.load()
+                _atlas.install(images_obj)
             except Exception as e:
-                audio_last_error = f"hit.mp3 falhou: {e}"
-                hit_sound = None
-
-            if hit_sound is None:
-                try:
-                    hit_sound = sounds_obj.hit
-                except Exception:
-                    hit_sound = None
-        else:
-            jump_sound = None
-            hit_sound = None
+                print(f"[atlas] falhou, usando PNGs avulsos: {e}")
+                _atlas = None
+        preloader.install_images(images_obj)
+    audio.adopt(sounds=preloader.sounds, music=preloader.music)
+    for path, err in preloader.errors.items():
+        print(f"[preload] falhou: {path}: {err}")
+    game_state = MENU
+    # Com os sprites já no cache do pgzero (atlas/preload), as tabelas de
+    # frames, os Actors e as medidas do init_game não decodificam nada.
+    animator = _build_animator()
+    if animator is None and images_obj is not None:
+        _install_mirrored_frames(images_obj)
+    init_game()
+
+# --- Profiler ---
+# F3 liga/desliga o profiler por fase (com overlay); F4 exporta o trace
+# (chrome://tracing) e um resumo em JSON. GAME_PROFILE=1 já começa ligado.
+PROFILE_TRACE_PATH = _ROOT / "profile_trace.json"
+PROFILE_SUMMARY_PATH = _ROOT / "profile_summary.json"
+profiler = FrameProfiler(enabled=os.environ.get("GAME_PROFILE", "0") == "1")
+
+def toggle_profiler():
+    profiler.toggle()
+    if world is not None:
+        world.profiler = profiler if profiler.enabled else None
+
+def export_profile():
+    if not profiler.frames:
+        return
+    profiler.export_chrome_trace(PROFILE_TRACE_PATH)
+    profiler.export_json(PROFILE_SUMMARY_PATH)
+    print(f"[profiler] trace salvo em {PROFILE_TRACE_PATH}")
 
-        # Música: aplica SEMPRE conforme o toggle do menu
-        if not music_enabled:
-            try:
-                music_obj.stop()
-            except Exception:
-                pass
-            try:
-                pygame.mixer.music.stop()
-            except Exception:
-                pass
-            _music_backend = None
-            _music_loaded = None
-            # não toca de novo até o usuário ligar novamente
-            audio_status = "Música: desligada"
-        else:
-            # Toca apenas 1 vez por "geração" (cada vez que o usuário liga a música).
-            if _music_generation_started == music_generation:
-                try:
-                    busy = bool(pygame.mixer.music.get_busy())
-                except Exception:
-                    busy = False
-                # Se por algum motivo não estiver tocando, não "trava" a geração:
-                # deixa seguir para tentar iniciar novamente (corrige caso o play falhe
-                # silenciosamente ou o mixer não esteja pronto ainda).
-                if busy:
-                    audio_status = f"Música: ligada (tocando={busy})"
-                    audio_initialized = True
-                    return
-
-            backend, ref = _find_bgm_path()
-            if backend is None:
-                # Sem mp3/ogg válido → cria um WAV simples e toca via pygame
-                _ensure_bgm_wav()
-                backend, ref = _find_bgm_path()
-
-            if backend == "pgzero":
-                # sem loop
-                try:
-                    music_obj.play_once(MUSIC_TRACK)
-                except Exception:
-                    # fallback
-                    music_obj.play(MUSIC_TRACK)
-                music_obj.set_volume(0.6)
-                _music_backend = "pgzero"
-                _music_loaded = MUSIC_TRACK
-                _music_generation_started = music_generation
-                audio_status = "Música: ligada (pgzero)"
-            elif backend == "pygame" and ref:
-                try:
-                    pygame.mixer.music.load(ref)
-                    pygame.mixer.music.set_volume(1.0)
-                    # sem loop
-                    pygame.mixer.music.play(0)
-                    _music_backend = "pygame"
-                    _music_loaded = ref
-                    try:
-                        busy = bool(pygame.mixer.music.get_busy())
-                    except Exception:
-                        busy = False
-
-                    if busy:
-                        _music_generation_started = music_generation
-                        audio_status = f"Música: ligada (pygame, tocando={busy})"
-                    else:
-                        # Não marca como "iniciada" para tentar novamente nos próximos frames.
-                        audio_status = "Música: erro (pygame não iniciou reprodução)"
-                except Exception as e:
-                    audio_last_error = f"pygame music falhou: {e}"
-                    audio_status = "Música: erro (pygame)"
-            else:
-                audio_status = "Música: ligada (sem arquivo válido)"
-
-        audio_initialized = True
-    except Exception as e:
-        audio_last_error = str(e)
-        audio_status = "Música: erro"
-        print("[audio] erro:", e)
+# --- Initialize Audio ---
+def init_audio():
+    """Dispara a inicialização do áudio em segundo plano (só na primeira chamada)."""
+    if audio.state != UNINITIALIZED:
         return
+    _prepare_assets_once()
+    # fallback para os sons do pgzero (injetados pelo pgzrun)
+    audio.fallback_sounds = globals().get('sounds')
+    audio.start()
+
+# --- Texto ---
+# Títulos, labels dos botões e overlays são rasterizados uma vez e reutilizados
+# (LRU limitado em memória); só textos novos passam pelo ptext.
+text_cache = TextCache()
 
 # --- Button Class ---
 class Button:
+    __slots__ = ("text", "rect", "action")
+
     def __init__(self, text, x, y, w, h, action):
         self.text = text
         self.rect = Rect((x, y), (w, h))
@@ -411,227 +410,269 @@ class Button:
         if screen_obj:
             screen_obj.draw.filled_rect(self.rect, "gray")
             label = self.text() if callable(self.text) else self.text
-            screen_obj.draw.text(label, center=self.rect.center, fontsize=30, color="white")
+            text_cache.draw(screen_obj, label, center=self.rect.center, fontsize=30, color="white")
 
     def click(self, pos):
         if self.rect.collidepoint(pos):
             self.action()
 
+# --- Animação ---
+# Com as tabelas de frames (animation.py), herói e inimigos são desenhados
+# direto das superfícies pré-carregadas, no relógio de animação da simulação;
+# sem elas (ex.: falha ao carregar), cada view usa um Actor com imagem por nome.
+# As tabelas são montadas no fim do LOADING, depois que o atlas e o preloader
+# instalaram as superfícies no cache do pgzero.
+animator = None
+
+def _build_animator():
+    """Tabelas de frames a partir do cache de imagens do pgzero (None se indisponível)."""
+    images_obj = globals().get('images')
+    if images_obj is None:
+        return None
+    cache = images_obj.cache
+    cache_key = images_obj.cache_key
+
+    def resolve(name):
+        # subsurface do atlas ou superfície do preloader; sem elas, carrega agora
+        surface = cache.get(cache_key(name, (), {}))
+        return surface if surface is not None else images_obj.load(name)
+
+    try:
+        return Animator(build_frame_table(resolve))
+    except Exception as e:
+        print(f"[animação] tabelas de frames indisponíveis, usando imagens por nome: {e}")
+        return None
+
+# Frames espelhados (ex.: hero_run1_left) instalados no cache do pgzero para
+# os Actors do modo sem tabelas; se a instalação falhar, usam o frame original.
+_mirrored_frames = set()
+
+def _install_mirrored_frames(images_obj):
+    try:
+        surfaces = mirrored_surfaces(images_obj.load)
+        install_surfaces(images_obj, surfaces, "espelhos")
+        _mirrored_frames.update(surfaces)
+    except Exception as e:
+        print(f"[animação] frames espelhados indisponíveis: {e}")
+
+def _actor_image(name):
+    """Nome da imagem da simulação que um Actor consegue carregar."""
+    if name.endswith(MIRROR_SUFFIX) and name not in _mirrored_frames:
+        return name[:-len(MIRROR_SUFFIX)]
+    return name
+
+def _make_actor(state):
+    """Actor do pgzero para uma view (só sem as tabelas de frames)."""
+    # Obtém Actor do namespace global (injetado pelo pgzrun)
+    Actor_class = globals().get('Actor')
+    if Actor_class is None:
+        # Tenta acessar do módulo principal
+        import __main__
+        Actor_class = getattr(__main__, 'Actor', None)
+    if Actor_class is None:
+        raise RuntimeError("Actor não está disponível. Certifique-se de que pgzrun.go() foi chamado.")
+    return Actor_class(_actor_image(state.image), (state.x, state.y))
+
+# --- Views de entidades ---
+class _EntityView:
+    """
+    Base das views do herói e dos inimigos: posição interpolada entre ticks e
+    o frame a desenhar, a partir do estado do núcleo headless. Sem tabelas de
+    frames, usa um Actor com a imagem da simulação.
+    """
+    __slots__ = ("state", "actor", "prev_x", "prev_y", "pos", "frame")
+
+    def __init__(self, state):
+        self.state = state
+        # posição no tick anterior (interpolação na renderização)
+        self.prev_x = state.x
+        self.prev_y = state.y
+        self.pos = (state.x, state.y)
+        self.frame = None  # (superfície, meia largura, meia altura)
+        self.actor = _make_actor(state) if animator is None else None
+        self.sync()
+
+    @property
+    def x(self):
+        return self.state.x
+
+    @property
+    def y(self):
+        return self.state.y
+
+    def remember(self):
+        """Guarda a posição atual antes de um tick da simulação."""
+        self.prev_x = self.state.x
+        self.prev_y = self.state.y
+
+    def sync(self, alpha=1.0):
+        """
+        Posição de desenho entre o tick anterior (`alpha`=0) e o atual (1) e
+        frame atual; no modo sem tabelas, copia a imagem da simulação para o Actor.
+        """
+        state = self.state
+        self.pos = (self.prev_x + (state.x - self.prev_x) * alpha,
+                    self.prev_y + (state.y - self.prev_y) * alpha)
+        if self.actor is not None:
+            self.actor.pos = self.pos
+            image = _actor_image(state.image)
+            if self.actor.image != image:
+                self.actor.image = image
+        else:
+            self.frame = self._pick_frame()
+
+    def _pick_frame(self):
+        # o frame escolhido pela simulação (a hitbox dos inimigos é a dele)
+        return animator.by_name[self.state.image]
+
 # --- Hero Class ---
-class Hero:
-    def __init__(self):
-        self.x = 100
-        self.y = HEIGHT - 150
-        self.vy = 0
-        self.on_ground = False
-        self.move_speed = 5
-        self.jump_velocity = -12
-
-        # Animações
-        # - parado (sem tecla): anima (inclui idle3)
-        # - esquerda: anima com idle1/idle2 (pedido anterior)
-        self.stand_frames = ["hero_idle3", "hero_idle1", "hero_idle2"]
-        self.left_frames = ["hero_idle1", "hero_idle2"]
-        self.run_frames = ["hero_run1", "hero_run2"]
-        # Sprite usado enquanto estiver no ar (pulo/queda)
-        self.jump_image = "hero_jump"
-        self.current_frame = 0
-        self.frame_timer = 0
-
-        # Obtém Actor do namespace global (injetado pelo pgzrun)
-        Actor_class = globals().get('Actor')
-        if Actor_class is None:
-            # Tenta acessar do módulo principal
-            import __main__
-            Actor_class = getattr(__main__, 'Actor', None)
-        if Actor_class is None:
-            raise RuntimeError("Actor não está disponível. Certifique-se de que pgzrun.go() foi chamado.")
-        # Começa parado (primeiro frame do idle)
-        self.actor = Actor_class(self.stand_frames[0], (self.x, self.y))
-
-        # Hitbox fixa: evita que trocar de sprite (com tamanho diferente)
-        # quebre colisões e o "on_ground".
-        self.collider_w = int(getattr(self.actor, "width", 64))
-        self.collider_h = int(getattr(self.actor, "height", 64))
-
-    def _collider_rect(self):
-        """Retorna um Rect de colisão fixo, centrado no Actor."""
-        left = self.actor.x - self.collider_w / 2
-        top = self.actor.y - self.collider_h / 2
-        return Rect((left, top), (self.collider_w, self.collider_h))
-
-    def _set_collider_left(self, left):
-        self.actor.x = left + self.collider_w / 2
-
-    def _set_collider_right(self, right):
-        self.actor.x = right - self.collider_w / 2
-
-    def _set_collider_top(self, top):
-        self.actor.y = top + self.collider_h / 2
-
-    def _set_collider_bottom(self, bottom):
-        self.actor.y = bottom - self.collider_h / 2
-
-    def update_animation(self, frames):
-        self.frame_timer += 1
-        if self.frame_timer > 8:
-            self.frame_timer = 0
-            self.current_frame = (self.current_frame + 1) % max(1, len(frames))
-            self.actor.image = frames[self.current_frame]
-
-    def update(self):
-        global platforms
-        keys = globals().get('keyboard')
-        if keys is None:
-            return
-        moving = False
-        moving_left = False
-        moving_right = False
-
-        # Movimento horizontal (com colisão lateral)
-        dx = 0
-        if keys.left:
-            dx -= self.move_speed
-            moving = True
-            moving_left = True
-        if keys.right:
-            dx += self.move_speed
-            moving = True
-            moving_right = True
-
-        # Pulo com seta para cima (Mario-like)
-        if keys.up and self.on_ground:
-            self.vy = self.jump_velocity
-            self.on_ground = False
-            if jump_sound:
-                jump_sound.play()
-
-        # aplica horizontal
-        if dx != 0:
-            self.actor.x += dx
-            for plat in platforms:
-                if self._collider_rect().colliderect(plat.rect):
-                    if dx > 0:
-                        self._set_collider_right(plat.rect.left)
-                    else:
-                        self._set_collider_left(plat.rect.right)
-
-        # gravity + movimento vertical (com colisão por cima/baixo)
-        self.vy += 0.5
-        self.on_ground = False
-        self.actor.y += self.vy
-
-        for plat in platforms:
-            if self._collider_rect().colliderect(plat.rect):
-                if self.vy > 0:  # caindo: “pousa” em cima
-                    self._set_collider_bottom(plat.rect.top)
-                    self.vy = 0
-                    self.on_ground = True
-                elif self.vy < 0:  # subindo: bate embaixo
-                    self._set_collider_top(plat.rect.bottom)
-                    self.vy = 0
-
-        # limites do mundo
-        r = self._collider_rect()
-        if r.left < 0:
-            self._set_collider_left(0)
-        if r.right > WIDTH:
-            self._set_collider_right(WIDTH)
-        if r.bottom > HEIGHT:
-            self._set_collider_bottom(HEIGHT)
-            self.vy = 0
-            self.on_ground = True
-
-        # Ground-check robusto (quando está "encostando" na plataforma).
-        if not self.on_ground and self.vy >= 0:
-            rr = self._collider_rect()
-            probe = Rect((rr.left, rr.top + 1), (rr.width, rr.height))
-            for plat in platforms:
-                if probe.colliderect(plat.rect):
-                    self._set_collider_bottom(plat.rect.top)
-                    self.vy = 0
-                    self.on_ground = True
-                    break
-
-        self.x, self.y = self.actor.pos
-        # Se estiver no ar, usa sprite de pulo e não deixa idle/run sobrescrever.
-        if not self.on_ground:
-            self.actor.image = self.jump_image
+class Hero(_EntityView):
+    """
+    View do herói. Posição, física e animação vêm do núcleo headless
+    (`simulation.HeroState`); aqui só escolhemos onde e qual frame desenhar.
+    """
+    __slots__ = ("facing",)
+
+    def __init__(self, state):
+        self.facing = 1
+        super().__init__(state)
+
+    def _pick_frame(self):
+        state = self.state
+        dx = state.x - self.prev_x
+        if dx:
+            self.facing = -1 if dx < 0 else 1
+        left = self.facing < 0
+        # para a esquerda, frames espelhados (feitos uma vez na carga)
+        if not state.on_ground:
+            frames = animator.hero_jump_left if left else animator.hero_jump
+        elif dx:
+            frames = animator.hero_run_left if left else animator.hero_run
         else:
-            # Direção:
-            # - esquerda: usa hero_idle1/hero_idle2
-            # - direita: usa hero_run1/hero_run2
-            if moving_left and not moving_right:
-                self.update_animation(self.left_frames)
-            elif moving_right and not moving_left:
-                self.update_animation(self.run_frames)
-            else:
-                # Sem movimento: anima idle também
-                self.update_animation(self.stand_frames)
+            frames = animator.hero_idle
+        # mesmo relógio de animação da simulação
+        return animator.hero_frame(frames, world.tick)
 
 # --- Enemy Class ---
-class Enemy:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-        self.idle_frames = ["enemy_idle1", "enemy_idle2"]
-        self.move_frames = ["enemy_move1", "enemy_move2"]
-        self.current_frame = 0
-        self.frame_timer = 0
-
-        # Obtém Actor do namespace global (injetado pelo pgzrun)
-        Actor_class = globals().get('Actor')
-        if Actor_class is None:
-            # Tenta acessar do módulo principal
-            import __main__
-            Actor_class = getattr(__main__, 'Actor', None)
-        if Actor_class is None:
-            raise RuntimeError("Actor não está disponível. Certifique-se de que pgzrun.go() foi chamado.")
-        self.actor = Actor_class(self.idle_frames[0], (self.x, self.y))
-        self.direction = random.choice([-1, 1])
-        self.speed = 2
-        self.pause_frames = 0
-
-    def update_animation(self, frames):
-        self.frame_timer += 1
-        if self.frame_timer > 12:
-            self.frame_timer = 0
-            self.current_frame = (self.current_frame + 1) % max(1, len(frames))
-            self.actor.image = frames[self.current_frame]
-
-    def update(self):
-        moving = True
-
-        # Às vezes o inimigo "para" e fica em idle (com animação)
-        if self.pause_frames > 0:
-            self.pause_frames -= 1
-            moving = False
-        else:
-            self.x += self.direction * self.speed
+class Enemy(_EntityView):
+    """
+    View de um inimigo, espelhando `simulation.EnemyState`: desenha o frame que
+    a simulação escolheu, sem espelhar (como antes).
+    """
+    __slots__ = ()
 
-            # change direction randomly
-            if random.random() < 0.01:
-                self.direction *= -1
+def _draw_view(screen_obj, view, ox, oy):
+    """Desenha herói/inimigo pelo frame pré-resolvido (ou pelo Actor, sem tabelas)."""
+    frame = view.frame
+    if frame is None:
+        _draw_actor(screen_obj, view.actor, ox, oy)
+        return
+    blit_frame(screen_obj.blit, frame, *view.pos, ox, oy)
 
-            # chance de parar por um tempo
-            if random.random() < 0.005:
-                self.pause_frames = random.randint(30, 90)
+# --- Nível ---
+# GAME_LEVEL=caminho/arquivo.klvl carrega um nível binário com streaming por
+# chunks (ver levelfile.py); sem ele, usa o nível padrão da simulação.
+LEVEL_FILE = os.environ.get("GAME_LEVEL", "")
 
-        self.actor.pos = (self.x, self.y)
+def _load_level(trophy_size):
+    """Retorna (nível, descrição do nível para o replay)."""
+    if LEVEL_FILE:
+        try:
+            from levelfile import StreamingLevel
 
-        # animation (move e idle)
-        frames = self.move_frames if moving else self.idle_frames
-        self.update_animation(frames)
+            path = Path(LEVEL_FILE)
+            if not path.is_absolute():
+                path = _ROOT / path
+            return StreamingLevel(path), {"kind": "file", "path": str(path)}
+        except Exception as e:
+            print(f"Nível {LEVEL_FILE} não carregado ({e}); usando o nível padrão.")
+    level = build_default_level(BRICK_W, BRICK_H, width=WIDTH, height=HEIGHT, trophy_size=trophy_size)
+    spec = {"kind": "default", "brick": [BRICK_W, BRICK_H], "trophy_size": list(trophy_size) if trophy_size else None}
+    return level, spec
+
+# --- Seed e gravação ---
+# O RNG da fase é um random.Random próprio (GAME_SEED fixa a seed). Com
+# GAME_RECORD=pasta, cada partida (início até game over/vitória) vira um
+# arquivo .krpl que `py replay.py` reproduz headless e confere bit a bit.
+GAME_SEED = os.environ.get("GAME_SEED", "")
+RECORD_DIR = os.environ.get("GAME_RECORD", "")
+recorder = None  # replay.Recorder
+_recorded_sessions = 0
+
+def _save_recording():
+    global _recorded_sessions
+    if recorder is None or recorder.ticks == 0:
+        return
+    _recorded_sessions += 1
+    name = f"session_{time.strftime('%Y%m%d_%H%M%S')}_{_recorded_sessions:03d}.krpl"
+    try:
+        path = recorder.save(Path(RECORD_DIR) / name, world)
+        print(f"[replay] sessão gravada em {path}")
+    except Exception as e:
+        print(f"[replay] falha ao gravar: {e}")
+    recorder.begin()
 
 # --- Game Instances (initialized after pgzrun) ---
+world = None  # simulation.Simulation
 hero = None
 enemies = []
 trophy = None
 game_initialized = False
 
+def _measure_sprite_sizes():
+    """Tamanhos reais dos sprites (via loader do pgzero), para as hitboxes da simulação."""
+    sizes = {}
+    images_obj = globals().get('images')
+    if images_obj is None:
+        return sizes
+    for name in SPRITE_SIZES:
+        try:
+            sizes[name] = tuple(images_obj.load(name).get_size())
+        except Exception:
+            pass
+    return sizes
+
+def _draw_swarm(screen_obj, swarm, ox, oy, view):
+    """Desenha os inimigos visíveis do EnemySwarm (níveis grandes) direto dos arrays."""
+    visible = swarm.overlapping(*view)
+    if animator is None:
+        sizes = world.sprite_sizes
+        for i in visible.tolist():
+            name = swarm.image_name(i)
+            w, h = sizes.get(name, (64, 64))
+            screen_obj.blit(name, (swarm.x[i] - w / 2 - ox, swarm.y[i] - h / 2 - oy))
+        return
+    # frame pré-resolvido pelo índice de imagem (sem busca por nome a cada blit)
+    blit_frames(
+        screen_obj.blit, animator.swarm_frames,
+        swarm.x[visible].tolist(), swarm.y[visible].tolist(), swarm.image[visible].tolist(), ox, oy,
+    )
+
+def _draw_actor(screen_obj, actor, ox, oy):
+    """Desenha um Actor deslocado pela câmera (sem câmera: `actor.draw()`)."""
+    if ox == 0 and oy == 0:
+        actor.draw()
+    else:
+        screen_obj.blit(actor.image, (actor.left - ox, actor.top - oy))
+
+def _draw_background(screen_obj, ox, oy):
+    """Fundo preso ao mundo: repetido quando o nível é maior que a imagem."""
+    if not camera.scrolls:
+        screen_obj.blit(BG_IMAGE, (0, 0))
+        return
+    background_size = globals()['images'].load(BG_IMAGE).get_size()
+    for pos in background_positions(background_size, ox, oy, WIDTH, HEIGHT):
+        screen_obj.blit(BG_IMAGE, pos)
+
+def _read_input():
+    """Converte o `keyboard` do pgzero no InputState da simulação."""
+    keys = globals().get('keyboard')
+    if keys is None:
+        return NO_INPUT
+    return InputState(keys.left, keys.right, keys.up)
+
 def init_game():
-    global hero, enemies, trophy, game_initialized, platforms, BRICK_W, BRICK_H
+    global hero, enemies, trophy, game_initialized, platforms, BRICK_W, BRICK_H, world, recorder
     # Verifica se Actor está disponível (injetado pelo pgzrun)
     if game_initialized:
         return
@@ -656,209 +697,378 @@ def init_game():
         except Exception:
             BRICK_W, BRICK_H = 64, 64
 
-        # Plataformas
-        platforms = [
-            # chão
-            Platform(0, HEIGHT - BRICK_H, WIDTH, BRICK_H),
-        ]
-
-        # escadinha: cada degrau sobe 1 tile e anda 1 tile para a direita
-        base_x = 220
-        base_y = HEIGHT - BRICK_H * 2  # um tile acima do chão
-        step_w = BRICK_W * 3           # largura de cada plataforma/degrau
-        step_h = BRICK_H
-        for i in range(3):
-            platforms.append(
-                Platform(
-                    base_x + i * BRICK_W,
-                    base_y - i * BRICK_H,
-                    step_w,
-                    step_h,
-                )
-            )
-
-        hero = Hero()
-        enemies = [Enemy(400, HEIGHT - 100), Enemy(700, HEIGHT - 100)]
-
-        # Troféu: meio da tela, canto direito
-        trophy = None
+        # Troféu: meio da tela, canto direito (posição calculada pelo nível)
+        trophy_actor = None
+        trophy_size = None
         try:
             trophy_path = _ROOT / "game" / "sprites" / "trophy.png"
             if trophy_path.exists():
-                trophy = actor("trophy", (0, 0))
-                tw = int(getattr(trophy, "width", 64))
-                margin = 24
-                trophy.pos = (WIDTH - (tw / 2) - margin, HEIGHT / 2)
+                trophy_actor = actor("trophy", (0, 0))
+                trophy_size = (int(getattr(trophy_actor, "width", 64)), int(getattr(trophy_actor, "height", 64)))
         except Exception:
-            trophy = None
+            trophy_actor = None
+            trophy_size = None
+
+        # Plataformas (chão + escadinha) e spawns vêm do nível padrão da simulação
+        # (ou do arquivo de GAME_LEVEL).
+        level, level_spec = _load_level(trophy_size)
+
+        # RNG próprio da fase: com a mesma seed, a partida é reproduzível.
+        seed = int(GAME_SEED) if GAME_SEED else new_seed()
+        world = Simulation(level, rng=random.Random(seed), sprite_sizes=_measure_sprite_sizes())
+        # Views sobre a geometria do próprio nível (sem cópia). Depois da
+        # Simulation: o spawn refaz as plataformas de um nível com streaming.
+        platforms = level.platforms.view_as(Platform)
+        invalidate_static_layer()
+        if RECORD_DIR:
+            recorder = Recorder(seed, level_spec, world.sprite_sizes, world.enemy_backend)
+        world.profiler = profiler if profiler.enabled else None
+        hero = Hero(world.hero)
+        enemies = [Enemy(state) for state in world.enemies]
+        _update_camera()
+
+        trophy = None
+        if trophy_actor is not None and level.trophy is not None:
+            tx, ty, tw, th = level.trophy
+            trophy_actor.pos = (tx + tw / 2, ty + th / 2)
+            trophy = trophy_actor
         game_initialized = True
     except (TypeError, NameError) as e:
         # Actor ainda não está disponível ou há outro erro
         return
 
+def restart_level():
+    """
+    Volta a fase ao snapshot inicial no lugar: mesmos Actors, plataformas e
+    troféu, sem recriar objetos nem acessar o disco.
+    """
+    global game_initialized
+    if world is None:
+        game_initialized = False  # ainda não inicializado: init_game cria tudo
+        return
+    world.restart()
+    if recorder is not None:
+        recorder.begin()
+    if world.streaming:
+        _sync_streamed_level()
+    hero.remember()
+    hero.sync()
+    for enemy in enemies:
+        enemy.remember()
+        enemy.sync()
+    _update_camera()
+
+def _sync_streamed_level():
+    """Chunks mudaram: refaz as plataformas e os Actors dos inimigos ativos."""
+    global platforms, enemies
+    platforms = world.level.platforms.view_as(Platform)
+    invalidate_static_layer()
+    views = {id(enemy.state): enemy for enemy in enemies}
+    enemies = [views.get(id(state)) or Enemy(state) for state in world.enemies]
+
 # --- Buttons ---
 def start_game():
-    global game_state
+    global game_state, _accumulator
     game_state = PLAYING
+    _accumulator = 0.0
 
 def trigger_game_over():
     global game_state, game_over_frames
     if game_state != GAME_OVER:
         game_state = GAME_OVER
         game_over_frames = 0
-        if hit_sound:
-            hit_sound.play()
+        audio.play("hit")
 
 def trigger_win():
     global game_state, win_frames
     if game_state != WIN:
         game_state = WIN
         win_frames = 0
-        if hit_sound:
-            hit_sound.play()
+        audio.play("hit")
 
 def toggle_music():
-    global music_enabled, audio_initialized, music_generation
-    music_enabled = not music_enabled
-    audio_initialized = False
-    music_obj = globals().get('music')
-    if not music_enabled and music_obj is not None:
-        try:
-            music_obj.stop()
-        except Exception:
-            pass
-        try:
-            pygame.mixer.music.stop()
-        except Exception:
-            pass
-    else:
-        # ao ligar, incrementa a geração para tocar uma vez
-        music_generation += 1
-    # aplica imediatamente
-    init_audio()
+    audio.toggle_music()
 
 def toggle_sfx():
-    global sfx_enabled, audio_initialized, jump_sound, hit_sound
-    sfx_enabled = not sfx_enabled
-    # aplica na hora
-    if not sfx_enabled:
-        jump_sound = None
-        hit_sound = None
-    audio_initialized = False
-    # aplica imediatamente
-    init_audio()
+    audio.toggle_sfx()
 
 def quit_game():
     exit()
 
 buttons = [
     Button("Start Game", 300, 190, 200, 50, start_game),
-    Button(lambda: f"Música: {'Ligada' if music_enabled else 'Desligada'}", 300, 260, 200, 50, toggle_music),
-    Button(lambda: f"Sons: {'Ligados' if sfx_enabled else 'Desligados'}", 300, 330, 200, 50, toggle_sfx),
+    Button(lambda: f"Música: {'Ligada' if audio.music_enabled else 'Desligada'}", 300, 260, 200, 50, toggle_music),
+    Button(lambda: f"Sons: {'Ligados' if audio.sfx_enabled else 'Desligados'}", 300, 330, 200, 50, toggle_sfx),
     Button("Quit", 300, 400, 200, 50, quit_game),
 ]
 
 # --- Game Loop ---
-def update():
-    global game_over_frames, win_frames, game_initialized
+# A simulação avança em ticks fixos (simulation.DT); o update() de cada frame
+# roda quantos ticks couberem no tempo acumulado e o draw() interpola as
+# posições entre os dois últimos ticks. Frames lentos ou pulados não mudam a
+# jogabilidade: só rodam mais ticks no frame seguinte (até MAX_TICKS_PER_FRAME).
+MAX_TICKS_PER_FRAME = 5
+_accumulator = 0.0
+_alpha = 1.0  # fração do próximo tick já decorrida (interpolação)
+
+def _step_world():
+    """Um tick fixo da simulação (entradas, gravação, eventos)."""
+    hero.remember()
+    for enemy in enemies:
+        enemy.remember()
+    inputs = _read_input()
+    world.step(inputs)  # marca update.hero/enemies/collision
+    if recorder is not None:
+        recorder.record(inputs)
+    if "stream" in world.events:
+        _sync_streamed_level()
+
+    for event in world.events:
+        if event == "jump":
+            audio.play("jump")
+        elif event == "game_over":
+            trigger_game_over()
+            _save_recording()
+        elif event == "win":
+            trigger_win()
+            _save_recording()
+    profiler.mark("update.events")
+
+def update(dt=DT):
+    global game_over_frames, win_frames, _accumulator, _alpha
+    profiler.begin_frame()
+    if game_state == LOADING:
+        _update_loading()
+        return
+    init_audio()  # só agenda o trabalho na thread de áudio (uma vez)
     init_game()  # Initialize game objects after pgzrun sets up globals
-    if game_state == PLAYING and hero:
-        hero.update()
-        for enemy in enemies:
-            enemy.update()
-
-        # collision
+    if game_state == PLAYING and world is not None:
+        _accumulator += min(dt, MAX_TICKS_PER_FRAME * DT)
+        while _accumulator >= DT and game_state == PLAYING:
+            _accumulator -= DT
+            _step_world()
+        # no fim da partida o estado final é desenhado sem interpolação
+        _alpha = _accumulator / DT if game_state == PLAYING else 1.0
+        hero.sync(_alpha)
         for enemy in enemies:
-            # Usa a hitbox fixa do herói para não depender do tamanho do sprite.
-            if enemy.actor.colliderect(hero._collider_rect()):  # type: ignore[attr-defined]
-                trigger_game_over()
-                break
-
-        # Vitória: tocar no troféu
-        if trophy is not None and game_state == PLAYING:
-            try:
-                if trophy.colliderect(hero._collider_rect()):  # type: ignore[attr-defined]
-                    trigger_win()
-            except Exception:
-                pass
+            enemy.sync(_alpha)
+        _update_camera()
+        profiler.mark("update.sync")
     elif game_state == GAME_OVER:
         # Pausa o jogo e reinicia após um curto delay.
         game_over_frames += 1
         if game_over_frames >= GAME_OVER_DELAY_FRAMES:
-            game_initialized = False  # força recriar hero/enemies/platforms
+            restart_level()
             start_game()
     elif game_state == WIN:
         # Pausa o jogo e reinicia após um curto delay.
         win_frames += 1
         if win_frames >= WIN_DELAY_FRAMES:
-            game_initialized = False  # força recriar hero/enemies/platforms/trophy
+            restart_level()
             start_game()
 
-def draw():
-    init_audio()  # Initialize audio after pgzrun sets up globals
-    init_game()  # Initialize game objects after pgzrun sets up globals
-    screen_obj = globals().get('screen')
-    if screen_obj is None:
-        return
+def _draw_loading(screen_obj):
     screen_obj.clear()
-    # Background
+    done = int(preloader.progress * preloader.total)
+    screen_obj.draw.text(
+        f"Carregando... {done}/{preloader.total}",
+        center=(WIDTH // 2, HEIGHT // 2 - 30),
+        fontsize=40,
+        color="white",
+    )
+    bar = Rect((WIDTH // 2 - 150, HEIGHT // 2 + 10), (300, 20))
+    screen_obj.draw.rect(bar, "white")
+    fill_w = int((bar.width - 4) * preloader.progress)
+    if fill_w > 0:
+        screen_obj.draw.filled_rect(Rect((bar.left + 2, bar.top + 2), (fill_w, bar.height - 4)), "white")
+
+def _text_item(screen_obj, item_id, text, **kwargs):
+    """Item de texto para o DirtyRenderer: (id, rect, assinatura, desenhar)."""
+    rect = text_cache.bounds(text, **kwargs)
+    return item_id, rect, text, lambda: text_cache.draw(screen_obj, text, **kwargs)
+
+def _menu_items(screen_obj):
+    """Tudo que o MENU desenha, na ordem (usado pelos dois modos de desenho)."""
+    items = [
+        _text_item(screen_obj, "title", "My Platformer!", center=(WIDTH//2,100), fontsize=60, color="white"),
+        # Debug de áudio (estado mantido pelo AudioManager, sem consultar o mixer)
+        _text_item(
+            screen_obj,
+            "audio",
+            f"{audio.status} | mixer={audio.mixer_ok} | estado={audio.state}",
+            center=(WIDTH//2, 135),
+            fontsize=24,
+            color="yellow",
+        ),
+    ]
+    if audio.last_error:
+        items.append(_text_item(
+            screen_obj,
+            "audio_error",
+            f"Erro áudio: {audio.last_error}",
+            center=(WIDTH//2, 160),
+            fontsize=20,
+            color="red",
+        ))
+    for i, btn in enumerate(buttons):
+        label = btn.text() if callable(btn.text) else btn.text
+        items.append((f"button{i}", btn.rect, label, btn.draw))
+    return items
+
+# --- Dirty rects ---
+# GAME_DIRTY_RECTS=1: no MENU/GAME_OVER/WIN só as áreas que mudaram são
+# redesenhadas (o pgzero ainda apresenta a janela inteira a cada frame).
+USE_DIRTY_RECTS = os.environ.get("GAME_DIRTY_RECTS", "0") == "1"
+dirty_renderer = DirtyRenderer((WIDTH, HEIGHT))
+
+def _draw_menu_background(screen_obj, area):
+    screen_obj.surface.fill((0, 0, 0), area)
     try:
-        screen_obj.blit(BG_IMAGE, (0, 0))
+        background = globals()['images'].load(BG_IMAGE)
+        screen_obj.surface.blit(background, area.topleft, area)
     except Exception:
         pass
+
+def _draw_static_screen(screen_obj):
+    """MENU/GAME_OVER/WIN em modo dirty rect."""
     if game_state == MENU:
-        screen_obj.draw.text("My Platformer!", center=(WIDTH//2,100), fontsize=60, color="white")
-        # Debug de áudio (para entender por que não sai som)
+        dirty_renderer.render(
+            screen_obj.surface, MENU, _menu_items(screen_obj),
+            lambda area: _draw_menu_background(screen_obj, area),
+        )
+    else:
+        # Fase congelada + mensagem: desenha uma vez e depois só se algo mudar.
+        scene = (game_state, id(world), world.tick if world is not None else 0, camera.offset)
+        dirty_renderer.render(
+            screen_obj.surface, scene, [("scene", (0, 0, WIDTH, HEIGHT), scene, lambda: _draw_frame(screen_obj))],
+            lambda area: None,
+        )
+
+def draw():
+    screen_obj = globals().get('screen')
+    if screen_obj is None:
+        return
+
+    if game_state == LOADING:
+        # Sem init_game aqui: ele carregaria os sprites na thread principal,
+        # em paralelo com o preloader. Só roda depois da instalação (ver _update_loading).
+        _draw_loading(screen_obj)
+    # O overlay do profiler muda todo frame: com ele ligado, desenha tudo.
+    elif USE_DIRTY_RECTS and game_state in (MENU, GAME_OVER, WIN) and not profiler.enabled:
+        _draw_static_screen(screen_obj)
+    else:
+        init_game()  # Initialize game objects after pgzrun sets up globals
+        dirty_renderer.invalidate()
+        _draw_frame(screen_obj)
+    if not startup_timer.reported:
+        _track_startup()
+
+def _track_startup():
+    """Marca o primeiro frame e o do menu; com todas as fases medidas, mostra/grava o relatório."""
+    startup_timer.since_start("first_frame")
+    if game_state == LOADING:
+        return
+    startup_timer.since_start("menu")
+    if audio.init_seconds is None:
+        return  # a thread de áudio ainda está inicializando
+    startup_timer.record("audio.init", audio.init_seconds)
+    startup_timer.reported = True
+    if STARTUP_REPORT == "0":
+        return
+    for line in startup_timer.summary_lines():
+        print(line)
+    try:
+        print(f"[startup] relatório salvo em {startup_timer.save(STARTUP_REPORT_PATH)}")
+    except Exception as e:
+        print(f"[startup] não consegui salvar o relatório: {e}")
+    if STARTUP_REPORT == "exit":
+        exit()
+
+def _draw_frame(screen_obj):
+    """Desenha o frame inteiro (fundo, fase ou menu, overlays)."""
+    profiler.resume()
+    in_level = game_state in (PLAYING, GAME_OVER, WIN)
+    ox, oy = camera.offset if in_level else (0, 0)
+    static_layer = _get_static_layer() if (in_level and USE_STATIC_LAYER) else None
+    if static_layer is not None:
+        # Fundo + plataformas num único blit (só a parte do nível que está na tela).
+        screen_obj.surface.blit(static_layer, (0, 0), (ox, oy, WIDTH, HEIGHT))
+    else:
+        screen_obj.clear()
+        # Background
         try:
-            mixer_ok = pygame.mixer.get_init() is not None
-            busy = bool(pygame.mixer.music.get_busy())
+            _draw_background(screen_obj, ox, oy)
         except Exception:
-            mixer_ok = False
-            busy = False
-        screen_obj.draw.text(
-            f"{audio_status} | mixer={mixer_ok} | busy={busy}",
-            center=(WIDTH//2, 135),
-            fontsize=24,
-            color="yellow",
-        )
-        if audio_last_error:
-            screen_obj.draw.text(
-                f"Erro áudio: {audio_last_error}",
-                center=(WIDTH//2, 160),
-                fontsize=20,
-                color="red",
-            )
-        for btn in buttons:
-            btn.draw()
-    elif game_state in (PLAYING, GAME_OVER, WIN):
-        for plat in platforms:
-            plat.draw()
+            pass
+    profiler.mark("draw.background")
+    if game_state == MENU:
+        for _id, _rect, _signature, draw_item in _menu_items(screen_obj):
+            draw_item()
+        profiler.mark("draw.menu")
+    elif in_level:
+        # Culling: só o que cruza a área visível, via índices espaciais
+        # (TileGrid para plataformas, broadphase para inimigos e troféu).
+        view = camera.viewport()
+        if world is None:
+            visible_platforms = platforms.rects()
+            visible_enemies = enemies
+            trophy_visible = True
+        else:
+            visible_platforms = [platforms.bounds(i) for i in world.level.grid.overlapping(*view)]
+            indices, trophy_visible = world.visible_entities(*view)
+            visible_enemies = [enemies[i] for i in indices]
+        profiler.mark("draw.cull")
+        if static_layer is None:
+            blit_platforms(screen_obj.blit, "brick", BRICK_W, visible_platforms, ox, oy, view[0], view[2])
+            profiler.mark("draw.platforms")
         if hero:
-            hero.actor.draw()
-        for enemy in enemies:
-            enemy.actor.draw()
-        if trophy is not None:
-            trophy.draw()
+            _draw_view(screen_obj, hero, ox, oy)
+        for enemy in visible_enemies:
+            _draw_view(screen_obj, enemy, ox, oy)
+        if world is not None and world.swarm is not None:
+            _draw_swarm(screen_obj, world.swarm, ox, oy, view)
+        if trophy is not None and trophy_visible:
+            _draw_actor(screen_obj, trophy, ox, oy)
+        profiler.mark("draw.actors")
 
         if game_state == GAME_OVER:
             # Overlay de Game Over
-            screen_obj.draw.text(
+            text_cache.draw(
+                screen_obj,
                 GAME_OVER_MESSAGE,
                 center=(WIDTH // 2, HEIGHT // 2),
                 fontsize=60,
                 color="red",
             )
         elif game_state == WIN:
-            screen_obj.draw.text(
+            text_cache.draw(
+                screen_obj,
                 WIN_MESSAGE,
                 center=(WIDTH // 2, HEIGHT // 2),
                 fontsize=60,
                 color="green",
             )
+        profiler.mark("draw.text")
+
+    if profiler.enabled:
+        profiler.draw_overlay(screen_obj)
+
+def on_music_end():
+    audio.on_music_end()
+
+def on_key_down(key):
+    keys_obj = globals().get('keys')
+    if keys_obj is None:
+        return
+    if key == keys_obj.F3:
+        toggle_profiler()
+    elif key == keys_obj.F4:
+        export_profile()
 
 def on_mouse_down(pos):
     if game_state == MENU:
         for btn in buttons:
             btn.click(pos)
 
+startup_timer.since_start("import")
 pgzrun.go()
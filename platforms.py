@@ -0,0 +1,110 @@
+"""
+Geometria das plataformas num array compartilhado.
+
+Em vez de um objeto com `__dict__` + um `Rect` por plataforma, todas as
+plataformas ficam num único `array('d')` com (left, top, w, h) em sequência
+(32 bytes por plataforma). Esse array é a única cópia da geometria: o `Level`
+o guarda, a `TileGrid` indexa e lê dele e o jogo desenha a partir dele.
+`PlatformArray[i]` devolve uma view leve (`PlatformView`, com `__slots__`)
+criada na hora, então níveis com muitas plataformas não guardam um objeto
+Python por plataforma.
+"""
+from array import array
+
+FIELDS = 4  # left, top, w, h
+
+
+class PlatformView:
+    """Plataforma `index` de um `PlatformArray` (não copia a geometria)."""
+
+    __slots__ = ("geometry", "index")
+
+    def __init__(self, geometry, index):
+        self.geometry = geometry
+        self.index = index
+
+    @property
+    def bounds(self):
+        """(left, top, w, h)."""
+        return self.geometry.bounds(self.index)
+
+    @property
+    def left(self):
+        return self.geometry.data[self.index * FIELDS]
+
+    @property
+    def top(self):
+        return self.geometry.data[self.index * FIELDS + 1]
+
+    @property
+    def width(self):
+        return self.geometry.data[self.index * FIELDS + 2]
+
+    @property
+    def height(self):
+        return self.geometry.data[self.index * FIELDS + 3]
+
+    @property
+    def right(self):
+        return self.left + self.width
+
+    @property
+    def bottom(self):
+        return self.top + self.height
+
+
+class PlatformArray:
+    """Sequência de plataformas; `view` é a classe das views devolvidas por `[i]`."""
+
+    __slots__ = ("data", "view")
+
+    def __init__(self, rects=(), view=PlatformView):
+        self.data = array("d")
+        self.view = view
+        for rect in rects:
+            self.data.extend(rect)
+
+    def view_as(self, view):
+        """Mesma geometria (o mesmo array, sem cópia) com outra classe de view."""
+        other = PlatformArray(view=view)
+        other.data = self.data
+        return other
+
+    def __len__(self):
+        return len(self.data) // FIELDS
+
+    def __getitem__(self, index):
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("índice de plataforma fora do intervalo")
+        return self.view(self, index)
+
+    def __iter__(self):
+        view = self.view
+        for index in range(len(self)):
+            yield view(self, index)
+
+    def append(self, rect):
+        self.data.extend(rect)
+
+    def extend(self, other):
+        """Acrescenta as plataformas de outro `PlatformArray` (cópia direta do array)."""
+        self.data.extend(other.data)
+
+    def bounds(self, index):
+        """(left, top, w, h) da plataforma `index`."""
+        j = index * FIELDS
+        d = self.data
+        return d[j], d[j + 1], d[j + 2], d[j + 3]
+
+    def rects(self):
+        """Todas as plataformas como tuplas (left, top, w, h), geradas sob demanda."""
+        d = self.data
+        for j in range(0, len(d), FIELDS):
+            yield d[j], d[j + 1], d[j + 2], d[j + 3]
+
+    @property
+    def nbytes(self):
+        return self.data.itemsize * len(self.data)
@@ -0,0 +1,158 @@
+"""
+Pré-carregamento assíncrono de assets (sprites, sons e música).
+
+Na inicialização, decodifica todos os PNGs de `game/sprites`, os sons de
+`game/sounds` e lê a música de `game/music` num pool de threads, enquanto o
+jogo mostra a tela de LOADING com o progresso. Quando termina, as superfícies
+vão para o cache do loader de imagens do pgzero e os sons para o
+AudioManager, então nada é decodificado durante o PLAYING.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+from pathlib import Path
+
+import pygame
+
+IMAGE_EXTS = (".png",)
+SOUND_EXTS = (".mp3", ".ogg", ".oga", ".wav")
+
+
+def _list_files(folder: Path, exts):
+    try:
+        return sorted(
+            p for p in folder.iterdir()
+            if p.is_file() and p.suffix.lower() in exts and p.stat().st_size > 0
+        )
+    except Exception:
+        return []
+
+
+def install_surfaces(images_loader, surfaces, source="preload"):
+    """
+    Coloca `surfaces` ({nome: Surface}) no cache do loader de imagens do pgzero
+    (`ResourceLoader.cache`, chaveado por `cache_key(nome, (), {})`), de modo que
+    `images.load(nome)` e os Actors recebam essas superfícies sem decodificar nada.
+    """
+    # vars(): o __getattr__ do loader tentaria carregar uma imagem "cache"
+    cache = vars(images_loader).get("cache")
+    if not isinstance(cache, dict):
+        raise TypeError(f"{type(images_loader).__name__} não tem o cache de recursos do pgzero (.cache)")
+    key_fn = images_loader.cache_key
+    for name, surface in surfaces.items():
+        cache[key_fn(name, (), {})] = surface
+    for name, surface in surfaces.items():
+        if images_loader.load(name) is not surface:
+            raise RuntimeError(f"{source}: o loader de imagens não devolveu a superfície instalada de {name!r}")
+    return len(surfaces)
+
+
+class AssetPreloader:
+    def __init__(self, sprites_dir: Path, sounds_dir: Path, music_dir: Path, *, max_workers=None,
+                 skip_images=(), sound_cache=None):
+        """
+        `skip_images`: nomes de sprites que já vêm de outro lugar (ex.: atlas).
+        `sound_cache`: `audio.SoundCache` usado para os sons (PCM já decodificado).
+        """
+        self.sprites_dir = sprites_dir
+        self.sound_cache = sound_cache
+        self.skip_images = set(skip_images)
+        self.sounds_dir = sounds_dir
+        self.music_dir = music_dir
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 2))
+
+        self.images = {}  # nome (sem extensão) -> Surface (ainda sem convert)
+        self.sounds = {}  # nome (sem extensão) -> pygame.mixer.Sound
+        self.music = {}   # nome do arquivo -> bytes
+        self.errors = {}  # caminho -> mensagem
+        self.total = 0
+        self._done = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._futures = []
+        self._sound_sources = {}  # nome (sem extensão) -> arquivo de onde veio o som
+
+    @property
+    def started(self):
+        return self._executor is not None
+
+    @property
+    def done(self):
+        return self.started and self._done >= self.total
+
+    @property
+    def progress(self):
+        """Fração concluída (0.0 a 1.0)."""
+        if not self.started:
+            return 0.0
+        if self.total == 0:
+            return 1.0
+        return self._done / self.total
+
+    def start(self):
+        """Agenda a decodificação de todos os assets (idempotente)."""
+        if self.started:
+            return
+        jobs = [
+            (self._load_image, p)
+            for p in _list_files(self.sprites_dir, IMAGE_EXTS)
+            if p.stem not in self.skip_images
+        ]
+        # Sound() exige o mixer inicializado; sem ele o AudioManager decodifica depois.
+        if pygame.mixer.get_init() is not None:
+            jobs += [(self._load_sound, p) for p in _list_files(self.sounds_dir, SOUND_EXTS)]
+        jobs += [(self._load_music, p) for p in _list_files(self.music_dir, SOUND_EXTS)]
+        self.total = len(jobs)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="preload")
+        self._futures = [self._executor.submit(self._run_job, fn, path) for fn, path in jobs]
+        self._executor.shutdown(wait=False)
+
+    def wait(self):
+        """Bloqueia até terminar (útil em scripts/benchmarks)."""
+        for future in self._futures:
+            future.result()
+
+    def _run_job(self, fn, path):
+        try:
+            fn(path)
+        except Exception as e:
+            with self._lock:
+                self.errors[str(path)] = str(e)
+        finally:
+            with self._lock:
+                self._done += 1
+
+    def _load_image(self, path):
+        surface = pygame.image.load(str(path))
+        with self._lock:
+            self.images[path.stem] = surface
+
+    def _load_sound(self, path):
+        if self.sound_cache is not None:
+            sound = self.sound_cache.load(path)
+        else:
+            sound = pygame.mixer.Sound(str(path))
+        with self._lock:
+            # Mesmo nome com extensões diferentes: mantém o primeiro (ordem alfabética).
+            # Os jobs terminam em qualquer ordem, então compara com o arquivo já guardado.
+            current = self._sound_sources.get(path.stem)
+            if current is None or path.name < current:
+                self._sound_sources[path.stem] = path.name
+                self.sounds[path.stem] = sound
+
+    def _load_music(self, path):
+        data = path.read_bytes()
+        with self._lock:
+            self.music[path.name] = data
+
+    def install_images(self, images_loader):
+        """
+        Converte as superfícies para o formato da tela (na thread principal)
+        e as instala no loader de imagens do pgzero (ver `install_surfaces`).
+        """
+        for name, surface in self.images.items():
+            try:
+                self.images[name] = surface.convert_alpha()
+            except pygame.error:
+                pass
+        return install_surfaces(images_loader, self.images)
@@ -0,0 +1,129 @@
+"""
+Profiler de frames por fase (update/draw), com overlay e exportação.
+
+Cada frame guarda a duração de cada fase ("update.hero", "draw.platforms"...)
+num buffer circular dos últimos `capacity` frames. O overlay mostra a média e
+o pior valor de cada fase nesse intervalo; `export_chrome_trace` grava um
+arquivo para `chrome://tracing` / Perfetto e `export_json` um resumo.
+
+Uso: `begin_frame()` no início do `update()`, `resume()` no início de um
+trecho medido e `mark("fase")` no fim de cada fase (mede desde o último
+`mark`/`resume`). Desligado, cada chamada só testa `enabled`; a simulação nem
+recebe o profiler (`Simulation.profiler is None`).
+"""
+from collections import deque
+import json
+from time import perf_counter_ns
+
+DEFAULT_CAPACITY = 600  # ~10 s a 60 FPS
+
+
+class FrameProfiler:
+    def __init__(self, capacity=DEFAULT_CAPACITY, *, enabled=False):
+        self.capacity = capacity
+        self.enabled = enabled
+        # cada frame: (início_ns, fim_ns, [(fase, início_ns, duração_ns), ...])
+        self.frames = deque(maxlen=capacity)
+        self._frame_start = None
+        self._spans = []
+        self._last = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.clear()
+        return self.enabled
+
+    def clear(self):
+        self.frames.clear()
+        self._frame_start = None
+        self._spans = []
+
+    def begin_frame(self):
+        """Fecha o frame anterior (se houver) e começa outro."""
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        if self._frame_start is not None:
+            self.frames.append((self._frame_start, now, self._spans))
+        self._frame_start = now
+        self._spans = []
+        self._last = now
+
+    def resume(self):
+        """Começa a medir a partir de agora (o intervalo anterior não é registrado)."""
+        if self.enabled:
+            self._last = perf_counter_ns()
+
+    def mark(self, name):
+        """Registra a fase `name`: do último `mark`/`resume` até agora."""
+        if not self.enabled or self._frame_start is None:
+            return
+        now = perf_counter_ns()
+        self._spans.append((name, self._last, now - self._last))
+        self._last = now
+
+    def stats(self):
+        """
+        {fase: (média_ms, pior_ms)} nos frames do buffer, incluindo "frame"
+        (tempo total entre o início de um frame e o do seguinte).
+        """
+        totals = {}
+        worst = {}
+        for start, end, spans in self.frames:
+            per_frame = {"frame": end - start}
+            for name, _s, dur in spans:
+                per_frame[name] = per_frame.get(name, 0) + dur
+            for name, dur in per_frame.items():
+                totals[name] = totals.get(name, 0) + dur
+                if dur > worst.get(name, 0):
+                    worst[name] = dur
+        n = max(1, len(self.frames))
+        return {name: (totals[name] / n / 1e6, worst[name] / 1e6) for name in totals}
+
+    def overlay_lines(self):
+        stats = self.stats()
+        if not stats:
+            return ["profiler: coletando..."]
+        frame_avg, frame_worst = stats.pop("frame", (0.0, 0.0))
+        fps = 1000.0 / frame_avg if frame_avg > 0 else 0.0
+        lines = [f"frame {frame_avg:5.2f} ms (pior {frame_worst:5.2f}) ~{fps:4.0f} FPS  [{len(self.frames)} frames]"]
+        for name in sorted(stats):
+            avg, worst = stats[name]
+            lines.append(f"{name:<18} {avg:6.3f} ms  pior {worst:6.3f}")
+        return lines
+
+    def draw_overlay(self, screen_obj, x=8, y=8, fontsize=18):
+        for i, line in enumerate(self.overlay_lines()):
+            screen_obj.draw.text(line, topleft=(x, y + i * fontsize), fontsize=fontsize, color="yellow")
+
+    def chrome_trace(self):
+        """Eventos no formato Trace Event (chrome://tracing, Perfetto)."""
+        events = []
+        origin = self.frames[0][0] if self.frames else 0
+        for index, (start, end, spans) in enumerate(self.frames):
+            events.append({
+                "name": "frame", "cat": "frame", "ph": "X", "pid": 0, "tid": 0,
+                "ts": (start - origin) / 1000, "dur": (end - start) / 1000, "args": {"index": index},
+            })
+            for name, s, dur in spans:
+                events.append({
+                    "name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": 0, "tid": 0,
+                    "ts": (s - origin) / 1000, "dur": dur / 1000,
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+    def export_json(self, path):
+        """Resumo por fase (média e pior, em ms)."""
+        stats = self.stats()
+        data = {
+            "frames": len(self.frames),
+            "phases": {name: {"avg_ms": avg, "worst_ms": worst} for name, (avg, worst) in sorted(stats.items())},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return path
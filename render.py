@@ -0,0 +1,113 @@
+"""
+Funções de renderização reutilizáveis.
+
+Não dependem dos globals injetados pelo pgzrun (`screen`, `images`...):
+recebem superfícies pygame já carregadas, então servem tanto para o jogo
+(main.py) quanto para scripts de benchmark.
+"""
+import pygame
+
+# A camada estática cobre o nível inteiro até este tamanho (em telas); níveis
+# maiores são desenhados tile a tile, só com o que está na tela.
+STATIC_LAYER_MAX_SCREENS = 4
+
+
+def world_size(level, view_w, view_h):
+    """Tamanho do nível em pixels, nunca menor que a janela."""
+    return max(view_w, int(level.width)), max(view_h, int(level.height))
+
+
+def static_layer_fits(size, view_w, view_h):
+    """True se uma camada estática de `size` cabe no limite de STATIC_LAYER_MAX_SCREENS telas."""
+    return size[0] * size[1] <= STATIC_LAYER_MAX_SCREENS * view_w * view_h
+
+
+def background_positions(background_size, ox, oy, view_w, view_h):
+    """Posições na tela das cópias do fundo preso ao mundo (repetido) que cobrem a janela."""
+    bw, bh = background_size
+    for by in range(-(oy % bh), view_h, bh):
+        for bx in range(-(ox % bw), view_w, bw):
+            yield bx, by
+
+
+def blit_platforms(blit, tile, tile_w, rects, ox, oy, left, right):
+    """
+    Desenha os tiles de cada plataforma (x, y, w, h) de `rects` que cruzam
+    [left, right), deslocados pela câmera. `blit(tile, pos)` pode ser o
+    `Surface.blit` do pygame ou o `screen.blit` do pgzero (tile pelo nome).
+    """
+    for rect in rects:
+        for x, y in visible_tile_positions(rect, tile_w, left, right):
+            blit(tile, (x - ox, y - oy))
+
+
+def blit_frame(blit, frame, x, y, ox, oy):
+    """Desenha um frame (superfície, meia largura, meia altura) centrado em (x, y)."""
+    surface, hw, hh = frame
+    blit(surface, (x - hw - ox, y - hh - oy))
+
+
+def blit_frames(blit, frames, xs, ys, images, ox, oy):
+    """Como `blit_frame` para várias entidades: `frames[image]` de cada (x, y, image)."""
+    for x, y, image in zip(xs, ys, images):
+        surface, hw, hh = frames[image]
+        blit(surface, (x - hw - ox, y - hh - oy))
+
+
+def iter_tile_positions(rect, tile_w):
+    """Gera as posições (x, y) de cada tile ao longo de um retângulo (x, y, w, h)."""
+    x, y, w, _h = rect
+    if tile_w <= 0:
+        return
+    x0 = int(x)
+    y0 = int(y)
+    x1 = int(x + w)
+    px = x0
+    while px < x1:
+        yield px, y0
+        px += tile_w
+
+
+def visible_tile_positions(rect, tile_w, left, right):
+    """Como `iter_tile_positions`, mas só os tiles que cruzam [left, right)."""
+    x, y, w, _h = rect
+    if tile_w <= 0:
+        return
+    x0 = int(x)
+    x1 = min(int(x + w), int(right))
+    px = x0
+    if left > x0:
+        # pula direto para o primeiro tile visível (mantém o alinhamento da plataforma)
+        px = x0 + (int(left) - x0) // tile_w * tile_w
+    while px < x1:
+        yield px, int(y)
+        px += tile_w
+
+
+def build_static_layer(size, background, tile, rects, tile_w):
+    """
+    Pré-renderiza fundo + plataformas numa única superfície.
+
+    `rects` é uma sequência de (x, y, w, h). O resultado é uma superfície opaca
+    do tamanho pedido (a tela ou o nível inteiro): cada frame passa a custar um
+    único blit, independente da quantidade de tiles. Se o nível for maior que o
+    fundo, o fundo é repetido.
+    """
+    layer = pygame.Surface(size)
+    try:
+        layer = layer.convert()
+    except pygame.error:
+        # Sem display ativo (ex.: scripts headless): mantém o formato padrão.
+        pass
+    layer.fill((0, 0, 0))
+    if background is not None:
+        bw, bh = background.get_size()
+        for by in range(0, size[1], max(1, bh)):
+            for bx in range(0, size[0], max(1, bw)):
+                layer.blit(background, (bx, by))
+    if tile is not None:
+        blit = layer.blit
+        for rect in rects:
+            for pos in iter_tile_positions(rect, tile_w):
+                blit(tile, pos)
+    return layer
@@ -0,0 +1,188 @@
+"""
+Gravação de entradas por tick e replay headless determinístico.
+
+Uma sessão (do início da fase até GAME_OVER/WIN) é reproduzível a partir de:
+a seed do RNG da simulação, o nível, os tamanhos de sprite usados nas
+hitboxes e as teclas de cada tick. O arquivo .krpl guarda isso de forma
+compacta:
+
+    b"KRPL" + u16 versão + u32 tamanho do cabeçalho
+    cabeçalho JSON (seed, nível, sprite_sizes, ticks, estado e hash finais)
+    entradas em RLE: pares (u8 teclas, u16 repetições)
+
+`replay_file` recria a simulação, aplica as entradas o mais rápido possível
+(sem janela nem relógio) e compara o hash do estado final com o gravado,
+então uma otimização na colisão ou nos inimigos pode ser conferida bit a bit.
+
+Uso:
+    py replay.py sessions/*.krpl
+"""
+import hashlib
+import json
+import random
+import struct
+import sys
+import time
+from pathlib import Path
+
+from simulation import InputState, Simulation, build_default_level
+
+MAGIC = b"KRPL"
+# v2: animação no relógio compartilhado; v3: corrida para a esquerda com os
+# frames de corrida espelhados; v4: hitbox do herói em pixels inteiros (o
+# estado final muda a cada versão)
+VERSION = 4
+PREAMBLE = struct.Struct("<4sHI")
+RUN = struct.Struct("<BH")
+MAX_RUN = 0xFFFF
+
+_LEFT, _RIGHT, _UP = 1, 2, 4
+# os 8 InputState possíveis, indexados pela máscara de teclas
+_INPUTS = tuple(InputState(m & _LEFT, m & _RIGHT, m & _UP) for m in range(8))
+
+
+def input_mask(inputs):
+    return (_LEFT if inputs.left else 0) | (_RIGHT if inputs.right else 0) | (_UP if inputs.up else 0)
+
+
+def state_hash(sim):
+    """SHA-1 do estado da simulação (posições, animação, RNG...), exato bit a bit."""
+    h = hashlib.sha1()
+    snap = sim.snapshot()
+    # repr de float é exato (ida e volta), então o texto identifica o estado
+    h.update(repr((snap.tick, snap.state, snap.hero, snap.enemies)).encode())
+    if snap.swarm is not None:
+        arrays, rng_state = snap.swarm
+        for array in arrays:
+            h.update(array.tobytes())
+        h.update(repr(rng_state).encode())
+    if snap.rng_state is not None:
+        h.update(repr(snap.rng_state).encode())
+    return h.hexdigest()
+
+
+def new_seed():
+    return random.SystemRandom().randrange(1 << 63)
+
+
+def make_simulation(level_spec, seed, sprite_sizes=None, enemy_backend="auto"):
+    """Simulação igual à do jogo para `level_spec` (ver `Recorder`)."""
+    if level_spec.get("kind") == "file":
+        from levelfile import StreamingLevel
+
+        level = StreamingLevel(level_spec["path"])
+    else:
+        brick_w, brick_h = level_spec.get("brick", (64, 64))
+        trophy_size = level_spec.get("trophy_size")
+        level = build_default_level(brick_w, brick_h, trophy_size=tuple(trophy_size) if trophy_size else None)
+    return Simulation(level, rng=random.Random(seed), sprite_sizes=sprite_sizes, enemy_backend=enemy_backend)
+
+
+class Recorder:
+    """
+    Grava as entradas de uma sessão. `level_spec`: {"kind": "default",
+    "brick": [w, h], "trophy_size": [w, h] | None} ou {"kind": "file", "path": ...}.
+    """
+
+    def __init__(self, seed, level_spec, sprite_sizes=None, enemy_backend="auto"):
+        self.seed = seed
+        self.level_spec = level_spec
+        self.sprite_sizes = dict(sprite_sizes or {})
+        self.enemy_backend = enemy_backend
+        self.runs = []  # [máscara, repetições]
+        self.ticks = 0
+
+    def begin(self):
+        """Começa uma sessão nova (a fase voltou ao estado inicial)."""
+        self.runs = []
+        self.ticks = 0
+
+    def record(self, inputs):
+        mask = input_mask(inputs)
+        runs = self.runs
+        if runs and runs[-1][0] == mask and runs[-1][1] < MAX_RUN:
+            runs[-1][1] += 1
+        else:
+            runs.append([mask, 1])
+        self.ticks += 1
+
+    def save(self, path, sim):
+        """Grava a sessão com o estado final de `sim`."""
+        header = json.dumps({
+            "seed": self.seed,
+            "level": self.level_spec,
+            "sprite_sizes": self.sprite_sizes,
+            "enemy_backend": self.enemy_backend,
+            "ticks": self.ticks,
+            "end_state": sim.state,
+            "end_hash": state_hash(sim),
+        }, sort_keys=True).encode("utf-8")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+            f.write(header)
+            f.write(b"".join(RUN.pack(mask, count) for mask, count in self.runs))
+        return path
+
+
+class Replay:
+    def __init__(self, header, runs):
+        self.header = header
+        self.runs = runs
+
+    @classmethod
+    def load(cls, path):
+        data = Path(path).read_bytes()
+        magic, version, header_len = PREAMBLE.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: não é um replay .krpl v{VERSION}")
+        offset = PREAMBLE.size
+        header = json.loads(data[offset:offset + header_len].decode("utf-8"))
+        offset += header_len
+        runs = list(RUN.iter_unpack(data[offset:]))
+        return cls(header, runs)
+
+    def inputs(self):
+        """InputState de cada tick, em ordem."""
+        for mask, count in self.runs:
+            state = _INPUTS[mask]
+            for _ in range(count):
+                yield state
+
+    def simulation(self):
+        h = self.header
+        return make_simulation(h["level"], h["seed"], h.get("sprite_sizes"), h.get("enemy_backend", "auto"))
+
+    def run(self):
+        """Roda o replay headless. Retorna (confere, simulação)."""
+        sim = self.simulation()
+        step = sim.step
+        for inputs in self.inputs():
+            step(inputs)
+        h = self.header
+        ok = sim.tick == h["ticks"] and sim.state == h["end_state"] and state_hash(sim) == h["end_hash"]
+        return ok, sim
+
+
+def replay_file(path):
+    return Replay.load(path).run()
+
+
+def main(argv):
+    if not argv:
+        print("uso: py replay.py <sessão.krpl> [...]")
+        return 2
+    failures = 0
+    for path in argv:
+        start = time.perf_counter()
+        ok, sim = replay_file(path)
+        elapsed = time.perf_counter() - start
+        rate = sim.tick / elapsed if elapsed > 0 else float("inf")
+        print(f"{'OK ' if ok else 'DIVERGIU'} {path}: {sim.tick} ticks, {sim.state}, {rate:,.0f} ticks/s")
+        failures += not ok
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
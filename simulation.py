@@ -0,0 +1,609 @@
+"""
+Núcleo de simulação headless do jogo (herói, inimigos, plataformas e troféu).
+
+Não usa pgzero, pygame, janela nem mixer: cada `Simulation.step` avança um tick
+de tempo fixo a partir de um `InputState` explícito. O `main.py` usa o mesmo
+núcleo (os Actors só espelham o estado daqui), então testes de carga, bots e
+testes de regressão rodam exatamente a mesma lógica do jogo, sem SDL.
+
+Exemplo:
+    sim = Simulation(build_default_level(), rng=random.Random(1))
+    while sim.state == PLAYING and sim.tick < 10_000:
+        sim.step(InputState(right=True, up=True))
+"""
+from collections import namedtuple
+import random
+
+from broadphase import SpatialHash
+from platforms import PlatformArray
+from tilegrid import TileGrid
+
+WIDTH = 800
+HEIGHT = 600
+BRICK_W = 64
+BRICK_H = 64
+
+TICK_RATE = 60          # ticks por segundo (o jogo roda a ~60 FPS)
+DT = 1.0 / TICK_RATE
+
+GRAVITY = 0.5
+HERO_MOVE_SPEED = 5
+HERO_JUMP_VELOCITY = -12
+HERO_ANIM_DELAY = 8     # ticks entre frames de animação do herói
+ENEMY_SPEED = 2
+ENEMY_ANIM_DELAY = 12
+ENEMY_FLIP_CHANCE = 0.01
+ENEMY_PAUSE_CHANCE = 0.005
+ENEMY_PAUSE_RANGE = (30, 90)
+TROPHY_MARGIN = 24
+
+# A partir de quantos inimigos o backend "auto" troca os EnemyState pelo
+# EnemySwarm vetorizado (se o NumPy estiver instalado).
+SWARM_MIN_ENEMIES = 256
+
+HERO_STAND_FRAMES = ("hero_idle3", "hero_idle1", "hero_idle2")
+HERO_RUN_FRAMES = ("hero_run1", "hero_run2")
+# Correndo para a esquerda: os frames de corrida espelhados. Não existem PNGs
+# com esses nomes; o jogo gera as superfícies na carga (ver animation.py).
+MIRROR_SUFFIX = "_left"
+HERO_RUN_LEFT_FRAMES = tuple(name + MIRROR_SUFFIX for name in HERO_RUN_FRAMES)
+HERO_JUMP_IMAGE = "hero_jump"
+ENEMY_IDLE_FRAMES = ("enemy_idle1", "enemy_idle2")
+ENEMY_MOVE_FRAMES = ("enemy_move1", "enemy_move2")
+
+# Tamanho (w, h) dos sprites de game/sprites. Permite calcular hitboxes sem
+# carregar imagens; o jogo pode passar os tamanhos reais medidos no pgzero.
+SPRITE_SIZES = {
+    "brick": (64, 64),
+    "enemy_idle1": (52, 86),
+    "enemy_idle2": (52, 83),
+    "enemy_move1": (52, 83),
+    "enemy_move2": (52, 86),
+    "hero_idle1": (51, 75),
+    "hero_idle2": (32, 85),
+    "hero_idle3": (32, 85),
+    "hero_jump": (61, 91),
+    "hero_run1": (56, 83),
+    "hero_run2": (68, 83),
+    "trophy": (51, 51),
+}
+
+# Chaves das entidades não-inimigas na broadphase (inimigos usam o índice).
+HERO_KEY = "hero"
+TROPHY_KEY = "trophy"
+BROADPHASE_CELL = 128
+
+# Estados da simulação (mesmos valores de main.py)
+PLAYING = "playing"
+GAME_OVER = "game_over"
+WIN = "win"
+
+
+class InputState:
+    """Teclas relevantes num tick (equivalente ao `keyboard` do pgzero)."""
+
+    __slots__ = ("left", "right", "up")
+
+    def __init__(self, left=False, right=False, up=False):
+        self.left = bool(left)
+        self.right = bool(right)
+        self.up = bool(up)
+
+    def __eq__(self, other):
+        if not isinstance(other, InputState):
+            return NotImplemented
+        return (self.left, self.right, self.up) == (other.left, other.right, other.up)
+
+    def __hash__(self):
+        return hash((self.left, self.right, self.up))
+
+    def __repr__(self):
+        return f"InputState(left={self.left}, right={self.right}, up={self.up})"
+
+
+NO_INPUT = InputState()
+
+
+class Level:
+    """Geometria estática + spawns de um nível."""
+
+    def __init__(self, rects, *, width=WIDTH, height=HEIGHT, hero_spawn=(100, HEIGHT - 150),
+                 enemy_spawns=(), trophy=None, cell_w=BRICK_W, cell_h=BRICK_H):
+        # rects: PlatformArray ou sequência de (x, y, w, h); trophy: (x, y, w, h) ou None.
+        # `platforms` é a única cópia da geometria: a grade e o jogo leem dela.
+        self.platforms = rects if isinstance(rects, PlatformArray) else PlatformArray(rects)
+        self.width = width
+        self.height = height
+        self.hero_spawn = hero_spawn
+        self.enemy_spawns = list(enemy_spawns)
+        self.trophy = trophy
+        self.grid = TileGrid(self.platforms, cell_w, cell_h)
+
+
+def build_default_level(brick_w=BRICK_W, brick_h=BRICK_H, *, width=WIDTH, height=HEIGHT,
+                        trophy_size=SPRITE_SIZES["trophy"]):
+    """Nível padrão do jogo: chão + escadinha de 3 degraus + troféu à direita."""
+    rects = [
+        # chão
+        (0, height - brick_h, width, brick_h),
+    ]
+    # escadinha: cada degrau sobe 1 tile e anda 1 tile para a direita
+    base_x = 220
+    base_y = height - brick_h * 2  # um tile acima do chão
+    step_w = brick_w * 3           # largura de cada plataforma/degrau
+    for i in range(3):
+        rects.append((base_x + i * brick_w, base_y - i * brick_h, step_w, brick_h))
+
+    trophy = None
+    if trophy_size is not None:
+        # Troféu: meio da tela, canto direito
+        tw, th = trophy_size
+        trophy = (width - tw - TROPHY_MARGIN, height / 2 - th / 2, tw, th)
+
+    return Level(
+        rects,
+        width=width,
+        height=height,
+        hero_spawn=(100, height - 150),
+        enemy_spawns=[(400, height - 100), (700, height - 100)],
+        trophy=trophy,
+        cell_w=brick_w,
+        cell_h=brick_h,
+    )
+
+
+# Estado completo e imutável da simulação (ver Simulation.snapshot).
+SimulationSnapshot = namedtuple(
+    "SimulationSnapshot", ("tick", "state", "hero", "enemies", "swarm", "rng_state")
+)
+
+
+def animation_frame(tick, delay, count):
+    """
+    Índice do frame num ciclo de `count` frames, no relógio compartilhado da
+    simulação: todas as entidades de um tipo trocam de frame juntas, a cada
+    `delay + 1` ticks. O desenho (main.py) usa o mesmo relógio (`Simulation.tick`).
+    """
+    return (tick // (delay + 1)) % count
+
+
+class HeroState:
+    """
+    Estado do herói; (x, y) é o centro da hitbox fixa.
+
+    A posição é float, mas a hitbox fica em pixels inteiros, como o `Rect` do
+    pygame que o jogo usava: o canto superior esquerdo é truncado (`int`) e a
+    largura/altura são inteiras. Pousos, batidas no teto e limites do mundo
+    caem nos mesmos pixels do jogo original.
+    """
+
+    __slots__ = (
+        "x", "y", "vy", "on_ground", "move_speed", "jump_velocity", "collider_w", "collider_h",
+        "image",
+    )
+    # campos que mudam durante a partida (a hitbox é fixa)
+    SNAPSHOT_FIELDS = ("x", "y", "vy", "on_ground", "image")
+
+    def __init__(self, x, y, collider_w, collider_h):
+        self.x = x
+        self.y = y
+        self.vy = 0
+        self.on_ground = False
+        self.move_speed = HERO_MOVE_SPEED
+        self.jump_velocity = HERO_JUMP_VELOCITY
+        self.collider_w = int(collider_w)
+        self.collider_h = int(collider_h)
+        self.image = HERO_STAND_FRAMES[0]
+
+    def bounds(self):
+        """(left, top, right, bottom) da hitbox, em pixels inteiros (ver a classe)."""
+        left = int(self.x - self.collider_w / 2)
+        top = int(self.y - self.collider_h / 2)
+        return left, top, left + self.collider_w, top + self.collider_h
+
+    def collides_with(self, left, top, right, bottom):
+        """Sobreposição estrita da hitbox com o retângulo (regra de `Rect.colliderect`)."""
+        l, t, r, b = self.bounds()
+        return l < right and r > left and t < bottom and b > top
+
+    def set_left(self, left):
+        self.x = left + self.collider_w / 2
+
+    def set_right(self, right):
+        self.x = right - self.collider_w / 2
+
+    def set_top(self, top):
+        self.y = top + self.collider_h / 2
+
+    def set_bottom(self, bottom):
+        self.y = bottom - self.collider_h / 2
+
+    def update_animation(self, frames, tick):
+        self.image = frames[animation_frame(tick, HERO_ANIM_DELAY, len(frames))]
+
+
+class EnemyState:
+    """Estado de um inimigo; a hitbox acompanha o tamanho do frame atual."""
+
+    __slots__ = (
+        "x", "y", "direction", "speed", "pause_frames", "image", "chunk",
+    )
+    SNAPSHOT_FIELDS = __slots__
+
+    def __init__(self, x, y, direction, chunk=None):
+        self.x = x
+        self.y = y
+        self.direction = direction
+        # chunk de origem em níveis com streaming (o inimigo some quando ele é descarregado)
+        self.chunk = chunk
+        self.speed = ENEMY_SPEED
+        self.pause_frames = 0
+        self.image = ENEMY_IDLE_FRAMES[0]
+
+    def bounds(self, sprite_sizes=SPRITE_SIZES):
+        """(left, top, right, bottom) do sprite atual, ancorado no centro."""
+        w, h = sprite_sizes.get(self.image, (64, 64))
+        return self.x - w / 2, self.y - h / 2, self.x + w / 2, self.y + h / 2
+
+    def update_animation(self, frames, tick):
+        # a hitbox segue este frame, que é exatamente o desenhado
+        self.image = frames[animation_frame(tick, ENEMY_ANIM_DELAY, len(frames))]
+
+
+def _snapshot_fields(obj):
+    return tuple([getattr(obj, name) for name in obj.SNAPSHOT_FIELDS])
+
+
+def _restore_fields(obj, values):
+    for name, value in zip(obj.SNAPSHOT_FIELDS, values):
+        setattr(obj, name, value)
+
+
+def step_hero(hero, inputs, grid, width=WIDTH, height=HEIGHT, tick=0):
+    """
+    Avança o herói um tick (`tick`: relógio de animação, ver `animation_frame`).
+    Retorna True se ele pulou neste tick.
+    """
+    jumped = False
+
+    # Movimento horizontal (com colisão lateral)
+    dx = 0
+    if inputs.left:
+        dx -= hero.move_speed
+    if inputs.right:
+        dx += hero.move_speed
+
+    # Pulo com seta para cima (Mario-like)
+    if inputs.up and hero.on_ground:
+        hero.vy = hero.jump_velocity
+        hero.on_ground = False
+        jumped = True
+
+    # aplica horizontal
+    if dx != 0:
+        l0, _t0, r0, _b0 = hero.bounds()
+        hero.x += dx
+        # Só as plataformas nas células varridas pela hitbox (antes/depois do passo).
+        l, t, r, b = hero.bounds()
+        rects = grid.candidate_rects(min(l, l - dx), t, max(r, r - dx), b)
+        # Swept AABB: para na primeira parede cruzada no caminho, mesmo que o
+        # passo seja maior que a plataforma (não atravessa tiles finos).
+        if dx > 0:
+            hit = min((pl for pl, pt, pr, pb in rects if r0 <= pl < r and pt < b and pb > t), default=None)
+            if hit is not None:
+                hero.set_right(hit)
+        else:
+            hit = max((pr for pl, pt, pr, pb in rects if l < pr <= l0 and pt < b and pb > t), default=None)
+            if hit is not None:
+                hero.set_left(hit)
+        # sobreposições que já existiam antes do passo
+        for pl, pt, pr, pb in rects:
+            if hero.collides_with(pl, pt, pr, pb):
+                if dx > 0:
+                    hero.set_right(pl)
+                else:
+                    hero.set_left(pr)
+
+    # gravity + movimento vertical (com colisão por cima/baixo)
+    hero.vy += GRAVITY
+    hero.on_ground = False
+    _l0, t0, _r0, b0 = hero.bounds()
+    hero.y += hero.vy
+
+    l, t, r, b = hero.bounds()
+    rects = grid.candidate_rects(l, min(t, t - hero.vy), r, max(b, b - hero.vy))
+    # Swept AABB na vertical: pousa no primeiro topo / bate no primeiro fundo do caminho.
+    if hero.vy > 0:
+        hit = min((pt for pl, pt, pr, pb in rects if b0 <= pt < b and pl < r and pr > l), default=None)
+        if hit is not None:
+            hero.set_bottom(hit)
+            hero.vy = 0
+            hero.on_ground = True
+    elif hero.vy < 0:
+        hit = max((pb for pl, pt, pr, pb in rects if t < pb <= t0 and pl < r and pr > l), default=None)
+        if hit is not None:
+            hero.set_top(hit)
+            hero.vy = 0
+    for pl, pt, pr, pb in rects:
+        if hero.collides_with(pl, pt, pr, pb):
+            if hero.vy > 0:  # caindo: “pousa” em cima
+                hero.set_bottom(pt)
+                hero.vy = 0
+                hero.on_ground = True
+            elif hero.vy < 0:  # subindo: bate embaixo
+                hero.set_top(pb)
+                hero.vy = 0
+
+    # limites do mundo
+    l, t, r, b = hero.bounds()
+    if l < 0:
+        hero.set_left(0)
+    if r > width:
+        hero.set_right(width)
+    if b > height:
+        hero.set_bottom(height)
+        hero.vy = 0
+        hero.on_ground = True
+
+    # Ground-check robusto (quando está "encostando" na plataforma).
+    if not hero.on_ground and hero.vy >= 0:
+        l, t, r, b = hero.bounds()
+        # probe 1px abaixo da hitbox
+        for i in grid.overlapping(l, t + 1, r, b + 1):
+            hero.set_bottom(grid.rect(i)[1])
+            hero.vy = 0
+            hero.on_ground = True
+            break
+
+    # Se estiver no ar, usa sprite de pulo e não deixa idle/run sobrescrever.
+    if not hero.on_ground:
+        hero.image = HERO_JUMP_IMAGE
+    elif inputs.left and not inputs.right:
+        hero.update_animation(HERO_RUN_LEFT_FRAMES, tick)
+    elif inputs.right and not inputs.left:
+        hero.update_animation(HERO_RUN_FRAMES, tick)
+    else:
+        # Sem movimento: anima idle também
+        hero.update_animation(HERO_STAND_FRAMES, tick)
+    return jumped
+
+
+def step_enemy(enemy, rng, tick=0):
+    """Avança um inimigo um tick (`rng` tem a API de `random`; `tick`: relógio de animação)."""
+    moving = True
+
+    # Às vezes o inimigo "para" e fica em idle (com animação)
+    if enemy.pause_frames > 0:
+        enemy.pause_frames -= 1
+        moving = False
+    else:
+        enemy.x += enemy.direction * enemy.speed
+
+        # change direction randomly
+        if rng.random() < ENEMY_FLIP_CHANCE:
+            enemy.direction *= -1
+
+        # chance de parar por um tempo
+        if rng.random() < ENEMY_PAUSE_CHANCE:
+            enemy.pause_frames = rng.randint(*ENEMY_PAUSE_RANGE)
+
+    enemy.update_animation(ENEMY_MOVE_FRAMES if moving else ENEMY_IDLE_FRAMES, tick)
+
+
+class Simulation:
+    """Mundo do jogo avançado em ticks fixos, sem nenhuma dependência de janela."""
+
+    def __init__(self, level=None, *, rng=None, sprite_sizes=None, enemy_backend="auto"):
+        """
+        `enemy_backend`: "objects" (um EnemyState por inimigo), "numpy"
+        (EnemySwarm vetorizado) ou "auto" (numpy para níveis com muitos inimigos).
+        Níveis com streaming (`levelfile.StreamingLevel`) sempre usam EnemyState,
+        já que os inimigos entram e saem junto com os chunks.
+        """
+        self.enemy_backend = enemy_backend
+        # profiler.FrameProfiler (só quando ligado): mede herói/inimigos/colisão
+        self.profiler = None
+        self.level = level if level is not None else build_default_level()
+        # `random` (módulo) também serve: mesmo comportamento do jogo original.
+        self.rng = rng if rng is not None else random.Random()
+        self.sprite_sizes = dict(SPRITE_SIZES)
+        if sprite_sizes:
+            self.sprite_sizes.update(sprite_sizes)
+        self.reset()
+
+    def reset(self):
+        """Recria o mundo nos spawns do nível e guarda o snapshot inicial."""
+        self._spawn()
+        self.initial = self.snapshot()
+
+    @property
+    def streaming(self):
+        return getattr(self.level, "streaming", False)
+
+    def _spawn(self):
+        """Recria herói e inimigos nos spawns do nível."""
+        if self.streaming:
+            self.level.rewind()
+        hx, hy = self.level.hero_spawn
+        cw, ch = self.sprite_sizes.get(HERO_STAND_FRAMES[0], (64, 64))
+        self.hero = HeroState(hx, hy, cw, ch)
+        spawns = self.level.enemy_spawns
+        directions = [self.rng.choice([-1, 1]) for _ in spawns]
+        self.swarm = None
+        if self.streaming:
+            chunk_of = self.level.chunk_of
+            self.enemies = [EnemyState(x, y, d, chunk_of(x, y)) for (x, y), d in zip(spawns, directions)]
+        elif self._use_swarm(len(spawns)):
+            from enemy_swarm import EnemySwarm
+
+            self.swarm = EnemySwarm(spawns, directions, seed=self.rng.getrandbits(64),
+                                    sprite_sizes=self.sprite_sizes)
+            self.enemies = []
+        else:
+            self.enemies = [EnemyState(x, y, d) for (x, y), d in zip(spawns, directions)]
+        self.broadphase = SpatialHash(BROADPHASE_CELL)
+        self._rebuild_broadphase(self.hero.bounds())
+        self.state = PLAYING
+        self.tick = 0
+        # eventos do último tick: "jump", "game_over", "win", "stream"
+        self.events = []
+
+    def step(self, inputs=NO_INPUT):
+        """Avança um tick de tempo fixo. Retorna o estado após o tick."""
+        self.events = []
+        if self.state != PLAYING:
+            return self.state
+        level = self.level
+        hero = self.hero
+        prof = self.profiler
+        if prof is not None:
+            prof.resume()
+        if self.streaming:
+            self._stream()
+            if prof is not None:
+                prof.mark("update.stream")
+
+        # relógio de animação: o tick ao fim deste passo (o que o desenho vê)
+        anim_tick = self.tick + 1
+        if step_hero(hero, inputs, level.grid, level.width, level.height, anim_tick):
+            self.events.append("jump")
+        if prof is not None:
+            prof.mark("update.hero")
+        rng = self.rng
+        for enemy in self.enemies:
+            step_enemy(enemy, rng, anim_tick)
+        if self.swarm is not None:
+            self.swarm.step(anim_tick)
+        if prof is not None:
+            prof.mark("update.enemies")
+
+        # collision: broadphase reconstruída com as posições deste tick;
+        # o teste exato só roda nas entidades das células da hitbox do herói.
+        hero_box = hero.bounds()
+        hits = self._rebuild_broadphase(hero_box)
+        if any(key != TROPHY_KEY for key in hits):
+            self.state = GAME_OVER
+            self.events.append("game_over")
+        if self.swarm is not None and self.state == PLAYING:
+            if len(self.swarm.overlapping(*hero_box)):
+                self.state = GAME_OVER
+                self.events.append("game_over")
+
+        # Vitória: tocar no troféu
+        if self.state == PLAYING and TROPHY_KEY in hits:
+            self.state = WIN
+            self.events.append("win")
+        if prof is not None:
+            prof.mark("update.collision")
+
+        self.tick += 1
+        return self.state
+
+    def snapshot(self):
+        """
+        Captura posições, velocidades, animação e estado do RNG (imutável).
+
+        Com `restore`, reiniciar a fase não recria objetos nem toca em disco.
+        """
+        rng_state = self.rng.getstate() if hasattr(self.rng, "getstate") else None
+        return SimulationSnapshot(
+            tick=self.tick,
+            state=self.state,
+            hero=_snapshot_fields(self.hero),
+            enemies=tuple([_snapshot_fields(e) for e in self.enemies]),
+            swarm=self.swarm.snapshot() if self.swarm is not None else None,
+            rng_state=rng_state,
+        )
+
+    def restore(self, snap):
+        """Volta ao snapshot no lugar (mesmos objetos HeroState/EnemyState/arrays)."""
+        if len(snap.enemies) != len(self.enemies):
+            raise ValueError("snapshot de outro nível: quantidade de inimigos diferente")
+        _restore_fields(self.hero, snap.hero)
+        for enemy, values in zip(self.enemies, snap.enemies):
+            _restore_fields(enemy, values)
+        if snap.swarm is not None and self.swarm is not None:
+            self.swarm.restore(snap.swarm)
+        if snap.rng_state is not None and hasattr(self.rng, "setstate"):
+            self.rng.setstate(snap.rng_state)
+        self.tick = snap.tick
+        self.state = snap.state
+        self.events = []
+        # `query` (culling do draw) já enxerga as posições restauradas
+        self._rebuild_broadphase(self.hero.bounds())
+
+    def restart(self):
+        """Reinicia a fase em O(1) em relação ao tamanho do nível (volta ao snapshot inicial)."""
+        if self.streaming:
+            # os chunks ativos (e portanto os inimigos) podem ter mudado desde o início
+            self.level.rewind()
+            self.enemies = [EnemyState(0, 0, 1) for _ in self.initial.enemies]
+        self.restore(self.initial)
+
+    def _stream(self):
+        """Carrega/descarrega chunks em volta do herói e os inimigos que vêm com eles."""
+        loaded, unloaded = self.level.stream(self.hero.x, self.hero.y)
+        if not loaded and not unloaded:
+            return
+        if unloaded:
+            gone = set(unloaded)
+            self.enemies = [e for e in self.enemies if e.chunk not in gone]
+        for key in loaded:
+            for x, y in self.level.enemy_spawns_in(key):
+                self.enemies.append(EnemyState(x, y, self.rng.choice([-1, 1]), key))
+        self.events.append("stream")
+
+    def _rebuild_broadphase(self, hero_box):
+        """Reinsere herói, inimigos e troféu; retorna as chaves que tocam o herói."""
+        bp = self.broadphase
+        bp.clear()
+        sizes = self.sprite_sizes
+        for i, enemy in enumerate(self.enemies):
+            bp.insert(i, *enemy.bounds(sizes))
+        trophy = self.level.trophy
+        if trophy is not None:
+            tx, ty, tw, th = trophy
+            bp.insert(TROPHY_KEY, tx, ty, tx + tw, ty + th)
+        bp.insert(HERO_KEY, *hero_box)
+        return bp.query(*hero_box, exclude=HERO_KEY)
+
+    def query(self, left, top, right, bottom):
+        """
+        Entidades do último tick que se sobrepõem ao retângulo: índices de
+        `enemies`, HERO_KEY e/ou TROPHY_KEY.
+        """
+        return self.broadphase.query(left, top, right, bottom)
+
+    def visible_entities(self, left, top, right, bottom):
+        """
+        Inimigos (índices em ordem) e se o troféu estão no retângulo; usado
+        para o culling da câmera.
+        """
+        keys = self.broadphase.query(left, top, right, bottom)
+        enemies = sorted(key for key in keys if key != HERO_KEY and key != TROPHY_KEY)
+        return enemies, TROPHY_KEY in keys
+
+    def entity_pairs(self):
+        """Pares de entidades (inimigo x inimigo, inimigo x herói...) que se tocam."""
+        return self.broadphase.pairs()
+
+    def _use_swarm(self, count):
+        if self.enemy_backend == "objects":
+            return False
+        from enemy_swarm import available
+
+        if self.enemy_backend == "numpy":
+            if not available():
+                raise RuntimeError("enemy_backend='numpy' requer NumPy instalado.")
+            return True
+        return count >= SWARM_MIN_ENEMIES and available()
+
+    def run(self, policy, max_ticks):
+        """
+        Roda até o fim da partida ou `max_ticks`.
+
+        `policy(sim)` devolve o InputState de cada tick. Retorna o estado final.
+        """
+        while self.state == PLAYING and self.tick < max_ticks:
+            self.step(policy(self))
+        return self.state
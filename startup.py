@@ -0,0 +1,138 @@
+"""
+Início rápido (manifesto de assets) e relatório de tempo de inicialização.
+
+Antes do primeiro frame, o jogo prepara os assets: symlink/cópia de
+`game/sprites` para `game/images`, `set_root` do pgzero, cópia para o
+`images/` do root e validação dos sprites. O `sync_assets.py` (e o próprio
+jogo, depois de uma preparação completa) grava `game/.startup_manifest.json`
+com o mtime das pastas de assets; se nenhuma pasta mudou desde então, o
+próximo início confia no manifesto e pula todas essas varreduras (só o
+`set_root` continua).
+
+O mtime de uma pasta muda quando arquivos são criados, removidos ou
+renomeados nela. Editar um PNG no lugar não muda: nesse caso rode
+`py sync_assets.py` (ou `GAME_FAST_START=0`).
+
+`StartupTimer` mede as fases do início (import, preparação dos assets,
+preload, init do áudio, primeiro frame, primeiro frame do menu) e guarda o
+último início frio (preparação completa) e o último quente (manifesto em
+dia) em JSON, para comparar os dois.
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+MANIFEST_NAME = ".startup_manifest.json"
+MANIFEST_VERSION = 1
+# pastas de `game/` cujo conteúdo a preparação dos assets lê ou escreve
+WATCHED_DIRS = ("sprites", "images", "sounds")
+
+CURRENT = "current"
+STALE = "stale"
+MISSING = "missing"
+
+
+def _dir_mtimes(game_dir: Path) -> dict:
+    """{pasta: mtime_ns} das pastas observadas (None se a pasta não existir)."""
+    mtimes = {}
+    for name in WATCHED_DIRS:
+        try:
+            mtimes[name] = (game_dir / name).stat().st_mtime_ns
+        except OSError:
+            mtimes[name] = None
+    return mtimes
+
+
+def write_manifest(game_dir: Path) -> bool:
+    """Grava o manifesto de início rápido (chamar depois de preparar/sincronizar os assets)."""
+    game_dir = Path(game_dir)
+    path = game_dir / MANIFEST_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    data = {
+        "version": MANIFEST_VERSION,
+        "root": str(game_dir.resolve()),
+        "images_mode": "symlink" if (game_dir / "images").is_symlink() else "synced",
+        "dirs": _dir_mtimes(game_dir),
+    }
+    try:
+        tmp.write_text(json.dumps(data, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        return False
+
+
+def manifest_status(game_dir: Path) -> str:
+    """CURRENT se nenhuma pasta de assets mudou desde o manifesto; senão STALE/MISSING."""
+    game_dir = Path(game_dir)
+    try:
+        data = json.loads((game_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except Exception:
+        return MISSING
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return STALE
+    if data.get("root") != str(game_dir.resolve()):
+        return STALE  # pasta do jogo movida/copiada
+    dirs = data.get("dirs") or {}
+    if dirs.get("images") is None:
+        return STALE
+    return CURRENT if dirs == _dir_mtimes(game_dir) else STALE
+
+
+class StartupTimer:
+    """
+    Fases do início do jogo, em segundos. "import", "first_frame" e "menu"
+    são medidos desde `start` (início do processo); "assets.prepare",
+    "assets.preload" e "audio.init" são a duração de cada etapa.
+    """
+
+    PHASES = ("import", "assets.prepare", "assets.preload", "audio.init", "first_frame", "menu")
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.kind = None  # "cold" (preparação completa) ou "warm" (manifesto em dia)
+        self.manifest = None
+        self.phases = {}
+        self.reported = False
+
+    def since_start(self, name):
+        """Registra `name` como o tempo decorrido desde o início do processo."""
+        if name not in self.phases:
+            self.phases[name] = time.perf_counter() - self.start
+
+    def record(self, name, seconds):
+        """Registra a duração de uma fase medida à parte."""
+        self.phases[name] = seconds
+
+    @property
+    def complete(self):
+        return all(name in self.phases for name in self.PHASES)
+
+    def report(self):
+        return {
+            "kind": self.kind,
+            "manifest": self.manifest,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "phases_ms": {name: round(self.phases[name] * 1000, 3) for name in self.PHASES if name in self.phases},
+        }
+
+    def summary_lines(self):
+        lines = [f"[startup] início {self.kind} (manifesto: {self.manifest})"]
+        for name in self.PHASES:
+            if name in self.phases:
+                lines.append(f"[startup]   {name:<15} {self.phases[name] * 1000:9.1f} ms")
+        return lines
+
+    def save(self, path: Path):
+        """Grava o relatório em `path`, mantendo o último de cada tipo (cold/warm)."""
+        path = Path(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict):
+                data = {}
+        except Exception:
+            data = {}
+        data[self.kind or "unknown"] = self.report()
+        path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        return path
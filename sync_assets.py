@@ -2,8 +2,13 @@
 Script para sincronizar assets de game/ para as pastas que pgzero espera
 Execute este script sempre que adicionar novas imagens/sons em game/
 """
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import hashlib
+import json
+import os
 import shutil
 from pathlib import Path
+from typing import Optional
 
 try:
     from PIL import Image, ImageDraw, ImageFont
@@ -131,25 +136,102 @@ def _generate_placeholder_sprite_png(path: Path) -> bool:
     img.save(path, format="PNG", optimize=True)
     return True
 
-def ensure_sprites_valid():
+VALIDATION_CACHE = BASE_DIR / "game" / ".sprite_validation.json"
+# Abaixo disso, abrir um pool de processos custa mais que validar direto.
+MIN_FILES_FOR_POOL = 32
+
+def _load_validation_cache(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+def _save_validation_cache(path: Path, cache: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(cache, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+def _stat_key(path: Path):
+    try:
+        st = path.stat()
+        return [st.st_size, st.st_mtime_ns]
+    except Exception:
+        return None
+
+def _run_parallel(fn, items, *, processes: bool):
+    """map() em paralelo: processos para lotes grandes (Pillow segura o GIL), threads senão."""
+    items = list(items)
+    if not items:
+        return []
+    if processes and len(items) >= MIN_FILES_FOR_POOL:
+        try:
+            with ProcessPoolExecutor() as pool:
+                chunksize = max(1, len(items) // ((os.cpu_count() or 1) * 4))
+                return list(pool.map(fn, items, chunksize=chunksize))
+        except Exception:
+            pass  # ex.: ambiente sem suporte a multiprocessing
+    with ThreadPoolExecutor() as pool:
+        return list(pool.map(fn, items))
+
+def ensure_sprites_valid(*, processes: bool = True, cache_path: Path = VALIDATION_CACHE, verbose: bool = True):
     """
     Garante que todos os .png em game/sprites são PNGs válidos.
     Se algum estiver vazio/corrompido, recria como placeholder.
+
+    Resultados ficam em cache por (caminho, tamanho, mtime): sprites já
+    verificados não são decodificados de novo. A validação e a recriação de
+    placeholders rodam num pool de processos (`processes=False` usa threads;
+    o jogo usa threads, porque no Windows os processos filhos reimportariam
+    o main.py).
     """
+    log = print if verbose else (lambda *args, **kwargs: None)
     if not GAME_SPRITES.exists():
         return
 
+    cache = _load_validation_cache(cache_path)
+    sprites = sorted(GAME_SPRITES.glob("*.png"))
+    keys = {str(p): _stat_key(p) for p in sprites}
+
+    valid = {}
+    to_check = []
+    for p in sprites:
+        entry = cache.get(str(p))
+        key = keys[str(p)]
+        if key is not None and entry is not None and entry[:2] == key:
+            valid[str(p)] = bool(entry[2])
+        else:
+            to_check.append(p)
+
+    for p, ok in zip(to_check, _run_parallel(_is_valid_png, to_check, processes=processes)):
+        valid[str(p)] = ok
+
+    broken = [p for p in sprites if not valid[str(p)]]
+    regenerated = _run_parallel(_generate_placeholder_sprite_png, broken, processes=processes)
+
     fixed = 0
-    for p in sorted(GAME_SPRITES.glob("*.png")):
-        if not _is_valid_png(p):
-            ok = _generate_placeholder_sprite_png(p)
-            if ok:
-                fixed += 1
-                print(f"Sprite inválido recriado: {p.name}")
-            else:
-                print(f"Sprite inválido detectado (não consegui recriar): {p.name}")
+    for p, ok in zip(broken, regenerated):
+        if ok:
+            fixed += 1
+            keys[str(p)] = _stat_key(p)
+            valid[str(p)] = True
+            log(f"Sprite inválido recriado: {p.name}")
+        else:
+            log(f"Sprite inválido detectado (não consegui recriar): {p.name}")
     if fixed:
-        print(f"Sprites corrigidos: {fixed}")
+        log(f"Sprites corrigidos: {fixed}")
+
+    new_cache = {
+        path: [key[0], key[1], valid[path]]
+        for path, key in keys.items()
+        if key is not None
+    }
+    if new_cache != cache:
+        _save_validation_cache(cache_path, new_cache)
 
 def ensure_sounds_valid():
     """
@@ -170,44 +252,194 @@ def ensure_sounds_valid():
     if fixed:
         print(f"Sons corrigidos: {fixed}")
 
-def sync_folder(source: Path, dest: Path, *, skip_empty: bool = True, delete_empty_dest: bool = True) -> int:
-    """Copia arquivos de source para dest. Retorna quantos foram copiados."""
+MANIFEST_NAME = ".sync_manifest.json"
+MANIFEST_VERSION = 1
+
+def _file_sha1(path: Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha1()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _load_manifest(dest: Path) -> dict:
+    """Lê o manifesto de sincronização de `dest` ({nome: {size, mtime_ns, sha1, mode}})."""
+    try:
+        data = json.loads((dest / MANIFEST_NAME).read_text(encoding="utf-8"))
+        if data.get("version") == MANIFEST_VERSION:
+            return dict(data.get("files", {}))
+    except Exception:
+        pass
+    return {}
+
+def _save_manifest(dest: Path, files: dict) -> None:
+    path = dest / MANIFEST_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_text(
+            json.dumps({"version": MANIFEST_VERSION, "files": files}, indent=1, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+def _link_or_copy(src: Path, dst: Path, use_hardlinks: bool) -> str:
+    """Coloca `src` em `dst` via hardlink (se possível) ou cópia. Retorna o modo usado."""
+    try:
+        if dst.exists() and os.path.samefile(src, dst):
+            # já é um hardlink para a origem (ex.: arquivo editado no lugar)
+            return "hardlink"
+    except OSError:
+        pass
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    try:
+        tmp.unlink()
+    except FileNotFoundError:
+        pass
+    mode = "copy"
+    if use_hardlinks:
+        try:
+            os.link(src, tmp)
+            mode = "hardlink"
+        except OSError:
+            pass
+    if mode == "copy":
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return mode
+
+def _same_dir(a: Path, b: Path) -> bool:
+    try:
+        return a.resolve() == b.resolve()
+    except Exception:
+        return False
+
+def sync_folder(source: Path, dest: Path, *, skip_empty: bool = True, delete_empty_dest: bool = True,
+                use_hardlinks: bool = True, workers: Optional[int] = None, verbose: bool = True) -> int:
+    """
+    Sincroniza source -> dest de forma incremental. Retorna quantos arquivos foram copiados.
+
+    Um manifesto em `dest/.sync_manifest.json` guarda tamanho, mtime e hash de
+    cada arquivo sincronizado: arquivos inalterados são pulados sem nem ler o
+    conteúdo, renomeações viram um rename no destino e arquivos removidos da
+    origem são removidos do destino. Hash e cópias rodam em paralelo, e a
+    cópia usa hardlink quando o sistema de arquivos permite.
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
     if not source.exists():
-        print(f"Pasta {source} não existe, pulando...")
+        log(f"Pasta {source} não existe, pulando...")
+        return 0
+
+    dest.mkdir(parents=True, exist_ok=True)
+    if _same_dir(source, dest):
+        # ex.: game/images é um symlink para game/sprites
+        log(f"{dest} aponta para {source}, nada a copiar.")
         return 0
-    
-    dest.mkdir(exist_ok=True)
-    
+
+    old = _load_manifest(dest)
+    manifest = {}
+    present = set()
+    pending = []  # (arquivo, stat) que mudaram ou são novos
+
+    for file in sorted(source.glob("*")):
+        if not file.is_file():
+            continue
+        try:
+            st = file.stat()
+            size = st.st_size
+        except Exception:
+            continue
+
+        dest_file = dest / file.name
+        if skip_empty and size == 0:
+            # Evita copiar arquivos vazios (causam crash no pygame/pgzero)
+            if delete_empty_dest and dest_file.exists():
+                try:
+                    if dest_file.stat().st_size == 0:
+                        dest_file.unlink()
+                        log(f"Removido destino vazio: {dest_file.name}")
+                except Exception:
+                    pass
+            log(f"Aviso: {file.name} está vazio (0 bytes). Não foi copiado.")
+            continue
+
+        present.add(file.name)
+        entry = old.get(file.name)
+        if (
+            entry is not None
+            and entry.get("size") == size
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and dest_file.exists()
+        ):
+            manifest[file.name] = entry
+            continue
+        pending.append((file, st))
+
     copied = 0
-    for file in source.glob("*"):
-        if file.is_file():
-            try:
-                size = file.stat().st_size
-            except Exception:
-                size = -1
-
-            if skip_empty and size == 0:
-                # Evita copiar arquivos vazios (causam crash no pygame/pgzero)
-                dest_file = dest / file.name
-                if delete_empty_dest and dest_file.exists():
-                    try:
-                        if dest_file.stat().st_size == 0:
-                            dest_file.unlink()
-                            print(f"Removido destino vazio: {dest_file.name}")
-                    except Exception:
-                        pass
-                print(f"Aviso: {file.name} está vazio (0 bytes). Não foi copiado.")
-                continue
+    renamed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = list(pool.map(lambda item: _file_sha1(item[0]), pending))
+
+        # hash -> nome antigo, para detectar renomeações
+        vanished = {
+            entry.get("sha1"): name
+            for name, entry in old.items()
+            if name not in present and entry.get("sha1")
+        }
 
+        to_copy = []
+        for (file, st), digest in zip(pending, digests):
             dest_file = dest / file.name
-            shutil.copy2(file, dest_file)
+            record = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": digest}
+            entry = old.get(file.name)
+            if entry is not None and entry.get("sha1") == digest and dest_file.exists():
+                # só os metadados mudaram (ex.: touch)
+                record["mode"] = entry.get("mode", "copy")
+                manifest[file.name] = record
+                continue
+
+            old_name = vanished.pop(digest, None)
+            if old_name is not None and (dest / old_name).is_file():
+                os.replace(dest / old_name, dest_file)
+                record["mode"] = old[old_name].get("mode", "copy")
+                manifest[file.name] = record
+                renamed += 1
+                log(f"Renomeado: {old_name} -> {file.name}")
+                continue
+            to_copy.append((file, record))
+
+        modes = pool.map(lambda item: _link_or_copy(item[0], dest / item[0].name, use_hardlinks), to_copy)
+        for (file, record), mode in zip(to_copy, modes):
+            record["mode"] = mode
+            manifest[file.name] = record
             copied += 1
-            print(f"Copiado: {file.name}")
-    
-    if copied == 0:
-        print(f"Nenhum arquivo encontrado em {source}")
+            log(f"Copiado: {file.name}" + (" (hardlink)" if mode == "hardlink" else ""))
+
+    # Remove do destino o que saiu da origem (só arquivos que nós sincronizamos).
+    removed = 0
+    for name in old:
+        if name in manifest:
+            continue
+        dest_file = dest / name
+        try:
+            if dest_file.is_file():
+                dest_file.unlink()
+                removed += 1
+                log(f"Removido: {name}")
+        except Exception:
+            pass
+
+    _save_manifest(dest, manifest)
+
+    unchanged = len(manifest) - copied - renamed
+    if not present:
+        log(f"Nenhum arquivo encontrado em {source}")
+    elif copied == 0 and renamed == 0 and removed == 0:
+        log(f"Nada a sincronizar em {source} ({unchanged} arquivo(s) inalterado(s))")
     else:
-        print(f"Total: {copied} arquivo(s) copiado(s)")
+        log(f"Total: {copied} copiado(s), {renamed} renomeado(s), {removed} removido(s), "
+            f"{unchanged} inalterado(s)")
     return copied
 
 def sync_all():
@@ -221,6 +453,21 @@ def sync_all():
     print("-" * 40)
     sync_folder(GAME_MUSIC, MUSIC_DIR)
     print("-" * 40)
+    # Atlas de texturas (game/atlas): usado pelo jogo se estiver atualizado.
+    try:
+        from atlas import build_atlas
+
+        build_atlas()
+    except Exception as e:
+        print(f"Atlas não gerado: {e}")
+    print("-" * 40)
+    # Manifesto de início rápido: o jogo pula a preparação dos assets
+    # enquanto as pastas não mudarem.
+    from startup import write_manifest
+
+    if write_manifest(BASE_DIR / "game"):
+        print("Manifesto de início rápido atualizado.")
+    print("-" * 40)
     print("Sincronização concluída!")
 
 if __name__ == "__main__":
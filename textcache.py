@@ -0,0 +1,88 @@
+"""
+Cache de superfícies de texto renderizado (menu, botões, overlays).
+
+`screen.draw.text` passa todos os parâmetros pelo ptext do pgzero a cada
+chamada, em todo frame. Aqui cada (texto, fontsize, cor, estilo) é
+rasterizado uma vez e a superfície é reutilizada enquanto o texto não mudar.
+O cache é LRU e limitado em bytes: quando passa do limite, os textos usados
+há mais tempo são descartados.
+"""
+from collections import OrderedDict
+
+try:
+    from pgzero import ptext
+except Exception:  # fora do pgzero (scripts): renderiza com pygame.font
+    ptext = None  # type: ignore[assignment]
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+def _surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def _render(text, fontsize, color, style):
+    if ptext is not None:
+        # o próprio cache do ptext fica de fora: quem guarda a superfície é o TextCache
+        return ptext.getsurf(text, fontsize=fontsize, color=color, cache=False, **style)
+    import pygame
+
+    if not pygame.font.get_init():
+        pygame.font.init()
+    font = pygame.font.Font(None, fontsize)
+    font.set_bold(bool(style.get("bold")))
+    font.set_italic(bool(style.get("italic")))
+    return font.render(text, True, pygame.Color(color))
+
+
+class TextCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._surfaces = OrderedDict()  # chave -> (superfície, bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def clear(self):
+        self._surfaces.clear()
+        self.bytes = 0
+
+    def get(self, text, fontsize, color, **style):
+        """Superfície do texto (renderiza só na primeira vez)."""
+        key = (text, fontsize, color, tuple(sorted(style.items())) if style else ())
+        entry = self._surfaces.get(key)
+        if entry is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        surface = _render(text, fontsize, color, style)
+        size = _surface_bytes(surface)
+        self._surfaces[key] = (surface, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes and len(self._surfaces) > 1:
+            _key, (_surface, old_size) = self._surfaces.popitem(last=False)
+            self.bytes -= old_size
+            self.evictions += 1
+        return surface
+
+    @staticmethod
+    def _place(surface, center, topleft):
+        w, h = surface.get_size()
+        if center is not None:
+            return int(round(center[0] - w / 2)), int(round(center[1] - h / 2)), w, h
+        return topleft[0], topleft[1], w, h
+
+    def bounds(self, text, *, center=None, topleft=None, fontsize=24, color="white", **style):
+        """(x, y, w, h) que `draw` ocupa com os mesmos argumentos."""
+        return self._place(self.get(text, fontsize, color, **style), center, topleft)
+
+    def draw(self, screen_obj, text, *, center=None, topleft=None, fontsize=24, color="white", **style):
+        """Equivalente a `screen.draw.text(text, center=... | topleft=..., ...)`."""
+        surface = self.get(text, fontsize, color, **style)
+        x, y, _w, _h = self._place(surface, center, topleft)
+        screen_obj.blit(surface, (x, y))
@@ -0,0 +1,149 @@
+"""
+Grade de ocupação de tiles para consultas de colisão estática.
+
+A geometria do nível (plataformas) é indexada uma vez numa grade de células
+do tamanho de um tile. Cada consulta olha só as células que a hitbox cobre,
+então o custo da colisão não cresce com o tamanho do nível.
+
+Layout compacto (sem um objeto por célula nem por plataforma):
+- a geometria é a do `PlatformArray` do nível (lida direto do `array('d')`
+  compartilhado, sem cópia);
+- `occupancy`: bytearray, 1 se alguma plataforma toca a célula;
+- `_cell_start` / `_cell_items`: lista de índices de plataformas por célula em
+  formato CSR (`array`), já que plataformas fora da grade podem dividir células.
+"""
+from array import array
+import math
+
+from platforms import FIELDS, PlatformArray
+
+
+class TileGrid:
+    def __init__(self, platforms, cell_w=64, cell_h=64):
+        """
+        `platforms` é o `PlatformArray` do nível (ou uma sequência de
+        (x, y, w, h), copiada para um), na ordem das plataformas.
+        """
+        if not isinstance(platforms, PlatformArray):
+            platforms = PlatformArray(platforms)
+        self.platforms = platforms
+        self.data = platforms.data
+        self.cell_w = max(1, int(cell_w))
+        self.cell_h = max(1, int(cell_h))
+        n = len(platforms)
+
+        if n:
+            d = self.data
+            min_x = min(d[0::FIELDS])
+            min_y = min(d[1::FIELDS])
+            max_x = max(self.rect(i)[2] for i in range(n))
+            max_y = max(self.rect(i)[3] for i in range(n))
+        else:
+            min_x = min_y = max_x = max_y = 0
+
+        self.origin_col = math.floor(min_x / self.cell_w)
+        self.origin_row = math.floor(min_y / self.cell_h)
+        self.cols = max(1, math.ceil(max_x / self.cell_w) - self.origin_col)
+        self.rows = max(1, math.ceil(max_y / self.cell_h) - self.origin_row)
+
+        ncells = self.cols * self.rows
+        counts = array("I", bytes(4 * (ncells + 1)))
+        for index in range(n):
+            span = self._cell_span(*self.rect(index))
+            if span is None:
+                continue
+            c0, r0, c1, r1 = span
+            for row in range(r0, r1 + 1):
+                base = row * self.cols
+                for col in range(c0, c1 + 1):
+                    counts[base + col + 1] += 1
+
+        # prefix sum -> início de cada célula em _cell_items
+        for i in range(1, ncells + 1):
+            counts[i] += counts[i - 1]
+        self._cell_start = counts
+        self._cell_items = array("I", bytes(4 * counts[ncells]))
+        self.occupancy = bytearray(ncells)
+
+        fill = array("I", counts[:ncells])
+        for index in range(n):
+            span = self._cell_span(*self.rect(index))
+            if span is None:
+                continue
+            c0, r0, c1, r1 = span
+            for row in range(r0, r1 + 1):
+                base = row * self.cols
+                for col in range(c0, c1 + 1):
+                    cell = base + col
+                    self._cell_items[fill[cell]] = index
+                    fill[cell] += 1
+                    self.occupancy[cell] = 1
+
+    def __len__(self):
+        return len(self.platforms)
+
+    @property
+    def nbytes(self):
+        """Bytes do índice (ocupação + CSR); a geometria é contada no `PlatformArray`."""
+        start = self._cell_start
+        items = self._cell_items
+        return len(self.occupancy) + start.itemsize * len(start) + items.itemsize * len(items)
+
+    def rect(self, index):
+        """(left, top, right, bottom) da plataforma `index`."""
+        d = self.data
+        j = index * FIELDS
+        left = d[j]
+        top = d[j + 1]
+        return left, top, left + d[j + 2], top + d[j + 3]
+
+    def _cell_span(self, left, top, right, bottom):
+        """Faixa de células (c0, r0, c1, r1) que um retângulo aberto cobre, ou None."""
+        if right <= left or bottom <= top:
+            return None
+        c0 = max(0, math.floor(left / self.cell_w) - self.origin_col)
+        r0 = max(0, math.floor(top / self.cell_h) - self.origin_row)
+        c1 = min(self.cols - 1, math.ceil(right / self.cell_w) - 1 - self.origin_col)
+        r1 = min(self.rows - 1, math.ceil(bottom / self.cell_h) - 1 - self.origin_row)
+        if c1 < c0 or r1 < r0:
+            return None
+        return c0, r0, c1, r1
+
+    def candidates(self, left, top, right, bottom):
+        """
+        Índices (em ordem crescente) das plataformas nas células que o retângulo cobre.
+
+        É só a fase ampla: quem chama ainda faz o teste exato de sobreposição.
+        Manter a ordem original preserva o comportamento do loop linear antigo.
+        """
+        span = self._cell_span(left, top, right, bottom)
+        if span is None:
+            return []
+        c0, r0, c1, r1 = span
+        occupancy = self.occupancy
+        start = self._cell_start
+        items = self._cell_items
+        found = set()
+        for row in range(r0, r1 + 1):
+            base = row * self.cols
+            for cell in range(base + c0, base + c1 + 1):
+                if occupancy[cell]:
+                    found.update(items[start[cell]:start[cell + 1]])
+        if len(found) > 1:
+            return sorted(found)
+        return list(found)
+
+    def candidate_rects(self, left, top, right, bottom):
+        """(left, top, right, bottom) de cada candidata de `candidates`, na mesma ordem."""
+        rect = self.rect
+        return [rect(i) for i in self.candidates(left, top, right, bottom)]
+
+    def overlapping(self, left, top, right, bottom):
+        """Índices das plataformas que se sobrepõem (estritamente) ao retângulo."""
+        rect = self.rect
+        result = []
+        for i in self.candidates(left, top, right, bottom):
+            pl, pt, pr, pb = rect(i)
+            if left < pr and right > pl and top < pb and bottom > pt:
+                result.append(i)
+        return result